@@ -0,0 +1,839 @@
+"""
+Audio capture storage for MurmurTone.
+Holds microphone samples written by the PortAudio callback.
+"""
+import bisect
+import json
+import logging
+import math
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+import numpy as np
+
+log = logging.getLogger("murmurtone")
+
+
+# How far ahead of the write position prepare() keeps memory ready
+PREPARE_HEADROOM_SECONDS = 10.0
+
+
+class CaptureBuffer:
+    """
+    Growable, preallocated sample store for a single recording.
+
+    The audio callback only copies each block into the backing array, so
+    there is no per-block allocation. view() returns a zero-copy mono
+    float32 array of everything captured so far, ready for the model.
+
+    With spill_after_seconds and spill_dir set, a recording that outgrows
+    the RAM threshold moves to an append-only SpillFile on disk, so RAM
+    stays bounded however long the recording runs. After finish(), view()
+    is a memory-mapped view of that file.
+
+    Growing the array, creating the spill file and mapping its next chunk
+    are done by prepare(), called off the audio thread (the BlockAnalyzer
+    worker) ahead of need, so write() is a copy into memory that is
+    already there. write() only does that work itself if prepare() fell
+    behind. One writer (the audio callback) and any number of readers are
+    safe: the array and spill file are swapped together under a short
+    lock, and views taken earlier keep referencing the old array, which
+    still holds the same samples.
+    """
+
+    def __init__(self, sample_rate=16000, initial_seconds=30.0,
+                 spill_after_seconds=None, spill_dir=None):
+        self.sample_rate = sample_rate
+        self._spill_limit = None
+        if spill_after_seconds and spill_dir:
+            self._spill_limit = max(1, int(sample_rate * spill_after_seconds))
+            initial_seconds = min(initial_seconds, spill_after_seconds)
+        self._spill_dir = spill_dir
+        self._spill = None
+        self._spill_logged = False
+        self._final = None  # Memory-mapped view of the spill file after finish()
+        capacity = max(1, int(sample_rate * initial_seconds))
+        self._data = np.empty(capacity, dtype=np.float32)
+        self._length = 0
+        # Held by write() and while swapping _data/_spill; never during allocation or I/O
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def capacity(self):
+        """Number of samples that fit before the next grow."""
+        if self._spill is not None:
+            return self._spill.capacity
+        return len(self._data)
+
+    @property
+    def duration(self):
+        """Captured audio length in seconds."""
+        return self._length / self.sample_rate if self.sample_rate else 0.0
+
+    @property
+    def spilled(self):
+        """True once the recording has moved to disk."""
+        return self._spill is not None
+
+    @property
+    def spill_path(self):
+        """Path of the spill file, or None while in RAM."""
+        return self._spill.path if self._spill is not None else None
+
+    def write(self, block):
+        """
+        Append an audio block.
+
+        Args:
+            block: Array of shape (frames,) or (frames, channels).
+                   Only the first channel is stored.
+        """
+        samples = block[:, 0] if block.ndim > 1 else block
+        with self._lock:
+            end = self._length + len(samples)
+            if self._spill is None and self._spill_limit is not None and end > self._spill_limit:
+                # prepare() fell behind - spill from the audio thread
+                spill = self._new_spill_file()
+                spill.append(self._data[:self._length])
+                self._spill = spill
+                self._data = np.empty(0, dtype=np.float32)
+            if self._spill is not None:
+                self._spill.append(samples)
+                self._length = end
+                return
+            if end > len(self._data):
+                # prepare() fell behind - grow from the audio thread
+                new_data = np.empty(self._grown_capacity(end), dtype=np.float32)
+                new_data[:self._length] = self._data[:self._length]
+                self._data = new_data
+            self._data[self._length:end] = samples
+            self._length = end
+
+    def prepare(self, headroom_seconds=PREPARE_HEADROOM_SECONDS):
+        """
+        Make room for the next headroom_seconds of audio off the audio thread.
+
+        Grows the array, starts spilling or maps the next spill chunk
+        before write() needs it. Called from the BlockAnalyzer worker.
+        """
+        needed = self._length + max(1, int(self.sample_rate * headroom_seconds))
+        spill = self._spill
+        if spill is None and self._spill_limit is not None and needed > self._spill_limit:
+            spill = self._start_spill()
+        if spill is not None:
+            if not self._spill_logged:
+                self._spill_logged = True
+                log.info(f"Recording exceeded {self._spill_limit / self.sample_rate:.0f}s, "
+                         f"spilling to {spill.path}")
+            spill.reserve(needed)
+        elif needed > len(self._data):
+            self._grow(needed)
+
+    def _grown_capacity(self, min_capacity):
+        """Doubled capacity (at least min_capacity), capped where we'd spill anyway."""
+        capacity = max(min_capacity, len(self._data) * 2)
+        if self._spill_limit is not None:
+            capacity = max(min_capacity, min(capacity, self._spill_limit))
+        return capacity
+
+    def _grow(self, min_capacity):
+        """Grow the array, keeping captured samples; the bulk copy runs without the lock."""
+        old_data = self._data
+        new_data = np.empty(self._grown_capacity(min_capacity), dtype=np.float32)
+        copied = self._length
+        new_data[:copied] = old_data[:copied]
+        with self._lock:
+            if self._data is not old_data or self._spill is not None:
+                return  # write() grew or spilled meanwhile
+            new_data[copied:self._length] = old_data[copied:self._length]
+            self._data = new_data
+
+    def _new_spill_file(self):
+        name = f"{SPILL_PREFIX}{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{id(self):x}.wav"
+        return SpillFile(os.path.join(self._spill_dir, name), self.sample_rate)
+
+    def _start_spill(self):
+        """Move captured samples to a new spill file and free the RAM array."""
+        old_data = self._data
+        spill = self._new_spill_file()
+        copied = self._length
+        spill.append(old_data[:copied])
+        with self._lock:
+            if self._spill is not None or self._data is not old_data:
+                spill.close(delete=True)  # write() spilled meanwhile
+                return self._spill
+            spill.append(old_data[copied:self._length])
+            # Published together, so readers never see the emptied array alone
+            self._spill, self._data = spill, np.empty(0, dtype=np.float32)
+        return spill
+
+    def view(self, start=0, end=None):
+        """
+        Return captured samples [start:end].
+
+        Zero-copy for in-RAM recordings and for spilled recordings after
+        finish(). While a spilled recording is still running, a range that
+        crosses a file chunk boundary is returned as a copy.
+        """
+        with self._lock:
+            if end is None or end > self._length:
+                end = self._length
+            if self._final is not None:
+                return self._final[start:end]
+            if self._spill is not None:
+                return self._spill.read(start, end)
+            return self._data[start:end]
+
+    def finish(self):
+        """
+        Mark the recording complete (no more writes).
+        For spilled recordings, flushes the file and maps it for view().
+        """
+        spill = self._spill
+        if spill is not None and self._final is None:
+            final = spill.finalize()
+            with self._lock:
+                self._final = final
+
+    def clear(self):
+        """Discard captured samples, keeping the allocated capacity."""
+        if self._spill is not None:
+            self.discard()
+        self._length = 0
+
+    def discard(self):
+        """Release captured audio and delete the spill file, if any."""
+        with self._lock:
+            self._final = None
+            spill = self._spill
+            self._spill = None
+            self._data = np.empty(0, dtype=np.float32)
+            self._length = 0
+        if spill is not None:
+            spill.close(delete=True)
+
+
+# Spill files: float32 WAV, so a file left behind by a crash is playable as-is
+SPILL_PREFIX = "capture-"
+RECOVERED_PREFIX = "recovered-"
+WAV_HEADER_BYTES = 44
+
+
+def get_recordings_dir():
+    """Get path to the spill/recovered recordings folder in AppData."""
+    app_data = os.environ.get("APPDATA", os.path.expanduser("~"))
+    recordings_dir = os.path.join(app_data, "MurmurTone", "recordings")
+    os.makedirs(recordings_dir, exist_ok=True)
+    return recordings_dir
+
+
+def _wav_header(num_samples, sample_rate):
+    """44-byte header for mono 32-bit IEEE float WAV."""
+    data_bytes = num_samples * 4
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_bytes, b"WAVE",
+        b"fmt ", 16, 3, 1, sample_rate, sample_rate * 4, 4, 32,
+        b"data", data_bytes,
+    )
+
+
+class SpillFile:
+    """
+    Append-only float32 WAV file written through memory maps.
+
+    The file grows in fixed chunks, each mapped once, so appending is a
+    memcpy into the page cache with a file extension only at chunk
+    boundaries. The header is rewritten at every chunk, so a crash loses
+    at most the header's idea of the length (see recover_spill_files).
+
+    Samples are kept as float32 rather than int16 so that finalize() can
+    hand the model a zero-copy memory-mapped view; int16 would need a full
+    float32 conversion in RAM before transcription.
+    """
+
+    def __init__(self, path, sample_rate, chunk_seconds=60):
+        self.path = path
+        self.sample_rate = sample_rate
+        self._chunk = max(1, int(sample_rate * chunk_seconds))
+        self._file = open(path, "w+b")
+        self._file.write(_wav_header(0, sample_rate))
+        self._file.flush()
+        self._maps = []  # One (mmap, float32 array) per chunk
+        self._map_lock = threading.Lock()  # Serializes adding chunks (reserve() vs append())
+        self._view_map = None
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def capacity(self):
+        return len(self._maps) * self._chunk
+
+    def append(self, samples):
+        """Append float32 samples."""
+        pos = 0
+        count = len(samples)
+        while pos < count:
+            index, offset = divmod(self._length, self._chunk)
+            if index >= len(self._maps):
+                self.reserve((index + 1) * self._chunk)
+            take = min(count - pos, self._chunk - offset)
+            self._maps[index][1][offset:offset + take] = samples[pos:pos + take]
+            pos += take
+            self._length += take
+
+    def reserve(self, capacity):
+        """
+        Map chunks until capacity samples fit.
+
+        Lets another thread extend the file ahead of the writer, so
+        append() stays a memcpy into mapped memory.
+        """
+        with self._map_lock:
+            while self.capacity < capacity:
+                self._add_chunk()
+
+    def _add_chunk(self):
+        byte_start = WAV_HEADER_BYTES + len(self._maps) * self._chunk * 4
+        byte_end = byte_start + self._chunk * 4
+        self._write_header()
+        self._file.truncate(byte_end)
+        # mmap offsets must be aligned to the allocation granularity
+        map_offset = byte_start - byte_start % mmap.ALLOCATIONGRANULARITY
+        chunk_map = mmap.mmap(self._file.fileno(), byte_end - map_offset, offset=map_offset)
+        samples = np.frombuffer(chunk_map, dtype=np.float32, count=self._chunk,
+                                offset=byte_start - map_offset)
+        self._maps.append((chunk_map, samples))
+
+    def _write_header(self):
+        self._file.seek(0)
+        self._file.write(_wav_header(self._length, self.sample_rate))
+        self._file.flush()
+
+    def read(self, start, end):
+        """Return samples [start:end] (a view unless it spans chunks)."""
+        if end <= start:
+            return np.empty(0, dtype=np.float32)
+        first, first_offset = divmod(start, self._chunk)
+        last, last_offset = divmod(end - 1, self._chunk)
+        if first == last:
+            return self._maps[first][1][first_offset:last_offset + 1]
+        parts = [self._maps[first][1][first_offset:]]
+        parts.extend(self._maps[i][1] for i in range(first + 1, last))
+        parts.append(self._maps[last][1][:last_offset + 1])
+        return np.concatenate(parts)
+
+    def finalize(self):
+        """
+        Flush samples, write the final header and trim the file.
+
+        Returns:
+            Read-only float32 view of all samples, memory-mapped from disk
+        """
+        for chunk_map, _ in self._maps:
+            chunk_map.flush()
+        self._write_header()
+        self._release_chunk_maps()
+        try:
+            self._file.truncate(WAV_HEADER_BYTES + self._length * 4)
+        except OSError:
+            pass  # Still mapped elsewhere (Windows) - header length is authoritative
+        if self._length == 0:
+            return np.empty(0, dtype=np.float32)
+        self._view_map = mmap.mmap(self._file.fileno(), WAV_HEADER_BYTES + self._length * 4,
+                                   access=mmap.ACCESS_READ)
+        return np.frombuffer(self._view_map, dtype=np.float32, count=self._length,
+                             offset=WAV_HEADER_BYTES)
+
+    def _release_chunk_maps(self):
+        maps = self._maps
+        self._maps = []
+        for chunk_map, _ in maps:
+            _close_map(chunk_map)
+
+    def close(self, delete=True):
+        """Unmap and close the file, deleting it unless delete=False."""
+        self._release_chunk_maps()
+        if self._view_map is not None:
+            _close_map(self._view_map)
+            self._view_map = None
+        self._file.close()
+        if delete:
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                log.warning(f"Could not delete spill file {self.path}: {e}")
+
+
+def _close_map(memory_map):
+    """Close an mmap, leaving it to GC if a numpy view still references it."""
+    try:
+        memory_map.close()
+    except BufferError:
+        pass
+
+
+def _last_written_sample(path, num_samples, step=1 << 20):
+    """Length of a spill file's data without its zero-filled chunk tail."""
+    if num_samples <= 0:
+        return 0
+    samples = np.memmap(path, dtype=np.float32, mode="r", offset=WAV_HEADER_BYTES, shape=(num_samples,))
+    try:
+        end = num_samples
+        while end > 0:
+            start = max(0, end - step)
+            nonzero = np.flatnonzero(samples[start:end])
+            if nonzero.size:
+                return start + int(nonzero[-1]) + 1
+            end = start
+        return 0
+    finally:
+        del samples  # Unmap before the caller truncates (required on Windows)
+
+
+def recover_spill_files(directory):
+    """
+    Finalize recordings left behind by a crash.
+
+    Fixes each leftover spill file's WAV header from its size, trims the
+    unwritten (zero) tail of the last chunk and renames it with the
+    "recovered-" prefix so it isn't picked up again.
+
+    Returns:
+        List of recovered file paths
+    """
+    recovered = []
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return recovered
+
+    for name in names:
+        if not (name.startswith(SPILL_PREFIX) and name.endswith(".wav")):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            with open(path, "rb") as f:
+                header = f.read(WAV_HEADER_BYTES)
+            if len(header) < WAV_HEADER_BYTES:
+                continue
+            sample_rate = struct.unpack_from("<I", header, 24)[0]
+            num_samples = _last_written_sample(path, (os.path.getsize(path) - WAV_HEADER_BYTES) // 4)
+            with open(path, "r+b") as f:
+                f.truncate(WAV_HEADER_BYTES + num_samples * 4)
+                f.write(_wav_header(num_samples, sample_rate))
+            recovered_path = os.path.join(directory, RECOVERED_PREFIX + name[len(SPILL_PREFIX):])
+            os.replace(path, recovered_path)
+            recovered.append(recovered_path)
+        except (OSError, struct.error, ValueError) as e:
+            log.warning(f"Could not recover {path}: {e}")
+
+    return recovered
+
+
+class PrerollRing:
+    """Fixed-size ring holding the most recent mono samples."""
+
+    def __init__(self, capacity):
+        self._data = np.zeros(max(1, int(capacity)), dtype=np.float32)
+        self._pos = 0
+        self._filled = 0
+
+    def __len__(self):
+        return self._filled
+
+    def write(self, block):
+        """Append a block, overwriting the oldest samples when full."""
+        samples = block[:, 0] if block.ndim > 1 else block
+        capacity = len(self._data)
+        if len(samples) >= capacity:
+            self._data[:] = samples[-capacity:]
+            self._pos = 0
+            self._filled = capacity
+            return
+        end = self._pos + len(samples)
+        if end <= capacity:
+            self._data[self._pos:end] = samples
+        else:
+            split = capacity - self._pos
+            self._data[self._pos:] = samples[:split]
+            self._data[:end - capacity] = samples[split:]
+        self._pos = end % capacity
+        self._filled = min(capacity, self._filled + len(samples))
+
+    def snapshot(self):
+        """Return the buffered samples, oldest first (a copy)."""
+        if self._filled < len(self._data):
+            return self._data[:self._filled].copy()
+        return np.concatenate((self._data[self._pos:], self._data[:self._pos]))
+
+    def clear(self):
+        """Drop all buffered samples."""
+        self._pos = 0
+        self._filled = 0
+
+
+class WarmCapture:
+    """
+    Input stream kept open between dictations, with a rolling pre-roll.
+
+    While idle, blocks only go into the pre-roll ring. attach() seeds a
+    CaptureBuffer with the pre-roll and routes later blocks into it, so a
+    recording starts without device open latency and includes the audio
+    from just before the hotkey press. The stream closes itself after
+    idle_timeout seconds without an attached buffer, so the microphone
+    isn't held forever; the next attach() reopens it.
+
+    Thread-safe: attach/detach/close can be called from any thread.
+    """
+
+    def __init__(self, open_stream, sample_rate=16000, preroll_seconds=0.5,
+                 idle_timeout=120.0, on_block=None):
+        """
+        Args:
+            open_stream: callable(callback) -> started stream (has stop()/close())
+            sample_rate: Stream sample rate, used to size the pre-roll ring
+            preroll_seconds: Audio kept from before attach()
+            idle_timeout: Seconds without an attached buffer before closing
+            on_block: Optional callable(buffer, start, end, status), called
+                      from the audio callback for every block. buffer is the
+                      attached CaptureBuffer (None while idle) and
+                      [start:end] is where the block landed in it.
+        """
+        self._open_stream = open_stream
+        self._ring = PrerollRing(sample_rate * preroll_seconds)
+        self.idle_timeout = idle_timeout
+        self._on_block = on_block
+        self._stream = None
+        self._target = None
+        self._idle_timer = None
+        # _lock guards ring/target (shared with the audio callback),
+        # _state_lock guards stream open/close and the idle timer
+        self._lock = threading.Lock()
+        self._state_lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self._stream is not None
+
+    @property
+    def is_attached(self):
+        return self._target is not None
+
+    def _callback(self, indata, frames, time_info, status):
+        start = end = 0
+        with self._lock:
+            self._ring.write(indata)
+            target = self._target
+            if target is not None:
+                start = len(target)
+                target.write(indata)
+                end = len(target)
+        if self._on_block is not None:
+            self._on_block(target, start, end, status)
+
+    def open(self):
+        """Open the stream if it isn't already, and restart the idle timer."""
+        with self._state_lock:
+            self._open_locked()
+            self._schedule_idle_close_locked()
+
+    def _open_locked(self):
+        if self._stream is None:
+            with self._lock:
+                self._ring.clear()
+            self._stream = self._open_stream(self._callback)
+
+    def attach(self, buffer):
+        """
+        Start recording into buffer, seeded with the pre-roll.
+        Opens the stream first if it was closed (no pre-roll then).
+        """
+        with self._state_lock:
+            self._cancel_idle_close_locked()
+            self._open_locked()
+            with self._lock:
+                buffer.write(self._ring.snapshot())
+                self._target = buffer
+
+    def detach(self):
+        """Stop routing audio to the attached buffer and return it."""
+        with self._lock:
+            buffer = self._target
+            self._target = None
+        with self._state_lock:
+            if self._stream is not None:
+                self._schedule_idle_close_locked()
+        return buffer
+
+    def close(self):
+        """Close the stream and drop the pre-roll."""
+        with self._state_lock:
+            stream = self._close_locked()
+        self._stop_stream(stream)
+
+    def _close_locked(self):
+        self._cancel_idle_close_locked()
+        stream = self._stream
+        self._stream = None
+        with self._lock:
+            self._target = None
+            self._ring.clear()
+        return stream
+
+    @staticmethod
+    def _stop_stream(stream):
+        if stream is not None:
+            try:
+                stream.stop()
+                stream.close()
+            except Exception:
+                pass  # Device may already be gone
+
+    def _schedule_idle_close_locked(self):
+        self._cancel_idle_close_locked()
+        if self.idle_timeout and self.idle_timeout > 0:
+            self._idle_timer = threading.Timer(self.idle_timeout, self._close_if_idle)
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    def _cancel_idle_close_locked(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _close_if_idle(self):
+        with self._state_lock:
+            # A recording may have attached after the timer fired
+            if self._target is not None:
+                return
+            stream = self._close_locked()
+        self._stop_stream(stream)
+
+
+# Callback duration histogram: log-spaced buckets, 4 per octave from 10 us
+_TIMING_EDGES = [10e-6 * 2 ** (i / 4) for i in range(61)]  # up to ~336 ms
+
+
+class CaptureStats:
+    """
+    Counters for the capture path, updated from the audio callback.
+
+    PortAudio reports xruns through the callback's status flags; counting
+    them tells missed words caused by dropped audio apart from model errors.
+    Callback durations go into a fixed log-spaced histogram so recording
+    one costs a bisect and an increment, with no allocation.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, started_at=None):
+        """
+        Zero all counters for a new recording.
+
+        Args:
+            started_at: time.perf_counter() of the hotkey press, for
+                        measuring the gap to the first captured block
+        """
+        self.blocks = 0
+        self.input_overflows = 0
+        self.input_underflows = 0
+        self.started_at = started_at
+        self.first_block_latency = None
+        self._timing_counts = [0] * (len(_TIMING_EDGES) + 1)
+        self._timed = 0
+        self._max_duration = 0.0
+
+    def record(self, status):
+        """Count one callback and any status flags it reported."""
+        self.blocks += 1
+        if status:
+            if getattr(status, "input_overflow", False):
+                self.input_overflows += 1
+            if getattr(status, "input_underflow", False):
+                self.input_underflows += 1
+
+    def record_first_block(self, now=None):
+        """Note the first captured block of the recording (once)."""
+        if self.first_block_latency is None and self.started_at is not None:
+            now = time.perf_counter() if now is None else now
+            self.first_block_latency = max(0.0, now - self.started_at)
+
+    def record_duration(self, seconds):
+        """Add one callback duration to the histogram."""
+        self._timing_counts[bisect.bisect_left(_TIMING_EDGES, seconds)] += 1
+        self._timed += 1
+        if seconds > self._max_duration:
+            self._max_duration = seconds
+
+    def duration_percentile(self, percent):
+        """
+        Approximate callback duration percentile in seconds (bucket upper
+        edge), or None if nothing was timed.
+        """
+        if not self._timed:
+            return None
+        rank = max(1, math.ceil(self._timed * percent / 100.0))
+        seen = 0
+        for index, count in enumerate(self._timing_counts):
+            seen += count
+            if seen >= rank:
+                if index == len(_TIMING_EDGES):
+                    return self._max_duration
+                return min(_TIMING_EDGES[index], self._max_duration)
+        return self._max_duration
+
+    def as_dict(self):
+        """Counters and timings; durations in milliseconds (None if unknown)."""
+        def ms(seconds):
+            return None if seconds is None else round(seconds * 1000, 3)
+
+        return {
+            "blocks": self.blocks,
+            "input_overflows": self.input_overflows,
+            "input_underflows": self.input_underflows,
+            "first_block_ms": ms(self.first_block_latency),
+            "callback_p50_ms": ms(self.duration_percentile(50)),
+            "callback_p95_ms": ms(self.duration_percentile(95)),
+            "callback_p99_ms": ms(self.duration_percentile(99)),
+            "callback_max_ms": ms(self._max_duration if self._timed else None),
+        }
+
+
+def get_diagnostics_path():
+    """Get path to capture_diagnostics.json in user's AppData directory."""
+    app_data = os.environ.get("APPDATA", os.path.expanduser("~"))
+    config_dir = os.path.join(app_data, "MurmurTone")
+    os.makedirs(config_dir, exist_ok=True)
+    return os.path.join(config_dir, "capture_diagnostics.json")
+
+
+def save_diagnostics(diagnostics):
+    """
+    Publish capture diagnostics for the settings window (a separate
+    process). Written to a temp file and renamed so readers never see a
+    partial file.
+    """
+    path = get_diagnostics_path()
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "w") as f:
+            json.dump(diagnostics, f, indent=2)
+        os.replace(temp_path, path)
+    except OSError as e:
+        log.warning(f"Could not save capture diagnostics: {e}")
+
+
+def load_diagnostics():
+    """Load the last published capture diagnostics, or None."""
+    try:
+        with open(get_diagnostics_path(), "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+class SilenceDetector:
+    """
+    Adaptive end-of-speech detector for auto-stop mode.
+
+    Tracks the peak level of loud sounds (speech) and reports silence once
+    the level stays margin_db below that peak for silence_duration seconds.
+    Before any speech is heard, a fixed quiet-room threshold is used.
+    """
+
+    SPEECH_DB = -50  # Only louder sounds count toward the peak (not ambient noise)
+    NO_SPEECH_THRESHOLD_DB = -50  # Silence threshold until speech is detected
+
+    def __init__(self, silence_duration=2.0, margin_db=-20):
+        self.silence_duration = silence_duration
+        self.margin_db = margin_db
+        self.peak_db = -100
+        self._silence_start = None
+
+    def update(self, db, now):
+        """
+        Feed one block's level.
+
+        Args:
+            db: Block level in dBFS
+            now: Block timestamp in seconds
+
+        Returns:
+            True once when the silence duration has been exceeded
+        """
+        if db > self.SPEECH_DB:
+            self.peak_db = max(self.peak_db, db)
+
+        # Use adaptive threshold only if we detected actual speech
+        if self.peak_db > -90:
+            threshold = self.peak_db + self.margin_db
+        else:
+            threshold = self.NO_SPEECH_THRESHOLD_DB
+
+        if db > threshold:
+            self._silence_start = None
+            return False
+        if self._silence_start is None:
+            self._silence_start = now
+            return False
+        if now - self._silence_start >= self.silence_duration:
+            self._silence_start = None  # Prevent re-triggering
+            return True
+        return False
+
+
+class BlockAnalyzer:
+    """
+    Worker thread that analyzes captured blocks off the audio callback.
+
+    The callback only calls submit() with where a block landed in the
+    CaptureBuffer; handler(buffer, start, end) then runs on the worker,
+    so level metering, UI updates and auto-stop never hold up PortAudio.
+    """
+
+    def __init__(self, handler):
+        self._handler = handler
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the worker thread. Safe to call multiple times."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Stop the worker after it drains queued blocks."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout=2.0)
+
+    def submit(self, buffer, start, end):
+        """Queue a block for analysis (non-blocking, callback-safe)."""
+        self._queue.put_nowait((buffer, start, end))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                self._handler(*item)
+            except Exception as e:
+                # Never let a bad block kill the worker
+                log.warning(f"Audio analysis failed: {e}")
@@ -0,0 +1,289 @@
+"""
+CPU threading calibration for MurmurTone.
+
+CTranslate2's defaults (one worker, four threads) leave most cores idle
+on many-core machines, while too many threads per worker fight over
+memory bandwidth. calibrate() times a fixed synthetic dictation across
+candidate (num_workers, cpu_threads) pairs for the selected model and
+picks the fastest. The winner is stored in config (decode_concurrency,
+cpu_threads) and the full report in cpu_autotune.json next to
+settings.json, so the settings window can show it.
+"""
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+import inference_backend
+import parallel_decode
+
+log = logging.getLogger("murmurtone")
+
+
+SAMPLE_RATE = 16000
+
+# Calibration clips: a typical short dictation and a long one that is
+# split into parallel chunks
+SHORT_SECONDS = 5
+LONG_SECONDS = 45
+
+
+# (F1, F2) formants in Hz of a few vowels, for speech-like calibration audio
+VOWEL_FORMANTS = [(730, 1090), (270, 2290), (300, 870), (530, 1840), (570, 840)]
+
+
+def _syllable(rng, f0):
+    """A consonant noise burst followed by a formant-shaped voiced vowel."""
+    burst = np.diff(rng.standard_normal(int(rng.uniform(0.03, 0.08) * SAMPLE_RATE) + 1)) * 0.03
+
+    n = int(rng.uniform(0.12, 0.3) * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    pitch = f0 * (1 + 0.08 * np.sin(2 * np.pi * rng.uniform(1, 3) * t + rng.uniform(0, 2 * np.pi)))
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    f1, f2 = VOWEL_FORMANTS[rng.integers(len(VOWEL_FORMANTS))]
+    vowel = np.zeros(n)
+    for k in range(1, int(4000 // f0) + 1):
+        freq = k * f0
+        gain = 1 / (1 + ((freq - f1) / 90) ** 2) + 0.5 / (1 + ((freq - f2) / 120) ** 2) + 0.02
+        vowel += gain / np.sqrt(k) * np.sin(k * phase)
+    vowel *= np.hanning(n) * 0.3 / np.max(np.abs(vowel))
+    return np.concatenate([burst, vowel])
+
+
+def calibration_audio(seconds, seed=0):
+    """
+    Deterministic speech-like phrases of 2-6 s separated by pauses.
+
+    Each phrase is a run of syllables (harmonic voice source with pitch
+    movement, shaped by vowel formants, led by a noise burst) so the model
+    decodes something closer to dictation than a pure tone.
+    """
+    rng = np.random.default_rng(seed)
+    parts = []
+    total = 0
+    while total < seconds * SAMPLE_RATE:
+        phrase_len = int(rng.uniform(2, 6) * SAMPLE_RATE)
+        f0 = rng.uniform(100, 220)
+        syllables = []
+        length = 0
+        while length < phrase_len:
+            syllables.append(_syllable(rng, f0))
+            length += len(syllables[-1])
+        phrase = np.concatenate(syllables)[:phrase_len]
+        pause = rng.standard_normal(int(rng.uniform(0.4, 1.2) * SAMPLE_RATE)) * 1e-4
+        parts.extend([phrase, pause])
+        total += len(phrase) + len(pause)
+    return np.concatenate(parts)[:seconds * SAMPLE_RATE].astype(np.float32)
+
+
+class CalibrationStopped(Exception):
+    """should_stop() fired while a candidate was being measured."""
+
+
+def stoppable(transcribe, should_stop):
+    """Wrap transcribe(audio) to raise CalibrationStopped instead of decoding once should_stop() is true."""
+    if should_stop is None:
+        return transcribe
+
+    def checked(audio):
+        if should_stop():
+            raise CalibrationStopped()
+        return transcribe(audio)
+
+    return checked
+
+
+def candidate_settings(cpu_count=None):
+    """
+    (num_workers, cpu_threads) pairs worth measuring on this machine.
+
+    Workers from {1, 2, 4} (at most half the cores), each with either all
+    of its share of the cores or half of it.
+    """
+    cores = cpu_count or os.cpu_count() or 1
+    candidates = []
+    for workers in (1, 2, 4):
+        if workers > 1 and workers > cores // 2:
+            break
+        share = max(1, cores // workers)
+        for threads in sorted({share, max(1, share // 2)}, reverse=True):
+            candidates.append((workers, threads))
+    return candidates
+
+
+def calibrate(load, candidates=None, on_progress=None, should_stop=None):
+    """
+    Time each candidate and return them fastest first.
+
+    Args:
+        load: callable(num_workers, cpu_threads) -> transcribe(audio) -> text;
+              called once per candidate. If transcribe has an unload()
+              attribute, it is called when the candidate is done
+        candidates: (num_workers, cpu_threads) pairs (default: candidate_settings())
+        on_progress: Optional callable(done, total, candidate)
+        should_stop: Optional callable() -> bool, checked before each
+                     candidate and each decode; True abandons (and unloads)
+                     the current candidate and ends calibration early
+
+    Returns:
+        List of result dicts sorted by score_s; failed candidates (with an
+        "error" key) come last. None if stopped early
+    """
+    candidates = candidates or candidate_settings()
+    short_clip = calibration_audio(SHORT_SECONDS, seed=1)
+    long_clip = calibration_audio(LONG_SECONDS, seed=2)
+
+    results = []
+    for done, (workers, threads) in enumerate(candidates):
+        if should_stop is not None and should_stop():
+            log.info("Calibration stopped early")
+            return None
+        if on_progress is not None:
+            on_progress(done, len(candidates), (workers, threads))
+        result = {"num_workers": workers, "cpu_threads": threads}
+        transcribe = None
+        try:
+            transcribe = load(workers, threads)
+            decode = stoppable(transcribe, should_stop)
+            decode(short_clip[:SAMPLE_RATE])  # Warm-up, excluded from timing
+
+            start = time.perf_counter()
+            decode(short_clip)
+            result["short_s"] = round(time.perf_counter() - start, 3)
+
+            start = time.perf_counter()
+            parallel_decode.transcribe_long(long_clip, SAMPLE_RATE, decode, workers,
+                                            min_parallel_seconds=0)
+            result["long_s"] = round(time.perf_counter() - start, 3)
+            result["score_s"] = round(result["short_s"] + result["long_s"], 3)
+        except CalibrationStopped:
+            log.info("Calibration stopped early")
+            return None
+        except Exception as e:
+            log.warning(f"Calibration of {workers} worker(s) x {threads} thread(s) failed: {e}")
+            result["error"] = str(e)
+        finally:
+            # Free this candidate's model before the next
+            unload = getattr(transcribe, "unload", None)
+            transcribe = None
+            if unload is not None:
+                unload()
+        results.append(result)
+
+    if on_progress is not None:
+        on_progress(len(candidates), len(candidates), None)
+    return sorted(results, key=lambda r: r.get("score_s", float("inf")))
+
+
+def backend_loader(model_path, compute_type="int8", backend=None, options=None, should_stop=None):
+    """
+    load() for calibrate() that builds CPU models through inference_backend.
+
+    Args:
+        model_path: Model name or directory
+        compute_type: CTranslate2 compute type
+        backend: inference_backend.BACKENDS name (default faster-whisper)
+        options: Extra backend constructor arguments
+        should_stop: Optional callable() -> bool, checked between the
+                     segments of a decode (raises CalibrationStopped)
+    """
+    def load(workers, threads):
+        model = inference_backend.create_backend(backend, model_path, device="cpu", compute_type=compute_type,
+                                                 num_workers=workers, cpu_threads=threads, **(options or {}))
+
+        def transcribe(audio):
+            segments, _ = model.transcribe(audio, language="en")
+            texts = []
+            # Segments decode lazily, so stopping here skips the rest of the audio
+            for segment in segments:
+                texts.append(segment.text)
+                if should_stop is not None and should_stop():
+                    raise CalibrationStopped()
+            return "".join(texts)
+
+        transcribe.unload = model.unload
+        return transcribe
+
+    return load
+
+
+def run(model_size, model_path=None, compute_type="int8", on_progress=None, load=None,
+        backend=None, backend_options=None, should_stop=None):
+    """
+    Calibrate a model and build the report.
+
+    Args:
+        backend, backend_options: Inference backend for the default loader
+                                  (see inference_backend.configured_backend)
+        should_stop: See calibrate()
+
+    Returns:
+        Report dict; "best" is None if every candidate failed. None if
+        stopped early
+    """
+    if load is None:
+        load = backend_loader(model_path or model_size, compute_type, backend, backend_options, should_stop)
+    log.info(f"Calibrating CPU threading for {model_size}...")
+    results = calibrate(load, on_progress=on_progress, should_stop=should_stop)
+    if results is None:
+        return None
+    best = results[0] if results and "error" not in results[0] else None
+    if best:
+        log.info(f"Fastest: {best['num_workers']} worker(s) x {best['cpu_threads']} thread(s), "
+                 f"{best['score_s']:.2f}s")
+    return {
+        "model": model_size,
+        "compute_type": compute_type,
+        "cpu_count": os.cpu_count(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "results": results,
+        "best": best,
+    }
+
+
+def apply_report(app_config, report):
+    """
+    Store the fastest setting from a report in the config dict.
+
+    Returns:
+        True if the config was changed
+    """
+    best = report.get("best")
+    if not best:
+        return False
+    app_config["decode_concurrency"] = best["num_workers"]
+    app_config["cpu_threads"] = best["cpu_threads"]
+    app_config["cpu_autotune_model"] = report["model"]
+    return True
+
+
+def get_report_path():
+    """Get path to cpu_autotune.json in user's AppData directory."""
+    app_data = os.environ.get("APPDATA", os.path.expanduser("~"))
+    config_dir = os.path.join(app_data, "MurmurTone")
+    os.makedirs(config_dir, exist_ok=True)
+    return os.path.join(config_dir, "cpu_autotune.json")
+
+
+def save_report(report):
+    """Write the report atomically (temp file + rename)."""
+    path = get_report_path()
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "w") as f:
+            json.dump(report, f, indent=2)
+        os.replace(temp_path, path)
+    except OSError as e:
+        log.warning(f"Could not save calibration report: {e}")
+
+
+def load_report():
+    """Load the last calibration report, or None."""
+    try:
+        with open(get_report_path(), "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
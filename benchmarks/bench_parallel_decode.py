@@ -0,0 +1,93 @@
+"""
+Benchmark: sequential vs. parallel chunk decoding of long recordings.
+
+Builds synthetic dictations (tone "phrases" separated by pauses) and
+decodes them with parallel_decode.transcribe_long at several concurrency
+caps. By default the model is simulated: each call sleeps in proportion
+to the audio length, releasing the GIL like CTranslate2 does, which
+shows the scheduling/chunking overhead and the ideal speedup. With
+--model, a real faster-whisper model is loaded with num_workers set to
+each cap (the synthetic audio decodes to nonsense, but the timing is
+real).
+
+Usage:
+    python benchmarks/bench_parallel_decode.py
+    python benchmarks/bench_parallel_decode.py --model tiny --durations 180
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parallel_decode
+
+SAMPLE_RATE = 16000
+SIMULATED_RTF = 0.05  # Simulated decode time per second of audio
+
+
+def synthetic_dictation(seconds, seed=0):
+    """Phrases of 2-6 s separated by 0.4-1.2 s pauses."""
+    rng = np.random.default_rng(seed)
+    parts = []
+    total = 0
+    while total < seconds * SAMPLE_RATE:
+        phrase_len = int(rng.uniform(2, 6) * SAMPLE_RATE)
+        t = np.arange(phrase_len) / SAMPLE_RATE
+        freq = rng.uniform(120, 300)
+        phrase = 0.3 * np.sin(2 * np.pi * freq * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t))
+        pause = rng.standard_normal(int(rng.uniform(0.4, 1.2) * SAMPLE_RATE)) * 1e-4
+        parts.extend([phrase, pause])
+        total += len(phrase) + len(pause)
+    return np.concatenate(parts)[:seconds * SAMPLE_RATE].astype(np.float32)
+
+
+def simulated_transcribe(audio):
+    time.sleep(len(audio) / SAMPLE_RATE * SIMULATED_RTF)
+    return "text"
+
+
+def real_transcriber(model_name, workers):
+    from faster_whisper import WhisperModel
+
+    model = WhisperModel(model_name, device="cpu", compute_type="int8", num_workers=workers,
+                         cpu_threads=parallel_decode.cpu_threads_per_worker(workers))
+
+    def transcribe(audio):
+        segments, _ = model.transcribe(audio, language="en")
+        return "".join(segment.text for segment in segments)
+
+    return transcribe
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--model", help="faster-whisper model name (default: simulated model)")
+    parser.add_argument("--durations", type=int, nargs="+", default=[60, 180])
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=[1, 2, 4])
+    args = parser.parse_args()
+
+    print(f"CPU cores: {os.cpu_count()}, model: {args.model or f'simulated (RTF {SIMULATED_RTF})'}")
+    print(f"{'duration':>9} | {'workers':>7} | {'chunks':>6} | {'time (s)':>8} | {'speedup':>7}")
+    print("-" * 50)
+    for seconds in args.durations:
+        audio = synthetic_dictation(seconds)
+        chunks = len(parallel_decode.vad.split_at_pauses(audio, SAMPLE_RATE, parallel_decode.MAX_CHUNK_SECONDS))
+        baseline = None
+        for workers in args.workers:
+            transcribe = real_transcriber(args.model, workers) if args.model else simulated_transcribe
+            transcribe(audio[:SAMPLE_RATE])  # Warm-up, excluded from timing
+            start = time.perf_counter()
+            parallel_decode.transcribe_long(audio, SAMPLE_RATE, transcribe, workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{seconds:>8}s | {workers:>7} | {chunks if workers > 1 else 1:>6} | "
+                  f"{elapsed:>8.2f} | {baseline / elapsed:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark: dictation and file pipelines end to end, without a model.
+
+Runs speech-like recordings through the app's own capture buffer, VAD
+and dictation stages (dictation_stages: transcribe, text processing,
+output) and a WAV file through file transcription, using
+inference_backend.FakeBackend with a configurable decode cost. Keystrokes
+go to a counting keyboard; the output stage keeps the app's typing pauses.
+Reports per-stage and end-to-end timings, so pipeline overhead and
+scheduling can be measured on a machine without model weights.
+
+Usage:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --dictations 20 --seconds 8 --rtf 0.1 --latency 0.05
+"""
+import argparse
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import audio_capture
+import autotune
+import dictation_pipeline
+import dictation_stages
+import file_transcription
+import inference_backend
+import text_processor
+
+SAMPLE_RATE = 16000
+TEXT = "um so the meeting is at three period new paragraph uh please bring the notes"
+APP_CONFIG = {"language": "en", "voice_commands_enabled": True, "filler_removal_enabled": True,
+              "preview_enabled": False, "paste_mode": "direct", "direct_typing_delay_ms": 0}
+text_pipeline = text_processor.TextPipeline(APP_CONFIG)
+
+
+class NullKeyboard:
+    """Keyboard that counts keystrokes instead of typing them."""
+
+    def __init__(self):
+        self.keystrokes = 0
+
+    def press(self, key):
+        self.keystrokes += 1
+
+    def release(self, key):
+        pass
+
+    def type(self, text):
+        self.keystrokes += len(text)
+
+
+def make_stages(backend):
+    """The app's dictation stages around backend, typing into a NullKeyboard."""
+    return dictation_stages.DictationStages(
+        get_config=lambda: APP_CONFIG,
+        get_text_pipeline=lambda: text_pipeline,
+        transcribe=lambda audio, params: dictation_stages.decode_audio(backend, audio, params),
+        keyboard=NullKeyboard(),
+        history=text_processor.TranscriptionHistory(persist=False),
+    )
+
+
+def record(audio, block=512):
+    """Write audio into a CaptureBuffer block by block, like the input callback."""
+    capture = audio_capture.CaptureBuffer(SAMPLE_RATE)
+    for start in range(0, len(audio), block):
+        capture.write(audio[start:start + block])
+    return capture
+
+
+def run_dictations(backend, count, seconds):
+    """
+    Submit count recordings back to back through capture, VAD and the
+    dictation stages; return per-stage and end-to-end latencies.
+    """
+    stage_times = {"transcribe": [], "process": [], "output": []}
+    latencies = []
+    audio = autotune.calibration_audio(math.ceil(seconds))[:int(seconds * SAMPLE_RATE)]
+
+    def timed(name, func):
+        def stage(dictation):
+            start = time.perf_counter()
+            result = func(dictation)
+            stage_times[name].append(time.perf_counter() - start)
+            if name == "output":
+                latencies.append(time.perf_counter() - dictation.submitted)
+            return result
+        return stage
+
+    pipeline = dictation_pipeline.StagedPipeline(
+        [(name, timed(name, func)) for name, func in make_stages(backend).stages()]
+    )
+    pipeline.start()
+    start = time.perf_counter()
+    for _ in range(count):
+        dictation = dictation_stages.Dictation(record(audio), None, {"language": "en"}, "", None)
+        dictation.submitted = time.perf_counter()
+        pipeline.submit(dictation)
+    pipeline.wait_idle()
+    total = time.perf_counter() - start
+    pipeline.stop()
+    return stage_times, latencies, total
+
+
+def run_file(backend, seconds):
+    """Transcribe a silent WAV file of the given length; return (seconds, text)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.wav")
+        with wave.open(path, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(SAMPLE_RATE)
+            f.writeframes(b"\0\0" * int(seconds * SAMPLE_RATE))
+        start = time.perf_counter()
+        text, success = file_transcription.transcribe_file(path, backend, APP_CONFIG)
+        assert success
+        return time.perf_counter() - start, text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--dictations", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=5.0, help="Length of each dictation")
+    parser.add_argument("--file-seconds", type=float, default=120.0)
+    parser.add_argument("--rtf", type=float, default=0.05, help="Simulated decode seconds per audio second")
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated fixed cost per decode")
+    args = parser.parse_args()
+
+    backend = inference_backend.create_backend("fake", None, text=TEXT, latency_s=args.latency,
+                                               realtime_factor=args.rtf)
+    cold, warm = backend.warm_up()
+    print(f"Fake backend: RTF {args.rtf}, latency {args.latency * 1000:.0f} ms "
+          f"(warm-up cold {cold * 1000:.1f} ms, warm {warm * 1000:.1f} ms)")
+
+    stage_times, latencies, total = run_dictations(backend, args.dictations, args.seconds)
+    print(f"\n{args.dictations} dictations of {args.seconds:.1f}s: {total:.3f}s total")
+    print(f"{'stage':>10} | {'mean (ms)':>9} | {'max (ms)':>8}")
+    print("-" * 34)
+    for name, times in stage_times.items():
+        print(f"{name:>10} | {statistics.mean(times) * 1000:>9.2f} | {max(times) * 1000:>8.2f}")
+    print(f"{'end-to-end':>10} | {statistics.mean(latencies) * 1000:>9.2f} | {max(latencies) * 1000:>8.2f}")
+
+    elapsed, text = run_file(backend, args.file_seconds)
+    print(f"\nFile of {args.file_seconds:.0f}s: {elapsed:.3f}s, {len(text)} characters")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: streaming polyphase resampling to 16 kHz mono.
+
+Feeds 60 s of audio through PolyphaseResampler in PortAudio-sized
+blocks, the way the input callback does, for the common native device
+formats. Reports per-block cost (this runs on the audio thread, so the
+worst block matters) and overall speed relative to real time.
+
+Usage:
+    python benchmarks/bench_resample.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resampler import PolyphaseResampler
+
+SECONDS = 60
+FORMATS = [  # (native rate, channels, frames per callback)
+    (48000, 1, 480),
+    (48000, 2, 480),
+    (48000, 1, 1024),
+    (44100, 1, 441),
+    (44100, 2, 441),
+    (44100, 1, 1024),
+]
+
+
+def run(rate, channels, block_frames):
+    """Return (per-block times in seconds, output sample count)."""
+    rng = np.random.default_rng(0)
+    block = (0.1 * rng.standard_normal((block_frames, channels))).astype(np.float32)
+    res = PolyphaseResampler(rate, channels=channels)
+    times = []
+    produced = 0
+    for _ in range(SECONDS * rate // block_frames):
+        start = time.perf_counter()
+        produced += len(res.process(block))
+        times.append(time.perf_counter() - start)
+    produced += len(res.flush())
+    return np.array(times), produced
+
+
+def main():
+    print(f"{'format':>19} | {'block':>6} | {'taps':>5} | {'mean (us)':>9} | {'p99 (us)':>8} | "
+          f"{'max (us)':>8} | {'x realtime':>10}")
+    print("-" * 87)
+    for rate, channels, block_frames in FORMATS:
+        times, produced = run(rate, channels, block_frames)
+        taps = PolyphaseResampler(rate)._taps
+        label = f"{rate / 1000:g}k {'stereo' if channels == 2 else 'mono'} -> 16k"
+        realtime = SECONDS / times.sum()
+        print(f"{label:>19} | {block_frames:>6} | {taps:>5} | {times.mean() * 1e6:>9.1f} | "
+              f"{np.percentile(times, 99) * 1e6:>8.1f} | {times.max() * 1e6:>8.1f} | {realtime:>9.0f}x")
+        assert produced == PolyphaseResampler(rate).output_length(len(times) * block_frames)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Benchmark: trie-based voice command engine vs. the previous word-window scan.
+
+Generates long transcripts (prose with voice commands mixed in, as in a
+long dictation or a transcribed file) and times process_voice_commands
+against the previous implementation, checking that both give the same
+output.
+
+Usage:
+    python benchmarks/bench_voice_commands.py
+    python benchmarks/bench_voice_commands.py --words 10000 50000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import text_processor
+
+PROSE = ("the quarterly report shows that our team shipped the new release on time and "
+         "customers were happy with the changes we made to the search page").split()
+COMMANDS = ["period", "comma", "new line", "new paragraph", "question mark", "bullet point",
+            "capitalize that", "delete last word", "colon", "exclamation point"]
+
+
+def legacy_process_voice_commands(text):
+    """Previous approach: per-position 3-/2-/1-word f-strings probed against each table."""
+    if not text:
+        return text, False, []
+
+    words = text.split()
+    result = []
+    i = 0
+    should_scratch = False
+    actions = []
+
+    def strip_punctuation(word):
+        """Strip leading/trailing punctuation from a word."""
+        return word.strip('.,!?;:"\'-()[]{}')
+
+    while i < len(words):
+        # Check for 3-word commands first (delete last word)
+        if i + 2 < len(words):
+            three_word = f"{strip_punctuation(words[i])} {strip_punctuation(words[i + 1])} {strip_punctuation(words[i + 2])}".lower()
+
+            # Check deletion commands (delete last word)
+            if three_word in text_processor.DELETION_COMMANDS:
+                # Remove only the last word from result buffer
+                if result:
+                    result.pop()
+                i += 3
+                continue
+
+        # Check for multi-word commands (2-word phrases)
+        if i + 1 < len(words):
+            two_word = f"{strip_punctuation(words[i])} {strip_punctuation(words[i + 1])}".lower()
+
+            # Check case manipulation commands (capitalize that, uppercase that, lowercase that)
+            if two_word in text_processor.CASE_MANIPULATION_COMMANDS:
+                # Apply case transformation to last word in result buffer
+                if result:
+                    last_word = result[-1]
+                    case_op = text_processor.CASE_MANIPULATION_COMMANDS[two_word]
+
+                    if case_op == "capitalize":
+                        # Capitalize first letter only
+                        result[-1] = last_word[0].upper() + last_word[1:] if len(last_word) > 0 else last_word
+                    elif case_op == "uppercase":
+                        # Convert entire word to uppercase
+                        result[-1] = last_word.upper()
+                    elif case_op == "lowercase":
+                        # Convert entire word to lowercase
+                        result[-1] = last_word.lower()
+                i += 2
+                continue
+
+            # Check editing commands (scratch that, delete that)
+            if two_word in text_processor.EDITING_COMMANDS:
+                # Remove everything before this and signal scratch
+                result = []
+                should_scratch = True
+                i += 2
+                continue
+
+            # Check action commands (select all)
+            if two_word in text_processor.ACTION_COMMANDS:
+                actions.append(text_processor.ACTION_COMMANDS[two_word])
+                i += 2
+                continue
+
+            # Check structure commands (new line, new paragraph)
+            if two_word in text_processor.STRUCTURE_COMMANDS:
+                # Attach to previous word without space
+                if result:
+                    result[-1] = result[-1].rstrip() + text_processor.STRUCTURE_COMMANDS[two_word]
+                else:
+                    result.append(text_processor.STRUCTURE_COMMANDS[two_word])
+                i += 2
+                continue
+
+            # Check formatting commands (bullet point, numbered list)
+            if two_word in text_processor.FORMATTING_COMMANDS:
+                result.append(text_processor.FORMATTING_COMMANDS[two_word])
+                i += 2
+                continue
+
+            # Check punctuation commands (question mark, exclamation point)
+            if two_word in text_processor.PUNCTUATION_COMMANDS:
+                # Attach to previous word without space (strip existing punctuation to avoid duplicates)
+                if result:
+                    result[-1] = result[-1].rstrip().rstrip('.,!?;:') + text_processor.PUNCTUATION_COMMANDS[two_word]
+                else:
+                    result.append(text_processor.PUNCTUATION_COMMANDS[two_word])
+                i += 2
+                continue
+
+        # Single word commands - strip punctuation for matching
+        word_clean = strip_punctuation(words[i]).lower()
+
+        # Check single-word action commands (undo, redo, copy, paste, cut)
+        if word_clean in text_processor.ACTION_COMMANDS:
+            # Standalone-only commands require being the entire utterance
+            # This prevents mishearings like "peace" triggering paste in sentences
+            is_standalone_only = word_clean in text_processor.STANDALONE_ACTION_COMMANDS
+            is_standalone = len(words) == 1
+            if not is_standalone_only or is_standalone:
+                actions.append(text_processor.ACTION_COMMANDS[word_clean])
+                i += 1
+                continue
+
+        # Check single-word formatting commands (bullet)
+        if word_clean in text_processor.FORMATTING_COMMANDS:
+            result.append(text_processor.FORMATTING_COMMANDS[word_clean])
+            i += 1
+            continue
+
+        # Check single-word punctuation commands
+        if word_clean in text_processor.PUNCTUATION_COMMANDS:
+            should_convert = True
+
+            # For ambiguous words (period, colon, etc.), use position heuristics
+            if word_clean in text_processor.AMBIGUOUS_PUNCTUATION:
+                is_end = (i == len(words) - 1)
+                # Check if next word suggests this is a command (sentence-starting word)
+                next_word = strip_punctuation(words[i + 1]).lower() if i + 1 < len(words) else ""
+                next_is_structure = next_word in {"and", "but", "so", "then", "the", "a", "i", "new", "it", "we", "he", "she", "they", "this", "that"}
+
+                # Only treat as punctuation if at end OR followed by sentence-starting word
+                should_convert = is_end or next_is_structure
+
+            if should_convert:
+                # Attach to previous word without space (strip existing punctuation to avoid duplicates)
+                if result:
+                    result[-1] = result[-1].rstrip().rstrip('.,!?;:') + text_processor.PUNCTUATION_COMMANDS[word_clean]
+                else:
+                    result.append(text_processor.PUNCTUATION_COMMANDS[word_clean])
+                i += 1
+                continue
+
+        # Not a command - keep the word
+        result.append(words[i])
+        i += 1
+
+    # Join and clean up spaces after newlines
+    output = ' '.join(result)
+    output = output.replace('\n ', '\n')  # Remove space after newline
+    return output, should_scratch, actions
+
+
+def transcript(words, seed=0):
+    """Prose with a voice command every ~8 words."""
+    rng = random.Random(seed)
+    parts = []
+    while len(parts) < words:
+        parts.extend(rng.sample(PROSE, rng.randint(4, 12)))
+        parts.extend(rng.choice(COMMANDS).split())
+    return " ".join(parts[:words])
+
+
+def best_time(func, text, repeats=5):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(text)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--words", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    print(f"{'words':>7} | {'previous (ms)':>13} | {'trie (ms)':>9} | {'speedup':>7}")
+    print("-" * 47)
+    for words in args.words:
+        text = transcript(words)
+        legacy_time, legacy_result = best_time(legacy_process_voice_commands, text)
+        trie_time, trie_result = best_time(text_processor.process_voice_commands, text)
+        assert trie_result == legacy_result, "outputs differ"
+        print(f"{words:>7} | {legacy_time * 1000:>13.2f} | {trie_time * 1000:>9.2f} | "
+              f"{legacy_time / trie_time:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,31 @@ DEFAULTS = {
     "silence_threshold_db": -20,  # dB margin below peak for auto-stop (-40 = very sensitive, -10 = less sensitive)
     "audio_feedback": True,
     "input_device": None,  # None = system default, or device name string
+    "warm_capture_enabled": False,  # Keep the mic stream open between dictations (no start clipping)
+    "warm_capture_preroll_ms": 500,  # Audio kept from just before the hotkey press
+    "warm_capture_idle_timeout_sec": 120,  # Close the warm stream after this long without recording
+    "vad_enabled": True,  # Trim silence before transcription, skip the model when there's no speech
+    "vad_padding_ms": 300,  # Audio kept around detected speech
+    "streaming_enabled": False,  # Transcribe at pauses while recording (faster text after stop)
+    "streaming_min_pause_ms": 500,  # Pause length that ends a streaming segment
+    "capture_spill_after_sec": 300,  # Recordings longer than this move to a temp file (bounded RAM)
+    "decode_concurrency": 0,  # Parallel chunk decodes for long recordings (0 = auto: 1 on CPU until calibrated)
+    "cpu_threads": 0,  # CTranslate2 threads per decode worker on CPU (0 = library default, or split cores evenly between several workers)
+    "cpu_autotune_model": "",  # Model the CPU threading was calibrated with ("" = calibrate once idle)
+    "cpu_autotune_idle_min": 5,  # Calibrate CPU threading after this many idle minutes (0 = only from settings)
+    "model_preload_enabled": True,  # Read model files into the OS cache during startup (faster cold start)
+    "model_warmup_enabled": True,  # Warm-up decode after loading so the first dictation isn't slow
+    "model_rewarm_idle_min": 30,  # Re-warm the model after this many idle minutes (0 = never)
+    "model_pool_budget_mb": 2048,  # Memory for keeping recently used models loaded (0 = active only)
+    "two_pass_enabled": False,  # Type a fast draft, then correct it with the selected model
+    "draft_model_size": "tiny",  # Model used for the draft pass
+    "pipeline_max_pending": 3,  # Finished dictations allowed to queue for transcription
+    "language_cache_enabled": True,  # With language "auto", detect once and reuse for later dictations
+    "lid_model_size": "",  # Small model for language detection ("" = the selected model)
+    "lid_confidence": 0.8,  # Minimum detection probability to reuse the language
+    "lid_cache_half_life_min": 30,  # Reused language's confidence halves every N minutes
+    "inference_backend": "faster-whisper",  # "faster-whisper", or "fake" for benchmarking without models
+    "fake_backend_options": {},  # FakeBackend arguments (text, latency_s, realtime_factor, ...)
     "paste_mode": "clipboard",  # "clipboard" (uses Ctrl+V) or "direct" (types directly)
     "direct_typing_delay_ms": 5,  # Delay between characters in direct typing mode (ms)
     "start_with_windows": False,  # Launch on Windows startup
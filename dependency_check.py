@@ -7,6 +7,8 @@ import sys
 import tkinter as tk
 from tkinter import messagebox
 
+import hardware_caps
+
 try:
     import customtkinter as ctk
     from theme import (
@@ -33,20 +35,7 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 # Required CUDA DLL files for GPU support
-GPU_REQUIRED_DLLS = [
-    # cuBLAS
-    "cublas64_12.dll",
-    "cublasLt64_12.dll",
-    # cuDNN
-    "cudnn64_9.dll",
-    "cudnn_ops64_9.dll",
-    "cudnn_cnn64_9.dll",
-    "cudnn_adv64_9.dll",
-    "cudnn_engines_precompiled64_9.dll",
-    "cudnn_engines_runtime_compiled64_9.dll",
-    "cudnn_graph64_9.dll",
-    "cudnn_heuristic64_9.dll",
-]
+GPU_REQUIRED_DLLS = hardware_caps.GPU_REQUIRED_DLLS
 
 
 def get_app_install_dir():
@@ -66,14 +55,7 @@ def check_gpu_dlls():
     Returns:
         tuple: (all_present: bool, missing: list[str])
     """
-    install_dir = get_app_install_dir()
-    missing = []
-
-    for dll in GPU_REQUIRED_DLLS:
-        dll_path = os.path.join(install_dir, dll)
-        if not os.path.exists(dll_path):
-            missing.append(dll)
-
+    missing = list(hardware_caps.get_capabilities(install_dir=get_app_install_dir())["gpu_dlls_missing"])
     return len(missing) == 0, missing
 
 
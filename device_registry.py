@@ -0,0 +1,99 @@
+"""
+Cached audio input device resolution for MurmurTone.
+
+PortAudio enumeration (sd.query_devices / query_hostapis) walks every
+host API and device, so doing it on every dictation adds latency before
+the stream opens. DeviceRegistry resolves the saved input device once
+and keeps the result until something signals that the device set may
+have changed: the user refreshing the list, a different device being
+saved, or a stream failing to open.
+"""
+import logging
+import threading
+from collections import namedtuple
+
+import sounddevice as sd
+
+import config
+
+log = logging.getLogger("murmurtone")
+
+
+# index is None for the system default device; native_rate (Hz) and
+# channels are the device's defaults, or None if they couldn't be queried
+ResolvedDevice = namedtuple("ResolvedDevice", ["index", "name", "native_rate", "channels"])
+
+
+def device_key(saved_device):
+    """Cache key for a saved input_device value (None, name str or dict)."""
+    if isinstance(saved_device, dict):
+        return saved_device.get("name") or None
+    if isinstance(saved_device, str):
+        return saved_device or None
+    return None
+
+
+class DeviceRegistry:
+    """
+    Caches the input device list and saved-device resolutions.
+
+    Both are filled lazily from config.get_input_devices() and
+    config.get_device_index(), and dropped together by invalidate().
+    Thread-safe: the settings UI and the recording path may share one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._devices = None
+        self._resolved = {}
+        self.generation = 0  # Bumped on every invalidate()
+
+    def get_input_devices(self):
+        """Cached equivalent of config.get_input_devices()."""
+        with self._lock:
+            if self._devices is None:
+                self._devices = config.get_input_devices()
+            return list(self._devices)
+
+    def resolve(self, saved_device):
+        """
+        Resolve a saved input_device to a device index and native format.
+
+        A named device that isn't connected resolves to the system default
+        and is not cached, so it's picked up again once it's plugged back in.
+
+        Returns:
+            ResolvedDevice; index is None for the system default
+        """
+        key = device_key(saved_device)
+        with self._lock:
+            resolved = self._resolved.get(key)
+            if resolved is None:
+                resolved = self._resolve_uncached(saved_device, key)
+                if key is None or resolved.index is not None:
+                    self._resolved[key] = resolved
+            return resolved
+
+    @staticmethod
+    def _resolve_uncached(saved_device, key):
+        index = config.get_device_index(saved_device)
+        if key is not None and index is None:
+            log.warning(f"Input device '{key}' not found, using system default")
+        native_rate = channels = None
+        try:
+            info = sd.query_devices(index, kind="input") if index is None else sd.query_devices(index)
+            native_rate = int(info["default_samplerate"])
+            channels = int(info["max_input_channels"]) or None
+        except Exception:
+            pass  # Unknown format - callers fall back to the configured rate, mono
+        return ResolvedDevice(index, key, native_rate, channels)
+
+    def invalidate(self, reason=""):
+        """Forget all cached devices; the next lookup re-enumerates."""
+        with self._lock:
+            had_cache = self._devices is not None or bool(self._resolved)
+            self._devices = None
+            self._resolved = {}
+            self.generation += 1
+        if had_cache and reason:
+            log.info(f"Audio device cache invalidated ({reason})")
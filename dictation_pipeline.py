@@ -0,0 +1,120 @@
+"""
+Staged dictation pipeline for MurmurTone.
+
+Each finished recording flows through a fixed sequence of stages
+(transcribe, post-process, output). Every stage has one worker thread
+and a bounded input queue, so:
+
+- a new recording can start while earlier ones are still decoding,
+- results come out in the order the recordings were made (single FIFO
+  worker per stage), and
+- a slow stage pushes back: when its queue is full, the stage before it
+  blocks, and ultimately submit() blocks.
+
+A stage returns the item for the next stage, or None to drop it (e.g. no
+speech). Exceptions are logged and drop the item; later items continue.
+"""
+import logging
+import queue
+import threading
+
+log = logging.getLogger("murmurtone")
+
+
+# Items allowed to wait in front of each stage
+DEFAULT_QUEUE_SIZE = 2
+
+_STOP = object()
+
+
+class StagedPipeline:
+    """Ordered multi-stage worker pipeline with bounded queues."""
+
+    def __init__(self, stages, queue_size=DEFAULT_QUEUE_SIZE):
+        """
+        Args:
+            stages: List of (name, callable(item) -> item or None)
+            queue_size: Capacity of each stage's input queue
+        """
+        self._stages = list(stages)
+        self._queues = [queue.Queue(maxsize=queue_size) for _ in self._stages]
+        self._threads = []
+        self._pending = 0
+        self._cond = threading.Condition()
+
+    @property
+    def pending(self):
+        """Items submitted but not yet finished or dropped."""
+        with self._cond:
+            return self._pending
+
+    def start(self):
+        """Start one worker thread per stage."""
+        if self._threads:
+            return
+        for index, (name, _) in enumerate(self._stages):
+            thread = threading.Thread(target=self._run, args=(index,), daemon=True,
+                                      name=f"pipeline-{name}")
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, item, timeout=None):
+        """
+        Queue an item for the first stage.
+
+        Blocks while the first stage's queue is full.
+
+        Returns:
+            True if queued, False if timeout expired first
+        """
+        with self._cond:
+            self._pending += 1
+        try:
+            self._queues[0].put(item, timeout=timeout)
+        except queue.Full:
+            self._finish_item()
+            return False
+        return True
+
+    def wait_idle(self, timeout=None):
+        """Wait until every submitted item has left the pipeline."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0, timeout)
+
+    def stop(self, timeout=None):
+        """Finish queued items, then stop the workers."""
+        if not self._threads:
+            return
+        self._queues[0].put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _finish_item(self):
+        with self._cond:
+            self._pending -= 1
+            self._cond.notify_all()
+
+    def _run(self, index):
+        name, process = self._stages[index]
+        inbox = self._queues[index]
+        outbox = self._queues[index + 1] if index + 1 < len(self._queues) else None
+
+        while True:
+            item = inbox.get()
+            if item is _STOP:
+                if outbox is not None:
+                    outbox.put(_STOP)
+                return
+
+            try:
+                result = process(item)
+            except Exception:
+                log.exception(f"Dictation pipeline stage '{name}' failed")
+                result = None
+
+            if result is None or outbox is None:
+                self._finish_item()
+            else:
+                # Blocks while the next stage is backed up
+                outbox.put(result)
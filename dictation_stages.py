@@ -0,0 +1,424 @@
+"""
+Dictation pipeline stages for MurmurTone.
+
+The transcribe -> process -> output stages that a
+dictation_pipeline.StagedPipeline runs for every finished recording:
+VAD and decoding, hallucination filter and text processing, then
+actions, "scratch that" and typing or pasting.
+
+The model, keyboard, clipboard and preview window are injected, so the
+same stages run headlessly (benchmarks, tests) with
+inference_backend.FakeBackend and a recording keyboard.
+"""
+import logging
+import time
+
+import clipboard_utils
+import parallel_decode
+import two_pass
+import vad
+
+log = logging.getLogger("murmurtone")
+
+
+class Dictation:
+    """A finished recording on its way through the dictation pipeline."""
+
+    def __init__(self, capture, streamer, transcribe_params, initial_prompt, draft):
+        self.capture = capture
+        self.streamer = streamer
+        self.transcribe_params = transcribe_params
+        self.initial_prompt = initial_prompt
+        self.draft = draft
+        self.raw_text = None
+        self.refine_job = None
+        self.text = None
+        self.should_scratch = False
+        self.actions = []
+
+
+class KeyNames:
+    """Special keys by name, for keyboards other than pynput's Controller."""
+
+    ctrl = "ctrl"
+    ctrl_l = "ctrl_l"
+    backspace = "backspace"
+
+
+def decode_audio(model, audio, transcribe_params, workers=1, sample_rate=16000):
+    """Decode audio with a backend model, splitting long recordings into parallel chunks."""
+    def decode(chunk):
+        segments, _ = model.transcribe(chunk, **transcribe_params)
+        return "".join(segment.text for segment in segments).strip()
+
+    return parallel_decode.transcribe_long(audio, sample_rate, decode, workers)
+
+
+def filter_prompt_hallucination(raw_text, initial_prompt):
+    """Return "" if raw_text looks like Whisper echoing the prompt, else raw_text."""
+    if initial_prompt and raw_text:
+        text_lower = raw_text.lower()
+        prompt_lower = initial_prompt.lower()
+        is_hallucination = False
+
+        # Check 1: Distinctive words from prompt appear in output
+        # Words like "punctuation" are unlikely in normal speech
+        distinctive_words = ['punctuation', 'grammar', 'capitalize', 'spelling']
+        for word in distinctive_words:
+            if word in prompt_lower and word in text_lower:
+                is_hallucination = True
+                break
+
+        # Check 2: Repetitive output (same phrase appears twice) - classic hallucination
+        if not is_hallucination and len(raw_text) > 20:
+            # Split into rough halves and check similarity
+            mid = len(text_lower) // 2
+            first_half = text_lower[:mid]
+            second_half = text_lower[mid:]
+            # Check for repeated phrases
+            words = text_lower.split()
+            if len(words) >= 6:
+                first_part = ' '.join(words[:len(words)//2])
+                second_part = ' '.join(words[len(words)//2:])
+                # If halves are very similar, it's repetitive hallucination
+                common = set(first_part.split()) & set(second_part.split())
+                if len(common) >= 3:
+                    is_hallucination = True
+
+        if is_hallucination:
+            log.info(f"Filtered prompt hallucination: {raw_text}")
+            raw_text = ""
+
+    return raw_text
+
+
+class DictationStages:
+    """
+    The three pipeline stages plus two-pass draft correction.
+
+    stages() returns the (name, callable) list for StagedPipeline.
+    """
+
+    def __init__(self, get_config, get_text_pipeline, transcribe, keyboard, history,
+                 transcribe_draft=None, keys=KeyNames, clipboard=clipboard_utils, preview=None,
+                 record_stats=None, on_ready=None):
+        """
+        Args:
+            get_config: callable() -> current app config dict
+            get_text_pipeline: callable() -> current text_processor.TextPipeline
+            transcribe: callable(audio, transcribe_params) -> text, using the
+                        active model (with any GPU fallback)
+            keyboard: Object with press(key), release(key) and type(text),
+                      e.g. pynput.keyboard.Controller
+            history: text_processor.TranscriptionHistory for "scratch that"
+            transcribe_draft: callable(audio, transcribe_params, draft) -> text
+                              for two-pass drafts
+            keys: Key constants passed to keyboard (pynput.keyboard.Key in the app)
+            clipboard: Object with save_clipboard(), set_text(text) and
+                       restore_clipboard(saved), like clipboard_utils
+            preview: preview_window-like module, or None for no preview
+            record_stats: Optional callable(text) for usage statistics
+            on_ready: Optional callable() run when a dictation is fully output
+        """
+        self._get_config = get_config
+        self._get_text_pipeline = get_text_pipeline
+        self._transcribe = transcribe
+        self._transcribe_draft = transcribe_draft
+        self._keyboard = keyboard
+        self._keys = keys
+        self._clipboard = clipboard
+        self._preview = preview
+        self._record_stats = record_stats
+        self._on_ready = on_ready
+        self.history = history
+        # Corrects two-pass drafts once the selected model has re-decoded them
+        self.refiner = two_pass.Refiner(self.replace_draft)
+
+    def stages(self):
+        """(name, callable) pairs for dictation_pipeline.StagedPipeline."""
+        return [
+            ("transcribe", self.transcribe_stage),
+            ("process", self.process_stage),
+            ("output", self.output_stage),
+        ]
+
+    def preview(self):
+        """The preview window if enabled, else None."""
+        if self._preview is not None and self._get_config().get("preview_enabled", True):
+            return self._preview
+        return None
+
+    def transcribe_capture(self, capture, transcribe_params, streamer=None, draft=None):
+        """Run VAD and transcription on a finished recording.
+
+        With a StreamingTranscriber, everything up to its last committed
+        pause is already transcribed and only the tail is decoded here.
+
+        With a draft model, the draft text is returned right away and a
+        two_pass.RefineJob re-decodes the same audio with the active model.
+
+        The capture (including any spill file) is released once the model is
+        done with it. If transcription raises, a spill file is left on disk so
+        the audio can be recovered.
+
+        Returns:
+            (text, refine_job) - text is None if VAD found no speech;
+            refine_job is None unless a draft was typed from the draft model
+        """
+        app_config = self._get_config()
+
+        # Zero-copy view (memory-mapped for spilled recordings)
+        capture.finish()
+
+        if streamer is not None:
+            log.info(f"Transcribing remaining audio ({len(capture) - streamer.committed_samples} samples)...")
+            raw_text = streamer.finish()
+            capture.discard()
+            return raw_text, None
+
+        audio = capture.view()
+
+        # Trim silent edges and skip the model entirely when there's no speech
+        if app_config.get("vad_enabled", True):
+            speech = vad.trim_silence(
+                audio, capture.sample_rate,
+                padding_ms=app_config.get("vad_padding_ms", vad.DEFAULT_PADDING_MS)
+            )
+            if speech is None:
+                audio = None
+                capture.discard()
+                return None, None
+            log.debug(f"VAD trimmed {len(audio) - len(speech)} of {len(audio)} samples")
+            audio = speech
+            speech = None
+
+        log.info("Transcribing...")
+        preview = self.preview()
+        if preview is not None:
+            preview.show_transcribing()
+
+        if draft is not None and self._transcribe_draft is not None:
+            try:
+                raw_text = self._transcribe_draft(audio, transcribe_params, draft)
+            except Exception as e:
+                log.warning(f"Draft decode failed, using the selected model only: {e}")
+            else:
+                # The refinement owns the audio now and releases the capture
+                pending = [audio]
+                audio = None
+
+                def release():
+                    pending.clear()
+                    capture.discard()
+
+                job = self.refiner.start(
+                    lambda: self._transcribe(pending[0], transcribe_params),
+                    finish=lambda raw: self.finish_refinement(raw, transcribe_params.get("initial_prompt", "")),
+                    on_done=release,
+                )
+                return raw_text, job
+
+        raw_text = self._transcribe(audio, transcribe_params)
+
+        # Drop our view before unmapping/deleting the spill file
+        audio = None
+        capture.discard()
+        return raw_text, None
+
+    def apply_ai_cleanup(self, text):
+        """Run the optional Ollama cleanup; returns text unchanged if off or failing."""
+        app_config = self._get_config()
+        if app_config.get("ai_cleanup_enabled") and text:
+            import ai_cleanup
+            ollama_url = app_config.get("ollama_url", "http://localhost:11434")
+            if ai_cleanup.check_ollama_available(ollama_url):
+                try:
+                    cleaned = ai_cleanup.cleanup_text(
+                        text,
+                        mode=app_config.get("ai_cleanup_mode", "grammar"),
+                        formality_level=app_config.get("ai_formality_level", "professional"),
+                        model=app_config.get("ollama_model", "llama3.2:3b"),
+                        url=ollama_url,
+                        timeout=30
+                    )
+                    if cleaned:
+                        text = cleaned
+                        log.info("AI cleanup applied")
+                except Exception as e:
+                    log.warning(f"AI cleanup failed: {e}")
+                    # Continue with original text
+        return text
+
+    def finish_refinement(self, raw_text, initial_prompt):
+        """
+        Post-process a refined transcription like the draft.
+
+        Returns:
+            Text as it would have been typed, or None to keep the draft
+            (commands like "scratch that" are never replayed)
+        """
+        raw_text = filter_prompt_hallucination(raw_text, initial_prompt)
+        text, should_scratch, _, actions = self._get_text_pipeline().process(raw_text)
+        if should_scratch or actions or not text:
+            return None
+        return self.apply_ai_cleanup(text) + " "
+
+    def replace_draft(self, draft, refined, backspaces, text):
+        """Correct a typed draft in place (backspace the tail, type the rest)."""
+        log.info(f"Refined: {refined.strip()}")
+        for _ in range(backspaces):
+            self._keyboard.press(self._keys.backspace)
+            self._keyboard.release(self._keys.backspace)
+        self._keyboard.type(text)
+
+        # "scratch that" should erase what is on screen now
+        entries = self.history.entries
+        if entries and entries[-1]["text"] == draft:
+            self.history.pop_last()
+            self.history.add(refined)
+
+        preview = self.preview()
+        if preview is not None:
+            preview.show_text(refined.strip(), auto_hide=True)
+
+    def transcribe_stage(self, dictation):
+        """Pipeline stage 1: decode the recording."""
+        raw_text, dictation.refine_job = self.transcribe_capture(
+            dictation.capture, dictation.transcribe_params, dictation.streamer, dictation.draft
+        )
+        dictation.capture = dictation.streamer = None
+        if raw_text is None:
+            log.info("No speech detected - skipping transcription")
+            preview = self.preview()
+            if preview is not None:
+                preview.hide()
+            return None
+        dictation.raw_text = raw_text
+        return dictation
+
+    def process_stage(self, dictation):
+        """Pipeline stage 2: hallucination filter, text processing and AI cleanup."""
+        raw_text = filter_prompt_hallucination(dictation.raw_text, dictation.initial_prompt)
+
+        # Process text through the pipeline (dictionary, fillers, commands).
+        # "scratch that" is resolved at output time, once earlier dictations are typed.
+        text, dictation.should_scratch, _, dictation.actions = self._get_text_pipeline().process(raw_text)
+
+        # Optional AI cleanup (Ollama integration)
+        dictation.text = self.apply_ai_cleanup(text)
+        return dictation
+
+    def output_stage(self, dictation):
+        """Pipeline stage 3: run actions, scratch or type the text, in dictation order."""
+        app_config = self._get_config()
+        keyboard = self._keyboard
+        keys = self._keys
+        text = dictation.text
+        actions = dictation.actions
+        refine_job = dictation.refine_job
+
+        # Earlier drafts can't be corrected once the cursor moves past them
+        self.refiner.invalidate()
+
+        # Execute any action commands (select all, undo, redo)
+        actions_executed = False
+        for action in actions:
+            if action.startswith("ctrl+"):
+                key = action.split("+")[1]
+                keyboard.press(keys.ctrl)
+                keyboard.press(key)
+                keyboard.release(key)
+                keyboard.release(keys.ctrl)
+                time.sleep(0.05)
+                actions_executed = True
+
+        # Only plain dictated text is corrected after the refinement pass
+        if refine_job is not None and (dictation.should_scratch or actions or not text):
+            refine_job.cancel()
+            refine_job = None
+
+        preview = self.preview()
+
+        # Handle "scratch that" - delete previous transcription
+        scratch_length = 0
+        if dictation.should_scratch and app_config.get("scratch_that_enabled", True):
+            scratch_length = self.history.get_last_length()
+            self.history.pop_last()
+        if dictation.should_scratch and scratch_length > 0:
+            log.info(f"Scratching last {scratch_length} characters")
+            if preview is not None:
+                preview.hide()
+            time.sleep(0.1)
+            for _ in range(scratch_length):
+                keyboard.press(keys.backspace)
+                keyboard.release(keys.backspace)
+            # Don't output anything else for this transcription
+            self._ready()
+            return
+
+        if text:
+            # Track this transcription for potential "scratch that"
+            text_with_space = text + " "
+            self.history.add(text_with_space)
+
+            # Record usage statistics
+            if self._record_stats is not None:
+                self._record_stats(text)
+
+            # Show transcribed text in preview (will auto-hide)
+            if preview is not None:
+                preview.show_text(text, auto_hide=True)
+
+            # Output text using configured paste mode
+            paste_mode = app_config.get("paste_mode", "clipboard")
+
+            if paste_mode == "direct":
+                # Direct typing mode - never touches clipboard
+                # Types character-by-character with delay for visual typewriter effect
+                log.info(f"Typing directly: {text}")
+                time.sleep(0.2)  # Brief pause before typing
+                typing_delay = app_config.get("direct_typing_delay_ms", 5) / 1000.0
+                for char in text_with_space:
+                    keyboard.type(char)
+                    if typing_delay > 0:
+                        time.sleep(typing_delay)
+            else:
+                # Clipboard mode - copy, paste, then restore original clipboard
+                saved_clipboard = self._clipboard.save_clipboard()
+
+                # Copy to clipboard using Windows API (tkinter conflicts with PyWebView)
+                if not self._clipboard.set_text(text_with_space):
+                    log.error("Failed to copy text to clipboard")
+
+                # Paste
+                log.info(f"Pasting: {text}")
+                time.sleep(0.3)  # Wait for focus to return after clipboard
+                keyboard.press(keys.ctrl_l)
+                time.sleep(0.05)
+                keyboard.press('v')
+                keyboard.release('v')
+                time.sleep(0.05)
+                keyboard.release(keys.ctrl_l)
+
+                # Restore clipboard contents once the paste has landed. Done inline
+                # so the next dictation's paste can't race the restore.
+                if saved_clipboard:
+                    time.sleep(0.4)
+                    self._clipboard.restore_clipboard(saved_clipboard)
+
+            if refine_job is not None:
+                refine_job.set_draft(text_with_space)
+        elif actions_executed:
+            log.info(f"Action executed: {', '.join(actions)}")
+            if preview is not None:
+                preview.hide()
+        else:
+            log.info("No speech detected")
+            if preview is not None:
+                preview.hide()
+
+        self._ready()
+
+    def _ready(self):
+        if self._on_ready is not None:
+            self._on_ready()
@@ -42,7 +42,7 @@ def transcribe_file(
 
     Args:
         file_path: Path to audio/video file
-        model: faster-whisper model instance
+        model: Inference backend (see inference_backend) or faster-whisper model
         app_config: Application configuration dict
         progress_callback: Optional callback(progress: float, status: str)
                           progress is 0.0-1.0, status is human-readable text
@@ -97,49 +97,21 @@ def transcribe_file(
         # Transcribe file (faster-whisper accepts file path directly)
         segments, info = model.transcribe(file_path, **transcribe_params)
 
-        # Collect segments into text
-        text_parts = []
+        # Process segments as they are decoded (same pipeline as live
+        # dictation; scratch and key actions have no meaning for a file)
+        from text_processor import TextPipeline
+        processor = TextPipeline(app_config).incremental()
         for segment in segments:
-            text_parts.append(segment.text)
+            processor.feed(segment.text)
             if progress_callback:
                 # Approximate progress (we don't have duration, so this is a guess)
                 # Progress 0.1-0.9 during transcription
                 progress_callback(0.5, "Transcribing...")
 
-        transcription = " ".join(text_parts).strip()
-
         if progress_callback:
             progress_callback(0.9, "Processing...")
 
-        # Apply text processing (same as live dictation)
-        from text_processor import process_text
-
-        # Voice commands
-        if app_config.get("voice_commands_enabled", True):
-            transcription = process_text(transcription)
-
-        # Filler removal
-        if app_config.get("filler_removal_enabled", True):
-            from text_processor import remove_filler_words
-            aggressive = app_config.get("filler_removal_aggressive", False)
-            custom_fillers = app_config.get("custom_fillers", [])
-            transcription = remove_filler_words(transcription, aggressive, custom_fillers)
-
-        # Custom dictionary (text replacement)
-        custom_dict = app_config.get("custom_dictionary", [])
-        if custom_dict:
-            for entry in custom_dict:
-                from_text = entry.get("from", "")
-                to_text = entry.get("to", "")
-                case_sensitive = entry.get("case_sensitive", False)
-                if from_text and to_text:
-                    if case_sensitive:
-                        transcription = transcription.replace(from_text, to_text)
-                    else:
-                        # Case-insensitive replacement
-                        import re
-                        pattern = re.compile(re.escape(from_text), re.IGNORECASE)
-                        transcription = pattern.sub(to_text, transcription)
+        transcription = processor.finish()[0].strip()
 
         if progress_callback:
             progress_callback(1.0, "Complete!")
@@ -0,0 +1,284 @@
+"""
+Shared hardware capability cache for MurmurTone.
+
+Probing CUDA support means importing ctranslate2, querying its compute
+types and, on Windows, finding and loading the CUDA DLLs. The app, the
+settings window and the startup dependency check all need the answer,
+and it only changes when the install or the GPU driver changes.
+
+get_capabilities() probes once and persists the result in
+hardware_caps.json next to settings.json, keyed by a fingerprint of
+everything the answer depends on: interpreter, package versions, GPU
+DLL files and the driver library. All of these are cheap to stat. When
+the fingerprint changes (driver update, GPU libraries installed), the
+next call probes again.
+"""
+import hashlib
+import json
+import logging
+import os
+import platform
+import sys
+import threading
+
+log = logging.getLogger("murmurtone")
+
+
+# Bump when the probe gains or changes fields
+CACHE_VERSION = 1
+
+# Required CUDA DLL files in the install directory (bundled GPU support)
+GPU_REQUIRED_DLLS = [
+    # cuBLAS
+    "cublas64_12.dll",
+    "cublasLt64_12.dll",
+    # cuDNN
+    "cudnn64_9.dll",
+    "cudnn_ops64_9.dll",
+    "cudnn_cnn64_9.dll",
+    "cudnn_adv64_9.dll",
+    "cudnn_engines_precompiled64_9.dll",
+    "cudnn_engines_runtime_compiled64_9.dll",
+    "cudnn_graph64_9.dll",
+    "cudnn_heuristic64_9.dll",
+]
+
+# CUDA DLLs from pip's nvidia-cublas-cu12 / nvidia-cudnn-cu12, relative to site-packages
+SITE_PACKAGES_CUDA_DLLS = [
+    ("nvidia", "cublas", "bin", "cublas64_12.dll"),
+    ("nvidia", "cudnn", "bin", "cudnn64_9.dll"),
+]
+
+# GPU driver libraries; their size/mtime change with driver updates
+DRIVER_LIBRARIES = [
+    os.path.join(os.environ.get("SystemRoot", r"C:\Windows"), "System32", "nvcuda.dll"),
+    "/usr/lib/x86_64-linux-gnu/libcuda.so.1",
+    "/usr/lib64/libcuda.so.1",
+]
+
+# Windows IsProcessorFeaturePresent() feature IDs
+_WINDOWS_CPU_FEATURES = {
+    "sse3": 13,
+    "sse4_1": 37,
+    "sse4_2": 38,
+    "avx": 39,
+    "avx2": 40,
+    "avx512f": 41,
+}
+
+# Flags worth reporting from /proc/cpuinfo
+_LINUX_CPU_FLAGS = {"sse3", "sse4_1", "sse4_2", "avx", "avx2", "fma", "f16c", "avx512f", "avx512_vnni"}
+
+_memory_cache = {}  # fingerprint -> capabilities
+_lock = threading.Lock()
+
+
+def get_cache_path():
+    """Get path to hardware_caps.json in user's AppData directory."""
+    app_data = os.environ.get("APPDATA", os.path.expanduser("~"))
+    config_dir = os.path.join(app_data, "MurmurTone")
+    os.makedirs(config_dir, exist_ok=True)
+    return os.path.join(config_dir, "hardware_caps.json")
+
+
+def get_install_dir():
+    """The application directory (exe directory when bundled)."""
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def find_site_packages():
+    """First existing site-packages directory on sys.path, or None."""
+    for path in sys.path:
+        if "site-packages" in path and os.path.exists(path):
+            return path
+    return None
+
+
+def _stat_signature(path):
+    try:
+        st = os.stat(path)
+        return [st.st_size, int(st.st_mtime)]
+    except OSError:
+        return None
+
+
+def _package_version(name):
+    try:
+        from importlib import metadata
+        return metadata.version(name)
+    except Exception:
+        return None
+
+
+def fingerprint(install_dir=None):
+    """Hash of everything the capabilities depend on (cheap: stats only)."""
+    install_dir = install_dir or get_install_dir()
+    site_packages = find_site_packages()
+    files = [os.path.join(install_dir, dll) for dll in GPU_REQUIRED_DLLS]
+    if site_packages:
+        files += [os.path.join(site_packages, *parts) for parts in SITE_PACKAGES_CUDA_DLLS]
+    files += DRIVER_LIBRARIES
+
+    parts = {
+        "version": CACHE_VERSION,
+        "python": sys.version,
+        "executable": sys.executable,
+        "machine": platform.machine(),
+        "ctranslate2": _package_version("ctranslate2"),
+        "faster_whisper": _package_version("faster-whisper"),
+        "files": {path: _stat_signature(path) for path in files},
+    }
+    return hashlib.sha1(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+def detect_cpu_flags():
+    """SIMD instruction sets supported by the CPU (best effort)."""
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            present = ctypes.windll.kernel32.IsProcessorFeaturePresent
+            return sorted(name for name, feature in _WINDOWS_CPU_FEATURES.items() if present(feature))
+        except Exception:
+            return []
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    flags = set(line.split(":", 1)[1].split())
+                    # /proc/cpuinfo spells SSE3 as "pni"
+                    if "pni" in flags:
+                        flags.add("sse3")
+                    return sorted(flags & _LINUX_CPU_FLAGS)
+    except OSError:
+        pass
+    return []
+
+
+def _cuda_runtime_loads():
+    """On Windows, check the pip-installed CUDA DLLs exist and load."""
+    if sys.platform != "win32":
+        return True
+    import ctypes
+
+    site_packages = find_site_packages()
+    if not site_packages:
+        return False
+    for parts in SITE_PACKAGES_CUDA_DLLS:
+        dll_path = os.path.join(site_packages, *parts)
+        if not os.path.exists(dll_path):
+            log.debug(f"CUDA DLL not found: {dll_path}")
+            return False
+        try:
+            ctypes.WinDLL(dll_path)
+        except OSError as e:
+            log.debug(f"Failed to load CUDA DLL {dll_path}: {e}")
+            return False
+    return True
+
+
+def _gpu_name():
+    try:
+        import subprocess
+        result = subprocess.run(
+            ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader,nounits"],
+            capture_output=True, text=True, timeout=5
+        )
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.strip().split('\n')[0]  # First GPU
+    except Exception:
+        pass
+    return None
+
+
+def probe(install_dir=None):
+    """Run the (slow) capability probes."""
+    install_dir = install_dir or get_install_dir()
+    caps = {
+        "cpu_flags": detect_cpu_flags(),
+        "cpu_compute_types": [],
+        "cuda_compute_types": [],
+        "cuda_device_count": 0,
+        "cuda_runtime_ok": False,
+        "cuda_available": False,
+        "gpu_name": None,
+        "gpu_dlls_missing": [dll for dll in GPU_REQUIRED_DLLS
+                             if not os.path.exists(os.path.join(install_dir, dll))],
+    }
+    try:
+        import ctranslate2
+        caps["cpu_compute_types"] = sorted(ctranslate2.get_supported_compute_types("cpu"))
+        caps["cuda_compute_types"] = sorted(ctranslate2.get_supported_compute_types("cuda"))
+        caps["cuda_device_count"] = ctranslate2.get_cuda_device_count()
+    except Exception as e:
+        log.debug(f"ctranslate2 capability query failed: {e}")
+
+    if caps["cuda_compute_types"]:
+        caps["cuda_runtime_ok"] = _cuda_runtime_loads()
+        caps["cuda_available"] = caps["cuda_runtime_ok"]
+        caps["gpu_name"] = _gpu_name()
+    return caps
+
+
+def _load_cached(key):
+    try:
+        with open(get_cache_path(), "r") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if data.get("fingerprint") != key:
+        return None
+    return data.get("capabilities")
+
+
+def _save_cached(key, caps):
+    path = get_cache_path()
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "w") as f:
+            json.dump({"fingerprint": key, "capabilities": caps}, f, indent=2)
+        os.replace(temp_path, path)
+    except OSError as e:
+        log.warning(f"Could not save hardware capabilities: {e}")
+
+
+def get_capabilities(refresh=False, install_dir=None):
+    """
+    Hardware capabilities, probed at most once per install/driver fingerprint.
+
+    Args:
+        refresh: Probe again even if a cached result matches
+
+    Returns:
+        Dict with cpu_flags, cpu_compute_types, cuda_compute_types,
+        cuda_device_count, cuda_runtime_ok, cuda_available, gpu_name and
+        gpu_dlls_missing
+    """
+    key = fingerprint(install_dir)
+    with _lock:
+        if not refresh:
+            caps = _memory_cache.get(key) or _load_cached(key)
+            if caps is not None:
+                _memory_cache[key] = caps
+                return caps
+
+        caps = probe(install_dir)
+        log.info(f"Hardware capabilities: CUDA {'available' if caps['cuda_available'] else 'unavailable'}, "
+                 f"CPU {', '.join(caps['cpu_flags']) or 'baseline'}")
+        _memory_cache.clear()
+        _memory_cache[key] = caps
+        _save_cached(key, caps)
+        return caps
+
+
+def cpu_compute_type(caps=None):
+    """
+    CTranslate2 compute type for CPU models: int8 where the CPU supports it
+    (or support is unknown), else float32.
+
+    Args:
+        caps: get_capabilities() result (probed/cached if omitted)
+    """
+    cpu_types = (caps or get_capabilities())["cpu_compute_types"]
+    return "int8" if not cpu_types or "int8" in cpu_types else "float32"
@@ -0,0 +1,215 @@
+"""
+Inference backends for MurmurTone.
+
+The rest of the app only needs a small surface from a speech model:
+load it, transcribe audio (returning lazily decoded segments plus info,
+the faster-whisper shape), warm it up and unload it. InferenceBackend
+defines that surface. FasterWhisperBackend wraps a WhisperModel and
+FakeBackend produces deterministic text with configurable latency, so
+the dictation and file pipelines can be exercised and timed on machines
+without model weights.
+
+Backends are picked by name through create_backend() ("faster-whisper"
+or "fake").
+"""
+import logging
+import time
+import wave
+from collections import namedtuple
+
+import numpy as np
+
+import warmup
+
+log = logging.getLogger("murmurtone")
+
+
+SAMPLE_RATE = 16000
+
+# Mirrors the faster-whisper fields the app reads
+Segment = namedtuple("Segment", ["start", "end", "text"])
+TranscriptionInfo = namedtuple("TranscriptionInfo", ["language", "language_probability", "duration"])
+
+
+class InferenceBackend:
+    """
+    Interface shared by all inference backends.
+
+    transcribe() follows faster-whisper: it returns (segments, info),
+    where segments is a lazy iterator (decoding happens while it is
+    consumed) and info is available immediately.
+    """
+
+    name = "base"
+
+    def load(self):
+        """Load the model; called once before the first transcribe()."""
+        raise NotImplementedError
+
+    def transcribe(self, audio, **params):
+        """
+        Args:
+            audio: 1-D float32 array at 16 kHz, or a file path
+            **params: faster-whisper transcribe() keyword arguments
+
+        Returns:
+            (iterator of Segment, TranscriptionInfo)
+        """
+        raise NotImplementedError
+
+    def stream_segments(self, audio, **params):
+        """Yield segments as they are decoded."""
+        segments, _ = self.transcribe(audio, **params)
+        yield from segments
+
+    def warm_up(self, workers=1, **params):
+        """
+        Run warm-up decodes (see warmup.run_warmup).
+
+        Returns:
+            (cold_seconds, warm_seconds)
+        """
+        def decode(audio):
+            return "".join(segment.text for segment in self.stream_segments(audio, **params))
+
+        return warmup.run_warmup(decode, workers)
+
+    def unload(self):
+        """Release the model's memory."""
+
+
+class FasterWhisperBackend(InferenceBackend):
+    """faster-whisper WhisperModel backend."""
+
+    name = "faster-whisper"
+
+    def __init__(self, model_path, device="cpu", compute_type="int8", num_workers=1, cpu_threads=0):
+        self.model_path = model_path
+        self.device = device
+        self.compute_type = compute_type
+        self.num_workers = num_workers
+        self.cpu_threads = cpu_threads
+        self.model = None
+
+    def load(self):
+        from faster_whisper import WhisperModel
+
+        kwargs = {"device": self.device, "compute_type": self.compute_type, "num_workers": self.num_workers}
+        if self.cpu_threads:
+            kwargs["cpu_threads"] = self.cpu_threads
+        self.model = WhisperModel(self.model_path, **kwargs)
+        return self
+
+    def transcribe(self, audio, **params):
+        return self.model.transcribe(audio, **params)
+
+    def unload(self):
+        self.model = None
+
+
+class FakeBackend(InferenceBackend):
+    """
+    Deterministic stand-in for a real model.
+
+    Decoding sleeps for latency_s plus realtime_factor seconds per second
+    of audio (time.sleep releases the GIL, like CTranslate2), spread over
+    one segment per segment_seconds of audio.
+    """
+
+    name = "fake"
+
+    def __init__(self, model_path=None, text="This is a test.", latency_s=0.0, realtime_factor=0.0,
+                 load_s=0.0, segment_seconds=30.0, language="en", language_probability=1.0,
+                 file_seconds=10.0, **_ignored):
+        """
+        Args:
+            model_path: Ignored (accepted so it is a drop-in for real backends)
+            text: Text of each segment, or callable(audio, params) -> text
+            latency_s: Fixed cost per transcribe()
+            realtime_factor: Decode seconds per second of audio
+            load_s: Simulated load time
+            segment_seconds: Audio per emitted segment
+            file_seconds: Assumed length of non-WAV file inputs
+        """
+        self.model_path = model_path
+        self.text = text
+        self.latency_s = latency_s
+        self.realtime_factor = realtime_factor
+        self.load_s = load_s
+        self.segment_seconds = segment_seconds
+        self.language = language
+        self.language_probability = language_probability
+        self.file_seconds = file_seconds
+        self.calls = 0
+        self.loaded = False
+
+    def load(self):
+        if self.load_s:
+            time.sleep(self.load_s)
+        self.loaded = True
+        return self
+
+    def transcribe(self, audio, **params):
+        self.calls += 1
+        duration = self._duration(audio)
+        language = params.get("language") or self.language
+        info = TranscriptionInfo(language, self.language_probability, duration)
+        text = self.text(audio, params) if callable(self.text) else self.text
+        return self._segments(duration, text), info
+
+    def unload(self):
+        self.loaded = False
+
+    def _duration(self, audio):
+        if isinstance(audio, str):
+            try:
+                with wave.open(audio, "rb") as f:
+                    return f.getnframes() / f.getframerate()
+            except (OSError, wave.Error, EOFError):
+                return self.file_seconds
+        return len(np.asarray(audio)) / SAMPLE_RATE
+
+    def _segments(self, duration, text):
+        count = max(1, int(np.ceil(duration / self.segment_seconds))) if duration > 0 else 1
+        decode_s = self.latency_s + self.realtime_factor * duration
+        for index in range(count):
+            if decode_s:
+                time.sleep(decode_s / count)
+            start = index * self.segment_seconds
+            yield Segment(start, min(duration, start + self.segment_seconds), text)
+
+
+BACKENDS = {
+    FasterWhisperBackend.name: FasterWhisperBackend,
+    FakeBackend.name: FakeBackend,
+}
+
+
+def configured_backend(app_config):
+    """
+    Backend selected in the app config.
+
+    Returns:
+        (name, options): BACKENDS key and extra constructor arguments
+    """
+    name = app_config.get("inference_backend", FasterWhisperBackend.name)
+    options = dict(app_config.get("fake_backend_options", {})) if name == FakeBackend.name else {}
+    return name, options
+
+
+def create_backend(name, model_path, **options):
+    """
+    Create and load a backend by name.
+
+    Args:
+        name: Key in BACKENDS ("faster-whisper" if empty)
+        model_path: Model name or directory
+        **options: Backend constructor arguments
+
+    Raises:
+        ValueError: Unknown backend name
+    """
+    backend_class = BACKENDS.get(name or FasterWhisperBackend.name)
+    if backend_class is None:
+        raise ValueError(f"Unknown inference backend: {name}")
+    return backend_class(model_path, **options).load()
@@ -0,0 +1,122 @@
+"""
+Fast language identification for MurmurTone.
+
+With language "auto", faster-whisper runs language detection on every
+call, including every parallel chunk and every streaming segment.
+Here the language is detected once from the start of the recording,
+optionally with a small dedicated model, and cached for the session.
+Later dictations pass it explicitly as `language` and skip detection.
+
+The cached confidence decays with a half-life, so after a while (or if
+the first detection was marginal) the language is checked again.
+"""
+import logging
+import threading
+import time
+
+log = logging.getLogger("murmurtone")
+
+
+# Audio used for detection (Whisper detects from the first window anyway)
+DETECT_SECONDS = 4.0
+
+# Detections below this probability are not used or cached
+DEFAULT_THRESHOLD = 0.8
+
+# Cached confidence halves every this many seconds
+DEFAULT_HALF_LIFE = 30 * 60
+
+
+def detect(detect_clip, audio, sample_rate, seconds=DETECT_SECONDS):
+    """
+    Detect the language from the first seconds of audio.
+
+    Args:
+        detect_clip: callable(audio) -> (language, probability)
+        audio: 1-D float32 array
+
+    Returns:
+        (language, probability)
+    """
+    return detect_clip(audio[:int(seconds * sample_rate)])
+
+
+def whisper_detector(model):
+    """detect_clip() for a faster-whisper model.
+
+    transcribe() detects the language before returning; the segment
+    generator is never consumed, so nothing is decoded.
+    """
+    def detect_clip(clip):
+        _, info = model.transcribe(clip, language=None, vad_filter=False)
+        return info.language, info.language_probability
+
+    return detect_clip
+
+
+class LanguageCache:
+    """
+    Session cache of the detected language with decaying confidence.
+
+    Thread-safe: streaming segments and parallel chunks may ask at once.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, half_life=DEFAULT_HALF_LIFE, clock=time.monotonic):
+        """
+        Args:
+            threshold: Minimum (decayed) probability for the cache to be used
+            half_life: Seconds for the cached probability to halve (<= 0: no decay)
+            clock: Time source, for tests
+        """
+        self.threshold = threshold
+        self.half_life = half_life
+        self._clock = clock
+        self._language = None
+        self._probability = 0.0
+        self._detected_at = 0.0
+        self._lock = threading.Lock()
+
+    def confidence(self, now=None):
+        """Current decayed confidence in the cached language."""
+        with self._lock:
+            return self._confidence(self._clock() if now is None else now)
+
+    def get(self, now=None):
+        """The cached language while its confidence holds, else None."""
+        with self._lock:
+            if self._language is None:
+                return None
+            if self._confidence(self._clock() if now is None else now) < self.threshold:
+                return None
+            return self._language
+
+    def update(self, language, probability, now=None):
+        """
+        Record a detection.
+
+        Returns:
+            True if it was confident enough to use
+        """
+        if probability < self.threshold:
+            log.debug(f"Language detection not confident: {language} ({probability:.2f})")
+            return False
+        with self._lock:
+            if language != self._language:
+                log.info(f"Detected language: {language} ({probability:.2f})")
+            self._language = language
+            self._probability = probability
+            self._detected_at = self._clock() if now is None else now
+        return True
+
+    def clear(self):
+        """Forget the cached language (e.g. settings changed)."""
+        with self._lock:
+            self._language = None
+            self._probability = 0.0
+
+    def _confidence(self, now):
+        if self._language is None:
+            return 0.0
+        if self.half_life <= 0:
+            return self._probability
+        return self._probability * 0.5 ** ((now - self._detected_at) / self.half_life)
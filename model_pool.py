@@ -0,0 +1,243 @@
+"""
+Resident Whisper model pool for MurmurTone.
+
+Keeps recently used WhisperModel instances loaded, keyed by
+(size, device, compute_type), so switching back to a model that was used
+recently is instant instead of a multi-second reload. Memory use is
+bounded by an estimated budget; the least recently used models are
+evicted first, and the active model is never evicted.
+
+ModelSlot holds the model that serves dictations. A replacement is
+loaded on the side and swapped in atomically; callers lease the current
+model for the length of a transcription, and a replaced model is only
+released once its last lease ends.
+"""
+import logging
+import threading
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+
+import config
+
+log = logging.getLogger("murmurtone")
+
+
+ModelKey = namedtuple("ModelKey", ["size", "device", "compute_type"])
+
+# A model instance with what it was loaded as (workers = CTranslate2 num_workers)
+LoadedModel = namedtuple("LoadedModel", ["model", "workers", "key"])
+
+# Resident size relative to the float16 download size in MODEL_SIZES_MB
+_COMPUTE_TYPE_SCALE = {
+    "float32": 2.0,
+    "float16": 1.0,
+    "bfloat16": 1.0,
+    "int8_float16": 0.5,
+    "int8_float32": 0.5,
+    "int8": 0.5,
+}
+
+# Runtime buffers, tokenizer and allocator slack on top of the weights
+_OVERHEAD = 1.2
+
+# Estimate for model sizes missing from MODEL_SIZES_MB
+_UNKNOWN_MODEL_MB = 1500
+
+
+def estimate_model_mb(key):
+    """Approximate resident memory of a loaded model, in MB."""
+    download_mb = config.MODEL_SIZES_MB.get(key.size, _UNKNOWN_MODEL_MB)
+    return download_mb * _COMPUTE_TYPE_SCALE.get(key.compute_type, 1.0) * _OVERHEAD
+
+
+class ModelPool:
+    """
+    LRU cache of loaded models with a memory budget.
+
+    Thread-safe. Evicted models are handed to on_evict, which decides
+    whether they can be unloaded; anything still holding one (e.g. an
+    in-flight transcription) keeps it alive until done.
+    """
+
+    def __init__(self, budget_mb, estimate=estimate_model_mb, on_evict=None):
+        """
+        Args:
+            budget_mb: Total estimated MB to keep resident; the most
+                       recently used model is kept even if it alone exceeds it
+            estimate: callable(ModelKey) -> MB
+            on_evict: Optional callable(model) run for each evicted model,
+                      outside the pool's lock
+        """
+        self.budget_mb = budget_mb
+        self._estimate = estimate
+        self._on_evict = on_evict
+        self._models = OrderedDict()  # ModelKey -> (model, size_mb), LRU first
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._models)
+
+    def __contains__(self, key):
+        return key in self._models
+
+    @property
+    def total_mb(self):
+        """Estimated MB of all resident models."""
+        with self._lock:
+            return sum(size_mb for _, size_mb in self._models.values())
+
+    def keys(self):
+        """Resident model keys, least recently used first."""
+        with self._lock:
+            return list(self._models)
+
+    def get(self, key):
+        """Return the resident model for key (marking it most recent), or None."""
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is None:
+                return None
+            self._models.move_to_end(key)
+            return entry[0]
+
+    def peek(self, key):
+        """Return the resident model for key without marking it recent, or None."""
+        with self._lock:
+            entry = self._models.get(key)
+            return entry[0] if entry is not None else None
+
+    def put(self, key, model):
+        """
+        Add a model as most recently used, evicting older ones over budget.
+
+        Returns:
+            List of evicted keys
+        """
+        with self._lock:
+            self._models[key] = (model, self._estimate(key))
+            self._models.move_to_end(key)
+            evicted = self._trim_locked()
+        return self._evicted(evicted)
+
+    def remove(self, key):
+        """Drop a model from the pool (e.g. after it failed)."""
+        with self._lock:
+            self._models.pop(key, None)
+
+    def clear(self):
+        """Drop all models."""
+        with self._lock:
+            self._models.clear()
+
+    def trim(self):
+        """Evict least recently used models until within budget."""
+        with self._lock:
+            evicted = self._trim_locked()
+        return self._evicted(evicted)
+
+    def _trim_locked(self):
+        evicted = []
+        total = sum(size_mb for _, size_mb in self._models.values())
+        while len(self._models) > 1 and total > self.budget_mb:
+            key, (model, size_mb) = self._models.popitem(last=False)
+            total -= size_mb
+            evicted.append((key, model))
+            log.info(f"Evicted {key.size} ({key.device}, {key.compute_type}) from model pool, "
+                     f"~{size_mb:.0f} MB")
+        return evicted
+
+    def _evicted(self, evicted):
+        """Run on_evict for evicted (key, model) pairs; returns their keys."""
+        if self._on_evict is not None:
+            for _, model in evicted:
+                self._on_evict(model)
+        return [key for key, _ in evicted]
+
+
+class ModelSlot:
+    """
+    The active model, swappable while transcriptions are in flight.
+
+    lease() pins the current LoadedModel until the with-block exits;
+    swap() replaces it for new leases immediately. A replaced model is
+    handed to on_release once no lease holds it any more.
+    """
+
+    def __init__(self, on_release=None):
+        """
+        Args:
+            on_release: Optional callable(LoadedModel) run when a replaced
+                        model has no leases left
+        """
+        self._current = None
+        self._leases = {}  # id(LoadedModel) -> active lease count
+        self._retired = {}  # id(LoadedModel) -> replaced model still leased
+        self._on_release = on_release
+        self._lock = threading.Lock()
+
+    @property
+    def current(self):
+        """The active LoadedModel, or None before the first swap."""
+        return self._current
+
+    def in_flight(self, loaded=None):
+        """Number of active leases, on one model or on all of them."""
+        with self._lock:
+            if loaded is not None:
+                return self._leases.get(id(loaded), 0)
+            return sum(self._leases.values())
+
+    @contextmanager
+    def lease(self):
+        """
+        Pin the current model for the duration of a with-block.
+
+        Yields:
+            LoadedModel, or None if no model has been loaded yet
+        """
+        with self._lock:
+            loaded = self._current
+            if loaded is not None:
+                self._leases[id(loaded)] = self._leases.get(id(loaded), 0) + 1
+        try:
+            yield loaded
+        finally:
+            if loaded is not None:
+                self._end_lease(loaded)
+
+    def swap(self, loaded):
+        """
+        Make loaded the active model.
+
+        Returns:
+            The previous LoadedModel (or None). It is released now if idle,
+            otherwise when its last lease ends.
+        """
+        with self._lock:
+            previous, self._current = self._current, loaded
+            if previous is None or previous is loaded:
+                return previous
+            if self._leases.get(id(previous)):
+                self._retired[id(previous)] = previous
+                release = False
+            else:
+                release = True
+        if release:
+            self._release(previous)
+        return previous
+
+    def _end_lease(self, loaded):
+        with self._lock:
+            count = self._leases[id(loaded)] - 1
+            if count:
+                self._leases[id(loaded)] = count
+                return
+            del self._leases[id(loaded)]
+            retired = self._retired.pop(id(loaded), None)
+        if retired is not None:
+            self._release(retired)
+
+    def _release(self, loaded):
+        log.debug(f"Released model {loaded.key.size} ({loaded.key.device}, {loaded.key.compute_type})")
+        if self._on_release is not None:
+            self._on_release(loaded)
@@ -0,0 +1,161 @@
+"""
+Model file preloading for MurmurTone.
+
+On a cold boot most of WhisperModel()'s time for medium/large models is
+spent reading model.bin from disk. A Preloader streams the model's files
+into the OS page cache in a background thread (sequential reads, plus
+posix_fadvise(WILLNEED) where available), so that work overlaps with the
+rest of startup. The model load then initializes from memory.
+
+The load logs how long the file reads took, how much of that was hidden
+behind startup, and how long initialization took on top.
+"""
+import logging
+import os
+import threading
+import time
+
+log = logging.getLogger("murmurtone")
+
+
+# Read size per call; large sequential reads let the OS read ahead
+CHUNK_BYTES = 8 * 1024 * 1024
+
+_preloaders = {}  # model_path -> Preloader
+_lock = threading.Lock()
+
+
+def hf_cache_dir():
+    """HuggingFace hub cache directory (honours HF_HUB_CACHE / HF_HOME)."""
+    if os.environ.get("HF_HUB_CACHE"):
+        return os.environ["HF_HUB_CACHE"]
+    hf_home = os.environ.get("HF_HOME", os.path.join(os.path.expanduser("~"), ".cache", "huggingface"))
+    return os.path.join(hf_home, "hub")
+
+
+def resolve_model_dir(model_path):
+    """
+    Local directory holding the model's files.
+
+    Args:
+        model_path: Model directory, or a model size name downloaded to
+                    the HuggingFace cache
+
+    Returns:
+        Directory path, or None if the model is not on disk yet
+    """
+    if os.path.isdir(model_path):
+        return model_path
+    snapshots = os.path.join(hf_cache_dir(), f"models--Systran--faster-whisper-{model_path}", "snapshots")
+    try:
+        candidates = [entry.path for entry in os.scandir(snapshots)
+                      if os.path.exists(os.path.join(entry.path, "model.bin"))]
+    except OSError:
+        return None
+    # Newest snapshot is the one faster-whisper resolves
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
+
+def model_files(model_dir):
+    """Real paths of the model's files, largest first (HF snapshots are symlinks)."""
+    files = []
+    for entry in os.scandir(model_dir):
+        if entry.is_file():
+            path = os.path.realpath(entry.path)
+            files.append((os.path.getsize(path), path))
+    return [path for _, path in sorted(files, reverse=True)]
+
+
+class Preloader:
+    """Reads a model's files once in a background thread to warm the page cache."""
+
+    def __init__(self, model_dir, chunk_bytes=CHUNK_BYTES):
+        self.model_dir = model_dir
+        self.chunk_bytes = chunk_bytes
+        self.files = model_files(model_dir)
+        self.total_bytes = sum(os.path.getsize(path) for path in self.files)
+        self.bytes_read = 0
+        self.io_seconds = 0.0
+        self.error = None
+        self._done = threading.Event()
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True, name="model-preload")
+        self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        """Wait for the reads to finish; returns True if they did."""
+        return self._done.wait(timeout)
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _run(self):
+        start = time.perf_counter()
+        buffer = bytearray(self.chunk_bytes)
+        try:
+            for path in self.files:
+                with open(path, "rb", buffering=0) as f:
+                    if hasattr(os, "posix_fadvise"):
+                        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                    while not self._cancelled.is_set():
+                        count = f.readinto(buffer)
+                        if not count:
+                            break
+                        self.bytes_read += count
+                if self._cancelled.is_set():
+                    break
+        except OSError as e:
+            self.error = e
+            log.debug(f"Model preload stopped: {e}")
+        finally:
+            self.io_seconds = time.perf_counter() - start
+            self._done.set()
+
+
+def preload(model_path):
+    """
+    Start (or return the running) preload of a model.
+
+    Returns:
+        Preloader, or None if the model is not on disk
+    """
+    with _lock:
+        preloader = _preloaders.get(model_path)
+        if preloader is not None:
+            return preloader
+        model_dir = resolve_model_dir(model_path)
+        if model_dir is None:
+            return None
+        try:
+            preloader = Preloader(model_dir)
+        except OSError as e:
+            log.debug(f"Model preload skipped: {e}")
+            return None
+        _preloaders[model_path] = preloader.start()
+        return preloader
+
+
+def finish(model_path):
+    """Forget a model's preloader once the model is loaded."""
+    with _lock:
+        preloader = _preloaders.pop(model_path, None)
+    if preloader is not None:
+        preloader.cancel()
+
+
+def describe_load(preloader, waited_s, init_s):
+    """One-line I/O vs initialization breakdown of a model load."""
+    if preloader is None:
+        return f"init {init_s:.2f}s (files not preloaded)"
+    mb = preloader.bytes_read / (1024 * 1024)
+    hidden = max(0.0, preloader.io_seconds - waited_s)
+    return (f"I/O {preloader.io_seconds:.2f}s for {mb:.0f} MB ({hidden:.2f}s overlapped with startup), "
+            f"init {init_s:.2f}s")
@@ -25,6 +25,21 @@ import stats
 import preview_window
 import clipboard_utils
 import license
+import audio_capture
+import device_registry
+import resampler
+import streaming
+import parallel_decode
+import warmup
+import vad
+import model_pool
+import dictation_pipeline
+import dictation_stages
+import autotune
+import language_id
+import hardware_caps
+import inference_backend
+import model_preload
 from logger import log
 
 
@@ -73,26 +88,32 @@ setup_nvidia_dll_path()
 
 # Global state
 app_config = None
-model = None
+active_model = model_pool.ModelSlot(on_release=lambda loaded: release_model(loaded))  # Serves dictations; swapped when a reload finishes
+model_load_lock = threading.Lock()  # One load at a time, so swaps happen in request order
+draft_model = None  # model_pool.LoadedModel for two-pass drafts, or None
+lid_model = None  # model_pool.LoadedModel for language detection, or None (use the active model)
+language_cache = language_id.LanguageCache()  # Language detected this session (language "auto")
 model_ready = False
 model_loading = False
 keyboard_controller = Controller()
 current_keys = set()
 is_recording = False
-audio_data = []
+capture_buffer = None  # audio_capture.CaptureBuffer for the current recording
 stream = None
+warm_capture = None  # audio_capture.WarmCapture when warm capture is enabled
+streamer = None  # streaming.StreamingTranscriber when streaming is enabled
 tray_icon = None
 settings_process = None
 key_listener = None
 transcription_history = text_processor.TranscriptionHistory()
+text_pipeline = text_processor.TextPipeline(config.DEFAULTS)  # Rebuilt when text settings change
 
 # Audio feedback sounds (just start/stop clicks)
 start_sound = None
 stop_sound = None
 
-# Silence detection state
-silence_start_time = None
-peak_db_level = -100  # Peak audio level during current recording (for adaptive threshold)
+# Silence detection state (audio_capture.SilenceDetector, auto_stop mode only)
+silence_detector = None
 
 # Recording duration tracking
 recording_start_time = None
@@ -289,49 +310,10 @@ def check_cuda_available():
 
     This checks both compile-time support AND runtime library availability.
     On Windows, the CUDA DLLs from nvidia-cublas-cu12 and nvidia-cudnn-cu12
-    must be loadable for GPU inference to work.
+    must be loadable for GPU inference to work. The probe result is cached
+    per install/driver fingerprint (see hardware_caps).
     """
-    # First check compile-time support
-    try:
-        import ctranslate2
-        cuda_types = ctranslate2.get_supported_compute_types("cuda")
-        if len(cuda_types) == 0:
-            return False
-    except (ImportError, Exception):
-        return False
-
-    # On Windows, verify runtime DLLs actually load
-    if sys.platform == "win32":
-        import ctypes
-
-        # Find site-packages
-        site_packages = None
-        for path in sys.path:
-            if "site-packages" in path and os.path.exists(path):
-                site_packages = path
-                break
-
-        if not site_packages:
-            return False
-
-        # Required DLLs for CUDA inference
-        required_dlls = [
-            ("nvidia", "cublas", "bin", "cublas64_12.dll"),
-            ("nvidia", "cudnn", "bin", "cudnn64_9.dll"),
-        ]
-
-        for parts in required_dlls:
-            dll_path = os.path.join(site_packages, *parts)
-            if not os.path.exists(dll_path):
-                log.debug(f"CUDA DLL not found: {dll_path}")
-                return False
-            try:
-                ctypes.WinDLL(dll_path)
-            except OSError as e:
-                log.debug(f"Failed to load CUDA DLL {dll_path}: {e}")
-                return False
-
-    return True
+    return hardware_caps.get_capabilities()["cuda_available"]
 
 
 def get_device_and_compute_type():
@@ -356,59 +338,270 @@ def get_device_and_compute_type():
     else:
         device = "cpu"
 
-    # Determine compute type (CPU only supports int8)
+    # Determine compute type (CPU uses int8 where the CPU supports it)
     if device == "cpu":
-        compute_type = "int8"
+        compute_type = hardware_caps.cpu_compute_type()
     else:
         compute_type = compute_type_setting
 
     return device, compute_type
 
 
+def get_decode_concurrency(device):
+    """Concurrent chunk decodes (CTranslate2 workers) for the given device."""
+    configured = app_config.get("decode_concurrency", 0)
+    if configured and configured > 0:
+        return int(configured)
+    return parallel_decode.default_concurrency(device)
+
+
+def create_whisper_model(model_path, device, compute_type):
+    """Create the configured inference backend with one CTranslate2 worker per concurrent decode."""
+    workers = get_decode_concurrency(device)
+    options = {"device": device, "compute_type": compute_type, "num_workers": workers}
+    if device == "cpu":
+        # Calibrated value if available, otherwise split the cores evenly
+        # between several workers (one worker keeps the library default)
+        threads = app_config.get("cpu_threads", 0)
+        if threads and threads > 0:
+            options["cpu_threads"] = threads
+        elif workers > 1:
+            options["cpu_threads"] = parallel_decode.cpu_threads_per_worker(workers)
+    name, backend_options = inference_backend.configured_backend(app_config)
+    options.update(backend_options)
+    return inference_backend.create_backend(name, model_path, **options), workers
+
+
+def warm_up_model(current_model, workers=1):
+    """Run warm-up decodes on a loaded model and log cold vs warm timings."""
+    transcribe_params, _ = build_transcribe_params()
+
+    try:
+        cold, warm = current_model.warm_up(workers, **transcribe_params)
+        log.info(f"Model warm-up: cold {cold * 1000:.0f} ms, warm {warm * 1000:.0f} ms")
+    except Exception as e:
+        log.warning(f"Model warm-up failed: {e}")
+
+
+def rewarm_idle_model():
+    """Warm the current model again after a long idle period."""
+    with active_model.lease() as loaded:
+        if loaded is not None and model_ready:
+            log.info("Model idle - re-warming")
+            warm_up_model(loaded.model, loaded.workers)
+
+
+def model_busy():
+    """True while the model is loading or a dictation is being recorded or processed."""
+    return is_recording or model_loading or not model_ready or dictations.pending > 0
+
+
+def note_model_use():
+    """Restart the idle timers of the background model tasks."""
+    model_rewarmer.touch()
+    cpu_autotune_trigger.touch()
+
+
+# Re-warms the model in the background after a long idle period
+model_rewarmer = warmup.IdleRewarmer(rewarm_idle_model, idle_seconds=0, is_busy=model_busy)
+
+# Recently used models stay loaded so switching back is instant
+models = model_pool.ModelPool(budget_mb=config.DEFAULTS["model_pool_budget_mb"],
+                              on_evict=lambda loaded: release_model(loaded))
+
+
+def release_model(loaded):
+    """
+    Unload a model once nothing can use it: not pooled, active, leased or
+    serving as a helper. Runs when the pool evicts a model and when the
+    active slot releases a replaced one.
+    """
+    if (models.peek(loaded.key) is loaded or active_model.current is loaded
+            or active_model.in_flight(loaded) or loaded is draft_model or loaded is lid_model):
+        return
+    log.debug(f"Unloading model {loaded.key.size} ({loaded.key.device}, {loaded.key.compute_type})")
+    loaded.model.unload()
+
+
 def load_model(model_size=None):
-    """Load or reload the Whisper model."""
-    global model, model_ready, model_loading
+    """
+    Load or reload the Whisper model, reusing a resident one if pooled.
+
+    The new model is loaded and warmed on the side; the current one keeps
+    serving dictations until it is swapped out.
+    """
+    global model_ready, model_loading
+
+    with model_load_lock:
+        if model_size is None:
+            model_size = app_config["model_size"]
+
+        # Determine device and compute type
+        device, compute_type = get_device_and_compute_type()
+        key = model_pool.ModelKey(model_size, device, compute_type)
+
+        # Switching back to a recently used model needs no disk load or warm-up
+        loaded = models.get(key)
+        if loaded is not None:
+            active_model.swap(loaded)
+            model_ready = True
+            note_model_use()
+            log.info(f"Switched to resident model {model_size} on {device}. Ready.")
+            set_ready_title()
+            load_helper_models()
+            return
 
-    if model_size is None:
-        model_size = app_config["model_size"]
+        model_loading = True
 
-    model_ready = False
-    model_loading = True
+        if tray_icon:
+            tray_icon.title = f"MurmurTone - Loading {model_size}..."
 
-    if tray_icon:
-        tray_icon.title = f"MurmurTone - Loading {model_size}..."
+        log.info(f"Loading Whisper model ({model_size})...")
+        log.info(f"Using device: {device}, compute type: {compute_type}")
+
+        # Use bundled model if available, otherwise download from HuggingFace
+        model_path = get_model_path(model_size)
+
+        # Read the model files into the page cache first (already under way
+        # for the startup model), so file I/O and initialization are timed
+        # separately
+        preloader = model_preload.preload(model_path) if app_config.get("model_preload_enabled", True) else None
+        start = time.perf_counter()
+        if preloader is not None:
+            preloader.wait()
+        waited = time.perf_counter() - start
+
+        # Try to load model, falling back to CPU if GPU fails
+        try:
+            start = time.perf_counter()
+            try:
+                new_model, workers = create_whisper_model(model_path, device, compute_type)
+            except RuntimeError as e:
+                error_str = str(e).lower()
+                if device == "cuda" and ("cublas" in error_str or "cuda" in error_str or "cudnn" in error_str):
+                    log.error(f"GPU initialization failed: {e}")
+                    log.warning("Falling back to CPU mode...")
+                    device = "cpu"
+                    compute_type = hardware_caps.cpu_compute_type()
+                    # Also save this to config so we don't keep trying GPU
+                    app_config["processing_mode"] = "cpu"
+                    config.save_config(app_config)
+                    new_model, workers = create_whisper_model(model_path, device, compute_type)
+                else:
+                    raise
+            log.info(f"Model load: {model_preload.describe_load(preloader, waited, time.perf_counter() - start)}")
+
+            # Pay first-decode costs now rather than in the first dictation
+            if app_config.get("model_warmup_enabled", True):
+                warm_up_model(new_model, workers)
+        finally:
+            model_preload.finish(model_path)
+            model_loading = False
+
+        loaded = model_pool.LoadedModel(new_model, workers, model_pool.ModelKey(model_size, device, compute_type))
+        models.budget_mb = app_config.get("model_pool_budget_mb", 2048)
+        models.put(loaded.key, loaded)
+        active_model.swap(loaded)
+        note_model_use()
 
-    log.info(f"Loading Whisper model ({model_size})...")
-    from faster_whisper import WhisperModel
+        model_ready = True
+        log.info(f"Model loaded on {device} ({workers} decode worker(s))! Ready.")
+        set_ready_title()
 
-    # Determine device and compute type
+    load_helper_models()
+
+
+def load_helper_model(size, purpose):
+    """
+    LoadedModel of the given size on the current device, for a helper
+    role (draft, language ID). Reuses a matching helper or pooled model
+    before loading a new instance.
+
+    Returns:
+        LoadedModel, or None if loading failed
+    """
     device, compute_type = get_device_and_compute_type()
-    log.info(f"Using device: {device}, compute type: {compute_type}")
+    key = model_pool.ModelKey(size, device, compute_type)
+    for helper in (draft_model, lid_model):
+        if helper is not None and helper.key == key:
+            return helper
+
+    # Reuse the pooled instance if this size was used recently
+    loaded = models.get(key)
+    if loaded is None:
+        log.info(f"Loading {purpose} model ({size})...")
+        try:
+            new_model, workers = create_whisper_model(get_model_path(size), device, compute_type)
+        except Exception as e:
+            log.warning(f"{purpose.capitalize()} model failed to load: {e}")
+            return None
+        if app_config.get("model_warmup_enabled", True):
+            warm_up_model(new_model, workers)
+        loaded = model_pool.LoadedModel(new_model, workers, key)
+    log.info(f"{purpose.capitalize()} model {size} ready on {device}")
+    return loaded
+
+
+def load_helper_models():
+    """Load or drop the draft and language ID models to match the settings."""
+    global draft_model, lid_model
+
+    size = app_config.get("draft_model_size", "tiny")
+    if app_config.get("two_pass_enabled", False) and size != app_config["model_size"]:
+        draft_model = load_helper_model(size, "draft")
+    else:
+        draft_model = None
+
+    size = app_config.get("lid_model_size", "")
+    if size and size != app_config["model_size"]:
+        lid_model = load_helper_model(size, "language ID")
+    else:
+        lid_model = None
 
-    # Use bundled model if available, otherwise download from HuggingFace
-    model_path = get_model_path(model_size)
 
-    # Try to load model, falling back to CPU if GPU fails
+def run_cpu_autotune():
+    """
+    Calibrate cpu_threads/num_workers for the current model once, on the
+    first idle period after a CPU load, then reload the model with the
+    fastest setting. Stops early (and retries when next idle) if a
+    dictation starts meanwhile.
+    """
+    loaded = active_model.current
+    if loaded is None or loaded.key.device != "cpu" or app_config.get("cpu_autotune_model"):
+        return
+
+    size = loaded.key.size
+    backend, backend_options = inference_backend.configured_backend(app_config)
+    report = autotune.run(size, get_model_path(size), loaded.key.compute_type,
+                          backend=backend, backend_options=backend_options, should_stop=model_busy)
+    if report is None:
+        return
+    autotune.save_report(report)
+    if not autotune.apply_report(app_config, report):
+        return
+    config.save_config(app_config)
+
+    # num_workers/cpu_threads are fixed per instance
+    models.clear()
+    load_model()
+
+
+def idle_cpu_autotune():
+    """Run the CPU calibration from the idle trigger, logging failures."""
     try:
-        model = WhisperModel(model_path, device=device, compute_type=compute_type)
-    except RuntimeError as e:
-        error_str = str(e).lower()
-        if device == "cuda" and ("cublas" in error_str or "cuda" in error_str or "cudnn" in error_str):
-            log.error(f"GPU initialization failed: {e}")
-            log.warning("Falling back to CPU mode...")
-            device = "cpu"
-            compute_type = "int8"
-            # Also save this to config so we don't keep trying GPU
-            app_config["processing_mode"] = "cpu"
-            config.save_config(app_config)
-            model = WhisperModel(model_path, device=device, compute_type=compute_type)
-        else:
-            raise
+        run_cpu_autotune()
+    except Exception as e:
+        log.warning(f"CPU calibration failed: {e}")
 
-    model_ready = True
-    model_loading = False
-    log.info(f"Model loaded on {device}! Ready.")
 
+# Calibrates CPU threading once the app has been idle, so it never
+# competes with the first dictations after launch
+cpu_autotune_trigger = warmup.IdleRewarmer(idle_cpu_autotune, idle_seconds=0, is_busy=model_busy,
+                                           name="cpu-autotune")
+
+
+def set_ready_title():
+    """Show the ready state and hotkey in the tray tooltip."""
     if tray_icon:
         hotkey_str = config.hotkey_to_string(app_config["hotkey"])
         action = "Press" if app_config.get("recording_mode") == "auto_stop" else "Hold"
@@ -431,33 +624,59 @@ def rms_to_db(rms, reference=1.0):
 
 def auto_stop_recording():
     """Called when silence threshold is reached in auto-stop mode."""
-    global is_recording, silence_start_time
-
     if not is_recording:
         return
 
     log.info("Auto-stopped (silence detected)")
-
-    silence_start_time = None
     stop_recording()
 
 
-def audio_callback(indata, frames, time_info, status):
-    global audio_data, is_recording, silence_start_time, last_duration_update, peak_db_level
+def on_captured_block(buffer, start, end, status):
+    """Runs in the PortAudio callback: count status flags, queue analysis.
 
-    if not is_recording:
-        return
+    Kept to a counter update and a queue put - everything else happens on
+    the block_analyzer worker so the real-time thread never waits.
+    """
+    capture_stats.record(status)
+    if buffer is not None and is_recording:
+        if end > start:
+            capture_stats.record_first_block()
+        block_analyzer.submit(buffer, start, end)
 
-    # Calculate current audio level
-    rms = calculate_rms(indata)
-    db = rms_to_db(rms)
+
+def audio_callback(indata, frames, time_info, status):
+    """Callback for a per-recording (cold) stream; blocks arrive as 16 kHz mono."""
+    # Local reference: stop_recording may clear the global concurrently
+    buffer = capture_buffer
+    if not is_recording or buffer is None:
+        capture_stats.record(status)
+        return
 
     # Always capture audio - let Whisper handle any background noise
     # The noise gate was too fragile and filtered actual speech
-    audio_data.append(indata.copy())
+    start = len(buffer)
+    buffer.write(indata)
+    on_captured_block(buffer, start, len(buffer), status)
+
+
+def analyze_audio_block(buffer, start, end):
+    """Level metering, preview updates and auto-stop (block_analyzer worker)."""
+    global last_duration_update
+
+    # Ignore blocks queued by a recording that has since stopped
+    if buffer is not capture_buffer or not is_recording:
+        return
+
+    # Grow the buffer / map the next spill chunk here, not in the callback
+    buffer.prepare()
+
+    # Calculate current audio level
+    db = rms_to_db(calculate_rms(buffer.view(start, end)))
 
-    # Update preview window with duration once per second
-    if recording_start_time is not None and app_config.get("preview_enabled", True):
+    # Update preview window with duration once per second (until streaming text replaces it)
+    active_streamer = streamer
+    showing_text = active_streamer is not None and active_streamer.text
+    if recording_start_time is not None and app_config.get("preview_enabled", True) and not showing_text:
         elapsed = time.time() - recording_start_time
         elapsed_int = int(elapsed)
         if elapsed_int > last_duration_update:
@@ -465,44 +684,140 @@ def audio_callback(indata, frames, time_info, status):
             preview_window.show_recording(duration_seconds=elapsed)
 
     # Only check silence-based auto_stop in auto_stop mode
-    if app_config.get("recording_mode") != "auto_stop":
+    detector = silence_detector
+    if detector is None or app_config.get("recording_mode") != "auto_stop":
         return
 
-    # Adaptive silence detection: track peak level and detect significant drop
-    # Only count loud sounds as speech (> -50 dB), not ambient noise
-    if db > -50:
-        peak_db_level = max(peak_db_level, db)
+    # Audio time (not wall time) so worker lag can't shorten the silence window
+    if detector.update(db, end / buffer.sample_rate):
+        log.info(f"Silence duration {detector.silence_duration}s exceeded, triggering auto-stop")
+        threading.Thread(target=auto_stop_recording, daemon=True).start()
 
-    silence_duration = app_config.get("silence_duration_sec", 2.0)
-    silence_margin = app_config.get("silence_threshold_db", -20)
 
-    # Use adaptive threshold only if we detected actual speech
-    # Otherwise use a fixed threshold for "no speech" detection
-    if peak_db_level > -90:  # Speech was detected
-        dynamic_threshold = peak_db_level + silence_margin
-    else:
-        # No speech detected - use fixed threshold (quiet room)
-        dynamic_threshold = -50  # If quieter than -50 dB, consider it silence
-
-    current_time = time.time()
-
-    if db <= dynamic_threshold:
-        # At or below threshold - silence detected
-        if silence_start_time is None:
-            silence_start_time = current_time
-        elif (current_time - silence_start_time) >= silence_duration:
-            # Silence duration exceeded - trigger stop
-            log.info(f"Silence duration {silence_duration}s exceeded, triggering auto-stop")
-            threading.Thread(target=auto_stop_recording, daemon=True).start()
-            silence_start_time = None  # Prevent re-triggering
+# Capture-path counters and the worker that keeps analysis off the callback
+capture_stats = audio_capture.CaptureStats()
+capture_totals = {"recordings": 0, "blocks": 0, "input_overflows": 0, "input_underflows": 0}
+block_analyzer = audio_capture.BlockAnalyzer(analyze_audio_block)
+
+
+def get_capture_diagnostics():
+    """Return capture-path health for the last recording plus session totals."""
+    return {
+        "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "last_recording": capture_stats.as_dict(),
+        "session": dict(capture_totals),
+    }
+
+
+def publish_capture_diagnostics():
+    """Fold the finished recording into session totals, then log and save them."""
+    last = capture_stats.as_dict()
+    capture_totals["recordings"] += 1
+    for key in ("blocks", "input_overflows", "input_underflows"):
+        capture_totals[key] += last[key]
+
+    if last["input_overflows"] or last["input_underflows"]:
+        log.warning(f"Audio dropouts during recording: {last}")
     else:
-        # Above threshold - reset silence timer
-        silence_start_time = None
+        log.info(f"Capture stats: {last}")
+    # Read by the settings window (separate process) via get_capture_diagnostics
+    audio_capture.save_diagnostics(get_capture_diagnostics())
+
+
+# Saved input device -> PortAudio index, resolved once per device change
+input_devices = device_registry.DeviceRegistry()
+
+
+def open_input_stream(callback):
+    """
+    Open and start an input stream on the configured device.
+
+    The stream runs at the device's native rate and channel count, and
+    each block is downmixed and resampled to 16 kHz mono before callback
+    sees it, so the host API never has to convert. If that open fails
+    (format rejected, or the device set changed), the device cache is
+    dropped and the stream is retried at the configured rate in mono.
+    """
+    for attempt in range(2):
+        # Get selected input device (None = system default)
+        device = input_devices.resolve(app_config.get("input_device"))
+        if attempt == 0 and device.native_rate:
+            rate, channels = device.native_rate, min(device.channels or 1, 2)
+        else:
+            rate, channels = app_config.get("sample_rate", 16000), 1
+        converter = resampler.PolyphaseResampler(rate, channels=channels)
+
+        def converted_callback(indata, frames, time_info, status, converter=converter):
+            started = time.perf_counter()
+            block = converter.process(indata)
+            callback(block, len(block), time_info, status)
+            capture_stats.record_duration(time.perf_counter() - started)
+
+        try:
+            input_stream = sd.InputStream(samplerate=rate, channels=channels, dtype=np.float32,
+                                          device=device.index, callback=converted_callback)
+            input_stream.start()
+            log.debug(f"Input stream opened at {rate} Hz, {channels} channel(s)")
+            return input_stream
+        except Exception as e:
+            input_devices.invalidate(f"stream open failed: {e}")
+            if attempt:
+                raise
+
+
+def get_warm_capture():
+    """Return the shared WarmCapture if warm capture is enabled, else None."""
+    global warm_capture
+
+    if not app_config.get("warm_capture_enabled", False):
+        return None
+    if warm_capture is None:
+        warm_capture = audio_capture.WarmCapture(
+            open_input_stream,
+            sample_rate=resampler.MODEL_SAMPLE_RATE,
+            preroll_seconds=app_config.get("warm_capture_preroll_ms", 500) / 1000.0,
+            idle_timeout=app_config.get("warm_capture_idle_timeout_sec", 120),
+            on_block=on_captured_block,
+        )
+    return warm_capture
+
+
+def close_warm_capture():
+    """Release the warm input stream (e.g. after audio settings change)."""
+    global warm_capture
+
+    if warm_capture is not None:
+        warm_capture.close()
+        warm_capture = None
+
+
+def show_streaming_text(text):
+    """Show partial streaming transcription in the preview window."""
+    if app_config.get("preview_enabled", True):
+        # Keep the newest words visible; the preview truncates from the end
+        display = text if len(text) <= 200 else "..." + text[-197:]
+        preview_window.show_text(display, auto_hide=False)
+
+
+def create_streamer(capture):
+    """StreamingTranscriber for a new recording, or None if streaming is off."""
+    if not app_config.get("streaming_enabled", False):
+        return None
+    transcribe_params, _ = build_transcribe_params()
+    return streaming.StreamingTranscriber(
+        capture,
+        lambda audio: transcribe_with_fallback(audio, transcribe_params),
+        on_text=show_streaming_text,
+        min_pause_ms=app_config.get("streaming_min_pause_ms", vad.DEFAULT_PAUSE_MS),
+        padding_ms=app_config.get("vad_padding_ms", vad.DEFAULT_PADDING_MS),
+        vad_enabled=app_config.get("vad_enabled", True),
+    )
 
 
 def start_recording():
-    global is_recording, audio_data, stream, silence_start_time, recording_start_time, last_duration_update, peak_db_level, last_recording_toggle
+    global is_recording, capture_buffer, stream, streamer, silence_detector, recording_start_time, last_duration_update, last_recording_toggle
 
+    pressed = time.perf_counter()
     with recording_lock:
         # Debounce check - prevent rapid toggling
         now = time.time()
@@ -514,14 +829,41 @@ def start_recording():
             return
         if is_recording:
             return
+        if dictations.pending >= app_config.get("pipeline_max_pending", 3):
+            log.info("Still transcribing earlier dictations, please wait...")
+            return
 
         last_recording_toggle = now
         is_recording = True
-        audio_data = []
-        silence_start_time = None
-        peak_db_level = -100  # Reset peak level for adaptive silence detection
+        capture_buffer = audio_capture.CaptureBuffer(
+            resampler.MODEL_SAMPLE_RATE,
+            spill_after_seconds=app_config.get("capture_spill_after_sec", 300),
+            spill_dir=audio_capture.get_recordings_dir(),
+        )
+        silence_detector = audio_capture.SilenceDetector(
+            silence_duration=app_config.get("silence_duration_sec", 2.0),
+            margin_db=app_config.get("silence_threshold_db", -20),
+        )
+        capture_stats.reset(started_at=pressed)
+        streamer = local_streamer = create_streamer(capture_buffer)
         recording_start_time = time.time()
         last_duration_update = 0
+        local_buffer = capture_buffer
+
+        # Warm capture: the stream is already running, so start capturing
+        # before anything else (includes pre-roll from just before the press).
+        # Attached under the lock so a concurrent stop can't detach first
+        warm = get_warm_capture()
+        open_error = None
+        if warm is not None:
+            try:
+                warm.attach(local_buffer)
+            except Exception as e:
+                open_error = e
+
+    if open_error is not None:
+        abort_recording(local_buffer, open_error)
+        return
 
     # These operations can run outside the lock
     play_sound(start_sound)
@@ -532,12 +874,84 @@ def start_recording():
         preview_window.show_recording(duration_seconds=0)
 
     log.info("Recording...")
-    sample_rate = app_config.get("sample_rate", 16000)
-    # Get selected input device (None = system default)
-    device_index = config.get_device_index(app_config.get("input_device"))
-    stream = sd.InputStream(samplerate=sample_rate, channels=1, dtype=np.float32,
-                            device=device_index, callback=audio_callback)
-    stream.start()
+    if warm is None:
+        try:
+            stream = open_input_stream(audio_callback)
+        except Exception as e:
+            abort_recording(local_buffer, e)
+            return
+    if local_streamer is not None:
+        local_streamer.start()
+
+
+def abort_recording(buffer, error):
+    """Undo start_recording after the input stream could not be opened."""
+    global is_recording, capture_buffer, streamer, silence_detector
+
+    with recording_lock:
+        # A stop that already ran has reset the state itself
+        if capture_buffer is buffer:
+            is_recording = False
+            capture_buffer = None
+            streamer = None
+            silence_detector = None
+
+    log.error(f"Could not open microphone: {error}")
+    update_tray_icon(recording=False)
+    preview_window.hide()
+    if tray_icon:
+        tray_icon.notify("Could not open the microphone. Check the input device in Settings.", "MurmurTone")
+
+
+def transcribe_audio(audio, transcribe_params, loaded=None):
+    """Transcribe audio, decoding long recordings in parallel chunks.
+
+    Uses the active model unless a LoadedModel (e.g. the draft model) is given.
+    """
+    if loaded is None:
+        # The lease keeps this model alive even if a reload swaps it out mid-decode
+        with active_model.lease() as current:
+            if current is None:
+                raise RuntimeError("No model loaded")
+            return transcribe_audio(audio, transcribe_params, current)
+
+    # Detect "auto" language once here rather than in every chunk decode
+    if transcribe_params.get("language") is None and app_config.get("language_cache_enabled", True):
+        language = resolve_language(audio, loaded)
+        if language is not None:
+            transcribe_params = dict(transcribe_params, language=language)
+
+    return dictation_stages.decode_audio(loaded.model, audio, transcribe_params, loaded.workers,
+                                         resampler.MODEL_SAMPLE_RATE)
+
+
+def resolve_language(audio, loaded):
+    """
+    Language for an "auto" dictation: the session cache if still
+    confident, otherwise a fresh detection from the start of the audio.
+
+    Returns:
+        Language code, or None to let Whisper detect it during decoding
+    """
+    language = language_cache.get()
+    if language is not None:
+        return language
+
+    detector = lid_model or loaded
+    try:
+        language, probability = language_id.detect(
+            language_id.whisper_detector(detector.model), audio, resampler.MODEL_SAMPLE_RATE
+        )
+    except Exception as e:
+        log.warning(f"Language detection failed: {e}")
+        return None
+    return language if language_cache.update(language, probability) else None
+
+
+def configure_language_cache():
+    """Apply language cache settings."""
+    language_cache.threshold = app_config.get("lid_confidence", language_id.DEFAULT_THRESHOLD)
+    language_cache.half_life = app_config.get("lid_cache_half_life_min", 30) * 60
 
 
 def transcribe_with_fallback(audio, transcribe_params):
@@ -547,11 +961,9 @@ def transcribe_with_fallback(audio, transcribe_params):
     will automatically switch to CPU mode, save the config, reload the
     model, and retry the transcription.
     """
-    global model
-
+    note_model_use()
     try:
-        segments, _ = model.transcribe(audio, **transcribe_params)
-        return "".join(segment.text for segment in segments).strip()
+        return transcribe_audio(audio, transcribe_params)
     except RuntimeError as e:
         error_str = str(e).lower()
         if "cublas" in error_str or "cuda" in error_str or "cudnn" in error_str:
@@ -562,58 +974,28 @@ def transcribe_with_fallback(audio, transcribe_params):
             app_config["processing_mode"] = "cpu"
             config.save_config(app_config)
 
+            # Don't switch back to the failed GPU model later
+            failed = active_model.current
+            if failed is not None:
+                models.remove(failed.key)
+
             # Reload model on CPU
             load_model()
 
             # Retry transcription
-            segments, _ = model.transcribe(audio, **transcribe_params)
-            return "".join(segment.text for segment in segments).strip()
+            return transcribe_audio(audio, transcribe_params)
         else:
             raise
 
 
-def stop_recording():
-    global is_recording, stream, audio_data, silence_start_time, last_recording_toggle
-
-    # Capture local references under lock to prevent race conditions
-    local_stream = None
-    local_audio_data = None
-
-    with recording_lock:
-        if not is_recording:
-            return
-
-        last_recording_toggle = time.time()
-        is_recording = False
-        silence_start_time = None
-
-        # Capture and clear globals atomically
-        local_stream = stream
-        stream = None
-        local_audio_data = audio_data
-        audio_data = []
-
-    log.info(f"Stopping recording - captured {len(local_audio_data)} frames")
-
-    play_sound(stop_sound)
-    update_tray_icon(recording=False)
-
-    # Close stream outside lock (safe - using local reference)
-    if local_stream:
-        local_stream.stop()
-        local_stream.close()
-
-    if not local_audio_data:
-        log.warning("No audio captured - microphone may not be working")
-        if app_config.get("preview_enabled", True):
-            preview_window.hide()
-        return
-
-    log.info("Transcribing...")
-    if app_config.get("preview_enabled", True):
-        preview_window.show_transcribing()
-    audio = np.concatenate(local_audio_data, axis=0).flatten()
+def build_transcribe_params():
+    """
+    Build model.transcribe() keyword arguments from the current settings.
 
+    Returns:
+        (transcribe_params, initial_prompt) - the prompt is also needed
+        for hallucination filtering
+    """
     # Determine task and language based on translation mode
     if app_config.get("translation_enabled"):
         task = "translate"
@@ -640,155 +1022,90 @@ def stop_recording():
     transcribe_params = {"task": task, "language": language}
     if initial_prompt:
         transcribe_params["initial_prompt"] = initial_prompt
+    return transcribe_params, initial_prompt
 
-    # Use fallback wrapper that handles GPU failures gracefully
-    raw_text = transcribe_with_fallback(audio, transcribe_params)
-
-    # Filter out prompt hallucinations (Whisper echoes the prompt when given silence)
-    if initial_prompt and raw_text:
-        text_lower = raw_text.lower()
-        prompt_lower = initial_prompt.lower()
-        is_hallucination = False
-
-        # Check 1: Distinctive words from prompt appear in output
-        # Words like "punctuation" are unlikely in normal speech
-        distinctive_words = ['punctuation', 'grammar', 'capitalize', 'spelling']
-        for word in distinctive_words:
-            if word in prompt_lower and word in text_lower:
-                is_hallucination = True
-                break
-
-        # Check 2: Repetitive output (same phrase appears twice) - classic hallucination
-        if not is_hallucination and len(raw_text) > 20:
-            # Split into rough halves and check similarity
-            mid = len(text_lower) // 2
-            first_half = text_lower[:mid]
-            second_half = text_lower[mid:]
-            # Check for repeated phrases
-            words = text_lower.split()
-            if len(words) >= 6:
-                first_part = ' '.join(words[:len(words)//2])
-                second_part = ' '.join(words[len(words)//2:])
-                # If halves are very similar, it's repetitive hallucination
-                common = set(first_part.split()) & set(second_part.split())
-                if len(common) >= 3:
-                    is_hallucination = True
-
-        if is_hallucination:
-            log.info(f"Filtered prompt hallucination: {raw_text}")
-            raw_text = ""
-
-    # Process text through the pipeline (dictionary, fillers, commands)
-    text, should_scratch, scratch_length, actions = text_processor.process_text(
-        raw_text, app_config, transcription_history
-    )
 
-    # Optional AI cleanup (Ollama integration)
-    if app_config.get("ai_cleanup_enabled") and text:
-        import ai_cleanup
-        ollama_url = app_config.get("ollama_url", "http://localhost:11434")
-        if ai_cleanup.check_ollama_available(ollama_url):
-            try:
-                cleaned = ai_cleanup.cleanup_text(
-                    text,
-                    mode=app_config.get("ai_cleanup_mode", "grammar"),
-                    formality_level=app_config.get("ai_formality_level", "professional"),
-                    model=app_config.get("ollama_model", "llama3.2:3b"),
-                    url=ollama_url,
-                    timeout=30
-                )
-                if cleaned:
-                    text = cleaned
-                    log.info("AI cleanup applied")
-            except Exception as e:
-                log.warning(f"AI cleanup failed: {e}")
-                # Continue with original text
-
-    # Execute any action commands (select all, undo, redo)
-    actions_executed = False
-    for action in actions:
-        if action.startswith("ctrl+"):
-            key = action.split("+")[1]
-            keyboard_controller.press(Key.ctrl)
-            keyboard_controller.press(key)
-            keyboard_controller.release(key)
-            keyboard_controller.release(Key.ctrl)
-            time.sleep(0.05)
-            actions_executed = True
-
-    # Handle "scratch that" - delete previous transcription
-    if should_scratch and scratch_length > 0:
-        log.info(f"Scratching last {scratch_length} characters")
+def stop_recording():
+    global is_recording, stream, capture_buffer, streamer, silence_detector, last_recording_toggle
+
+    # Capture local references under lock to prevent race conditions
+    local_stream = None
+    local_capture = None
+    local_streamer = None
+
+    with recording_lock:
+        if not is_recording:
+            return
+
+        last_recording_toggle = time.time()
+        is_recording = False
+        silence_detector = None
+
+        # Capture and clear globals atomically
+        local_stream = stream
+        stream = None
+        local_capture = capture_buffer
+        capture_buffer = None
+        local_streamer = streamer
+        streamer = None
+
+    captured_samples = len(local_capture) if local_capture is not None else 0
+    log.info(f"Stopping recording - captured {captured_samples} samples")
+
+    play_sound(stop_sound)
+    update_tray_icon(recording=False)
+
+    # Close stream outside lock (safe - using local reference)
+    if local_stream:
+        local_stream.stop()
+        local_stream.close()
+    elif warm_capture is not None:
+        # Warm stream stays open for the next dictation
+        warm_capture.detach()
+    publish_capture_diagnostics()
+
+    if not captured_samples:
+        if local_streamer is not None:
+            local_streamer.cancel()
+        log.warning("No audio captured - microphone may not be working")
         if app_config.get("preview_enabled", True):
             preview_window.hide()
-        time.sleep(0.1)
-        for _ in range(scratch_length):
-            keyboard_controller.press(Key.backspace)
-            keyboard_controller.release(Key.backspace)
-        # Don't output anything else for this transcription
-        hotkey_str = config.hotkey_to_string(app_config["hotkey"])
-        log.info(f"Ready. Press {hotkey_str}.")
         return
 
-    if text:
-        # Track this transcription for potential "scratch that"
-        text_with_space = text + " "
-        transcription_history.add(text_with_space)
+    transcribe_params, initial_prompt = build_transcribe_params()
+    # Live transcription already hides most latency, so drafts are for batch mode
+    draft = draft_model if local_streamer is None and app_config.get("two_pass_enabled", False) else None
 
-        # Record usage statistics
-        stats.record_transcription(text)
+    # Decoding and typing happen on the pipeline workers, so the next
+    # recording can start right away; blocks only if the pipeline is full
+    dictations.submit(dictation_stages.Dictation(local_capture, local_streamer, transcribe_params, initial_prompt, draft))
 
-        # Show transcribed text in preview (will auto-hide)
-        if app_config.get("preview_enabled", True):
-            preview_window.show_text(text, auto_hide=True)
-
-        # Output text using configured paste mode
-        paste_mode = app_config.get("paste_mode", "clipboard")
-
-        if paste_mode == "direct":
-            # Direct typing mode - never touches clipboard
-            # Types character-by-character with delay for visual typewriter effect
-            log.info(f"Typing directly: {text}")
-            time.sleep(0.2)  # Brief pause before typing
-            typing_delay = app_config.get("direct_typing_delay_ms", 5) / 1000.0
-            for char in text_with_space:
-                keyboard_controller.type(char)
-                if typing_delay > 0:
-                    time.sleep(typing_delay)
-        else:
-            # Clipboard mode - copy, paste, then restore original clipboard
-            saved_clipboard = clipboard_utils.save_clipboard()
-
-            # Copy to clipboard using Windows API (tkinter conflicts with PyWebView)
-            if not clipboard_utils.set_text(text_with_space):
-                log.error("Failed to copy text to clipboard")
-
-            # Paste
-            log.info(f"Pasting: {text}")
-            time.sleep(0.3)  # Wait for focus to return after clipboard
-            keyboard_controller.press(Key.ctrl_l)
-            time.sleep(0.05)
-            keyboard_controller.press('v')
-            keyboard_controller.release('v')
-            time.sleep(0.05)
-            keyboard_controller.release(Key.ctrl_l)
-
-            # Restore clipboard contents asynchronously
-            if saved_clipboard:
-                clipboard_utils.restore_clipboard_async(saved_clipboard, delay_ms=400)
-    elif actions_executed:
-        log.info(f"Action executed: {', '.join(actions)}")
-        if app_config.get("preview_enabled", True):
-            preview_window.hide()
-    else:
-        log.info("No speech detected")
-        if app_config.get("preview_enabled", True):
-            preview_window.hide()
 
+def log_ready():
+    """Log that the next dictation can be made."""
     hotkey_str = config.hotkey_to_string(app_config["hotkey"])
     log.info(f"Ready. Press {hotkey_str}.")
 
 
+# Decoding, text processing and typing for finished recordings
+stages = dictation_stages.DictationStages(
+    get_config=lambda: app_config,
+    get_text_pipeline=lambda: text_pipeline,
+    transcribe=transcribe_with_fallback,
+    transcribe_draft=transcribe_audio,
+    keyboard=keyboard_controller,
+    keys=Key,
+    history=transcription_history,
+    clipboard=clipboard_utils,
+    preview=preview_window,
+    record_stats=stats.record_transcription,
+    on_ready=log_ready,
+)
+
+# Finished recordings: transcribe -> post-process -> output, one worker each
+dictations = dictation_pipeline.StagedPipeline(stages.stages())
+
+
 def check_hotkey():
     """Check if the configured hotkey is currently pressed."""
     hotkey = app_config["hotkey"]
@@ -1232,7 +1549,7 @@ def on_transcribe_file(icon, item=None):
         import file_transcription
 
         # Check if model is ready
-        if not model_ready or model is None:
+        if not model_ready or active_model.current is None:
             root = tk.Tk()
             root.withdraw()
             messagebox.showerror("Model Not Ready", "Please wait for the Whisper model to finish loading.")
@@ -1299,9 +1616,10 @@ def on_transcribe_file(icon, item=None):
         result = [None, False]  # [text, success]
 
         def do_transcription():
-            text, success = file_transcription.transcribe_file(
-                file_path, model, app_config, update_progress
-            )
+            with active_model.lease() as loaded:
+                text, success = file_transcription.transcribe_file(
+                    file_path, loaded.model, app_config, update_progress
+                )
             result[0] = text
             result[1] = success
             if not cancelled[0]:
@@ -1431,29 +1749,76 @@ def open_settings_window():
         log.error(traceback.format_exc())
 
 
+# Settings that require reopening the warm input stream
+WARM_CAPTURE_KEYS = (
+    "input_device", "sample_rate", "warm_capture_enabled",
+    "warm_capture_preroll_ms", "warm_capture_idle_timeout_sec",
+)
+
+
 def on_settings_saved(new_config):
     """Called when settings are saved."""
-    global app_config
+    global app_config, text_pipeline
 
     old_model = app_config.get("model_size")
     new_model = new_config.get("model_size")
     old_mode = app_config.get("processing_mode")
     new_mode = new_config.get("processing_mode")
+    old_threading = (app_config.get("decode_concurrency", 0), app_config.get("cpu_threads", 0))
+    helpers_changed = any(
+        app_config.get(key) != new_config.get(key)
+        for key in ("two_pass_enabled", "draft_model_size", "lid_model_size")
+    )
+    old_device = app_config.get("input_device")
+    audio_changed = any(
+        app_config.get(key) != new_config.get(key)
+        for key in WARM_CAPTURE_KEYS
+    )
 
-    app_config = new_config
+    language_changed = any(
+        app_config.get(key) != new_config.get(key)
+        for key in ("language", "translation_enabled", "translation_source_language", "language_cache_enabled")
+    )
 
-    # Reload model if model or processing mode changed
+    app_config = new_config
+    if text_pipeline.changed(app_config):
+        text_pipeline = text_processor.TextPipeline(app_config)
+        log.info("Text processing settings changed - pipeline rebuilt")
+    model_rewarmer.idle_seconds = app_config.get("model_rewarm_idle_min", 30) * 60
+    cpu_autotune_trigger.idle_seconds = app_config.get("cpu_autotune_idle_min", 5) * 60
+    configure_language_cache()
+    if language_changed:
+        language_cache.clear()
+    models.budget_mb = app_config.get("model_pool_budget_mb", 2048)
+    models.trim()
+
+    # A newly chosen device may have been plugged in since we last looked
+    if old_device != new_config.get("input_device"):
+        input_devices.invalidate("input device changed")
+
+    # Reopen the warm stream lazily with the new device/rate/pre-roll
+    if audio_changed and not is_recording:
+        close_warm_capture()
+
+    # Reload model if model, processing mode or decode threading changed
     model_changed = old_model != new_model
     mode_changed = old_mode != new_mode
+    threading_changed = old_threading != (new_config.get("decode_concurrency", 0), new_config.get("cpu_threads", 0))
 
-    if model_changed or mode_changed:
+    if model_changed or mode_changed or threading_changed:
         reason = []
         if model_changed:
             reason.append(f"model: {old_model} -> {new_model}")
         if mode_changed:
             reason.append(f"mode: {old_mode} -> {new_mode}")
+        if threading_changed:
+            reason.append("decode threading")
+            # num_workers is fixed per instance, so pooled models are stale
+            models.clear()
         log.info(f"Reloading model ({', '.join(reason)})...")
         threading.Thread(target=load_model, args=(new_model,), daemon=True).start()
+    elif helpers_changed:
+        threading.Thread(target=load_helper_models, daemon=True).start()
 
     # Update preview window configuration
     preview_window.configure(
@@ -1556,7 +1921,7 @@ def watch_config_file():
 
 
 def main():
-    global tray_icon, app_config
+    global tray_icon, app_config, text_pipeline
 
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="MurmurTone - Voice to text")
@@ -1575,10 +1940,19 @@ def main():
     # Load configuration
     app_config = config.load_config()
     hotkey_str = config.hotkey_to_string(app_config["hotkey"])
+    text_pipeline = text_processor.TextPipeline(app_config)
+
+    # Start reading the model from disk while the rest of startup runs
+    if app_config.get("model_preload_enabled", True):
+        model_preload.preload(get_model_path(app_config["model_size"]))
 
     # Check license/trial status (blocks if expired)
     check_license_on_startup(app_config)
 
+    # Keep audio from long recordings that were interrupted by a crash
+    for path in audio_capture.recover_spill_files(audio_capture.get_recordings_dir()):
+        log.warning(f"Recovered unfinished recording: {path}")
+
     # Initialize audio feedback sounds
     init_sounds()
 
@@ -1594,6 +1968,12 @@ def main():
         font_size=app_config.get("preview_font_size", 11)
     )
 
+    # Start audio analysis worker (keeps metering/auto-stop off the audio callback)
+    block_analyzer.start()
+
+    # Start dictation pipeline workers (transcribe, post-process, output)
+    dictations.start()
+
     # Start keyboard listener
     listener_thread = threading.Thread(target=run_keyboard_listener, daemon=True)
     listener_thread.start()
@@ -1602,6 +1982,14 @@ def main():
     model_thread = threading.Thread(target=load_model, daemon=True)
     model_thread.start()
 
+    # Re-warm the model after long idle periods (0 = never)
+    model_rewarmer.idle_seconds = app_config.get("model_rewarm_idle_min", 30) * 60
+    model_rewarmer.start()
+    # Calibrate CPU threading once idle after the first CPU load (0 = never)
+    cpu_autotune_trigger.idle_seconds = app_config.get("cpu_autotune_idle_min", 5) * 60
+    cpu_autotune_trigger.start()
+    configure_language_cache()
+
     # Start restart signal watcher
     restart_thread = threading.Thread(target=check_restart_signal, daemon=True)
     restart_thread.start()
@@ -0,0 +1,91 @@
+"""
+Parallel chunk decoding for long recordings.
+
+faster-whisper decodes a long recording one 30 s window at a time on a
+single model. Here the recording is split at VAD pauses into independent
+chunks that are decoded concurrently. The model is loaded with
+CTranslate2 num_workers equal to the concurrency cap, so concurrent
+transcribe() calls run on separate workers; CTranslate2 releases the GIL
+while decoding, so plain threads are enough. The text is merged in
+order.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import vad
+
+log = logging.getLogger("murmurtone")
+
+
+# Recordings shorter than this are decoded in one call, as before
+MIN_PARALLEL_SECONDS = 30.0
+
+# Chunk length limit, under Whisper's 30 s window to leave room for padding
+MAX_CHUNK_SECONDS = 28.0
+
+
+def default_concurrency(device):
+    """
+    Concurrency used when decode_concurrency is 0 (auto).
+
+    On CPU this is one worker with all of its threads: most dictations
+    are a single decode, and splitting the cores between workers would
+    slow those down. Parallel CPU workers are used once autotune has
+    measured that they pay off (it sets decode_concurrency). GPUs gain
+    little beyond two overlapping decodes.
+    """
+    if device == "cuda":
+        return 2
+    return 1
+
+
+def cpu_threads_per_worker(concurrency, cpu_count=None):
+    """Split the cores evenly between workers (CTranslate2 cpu_threads)."""
+    cores = cpu_count or os.cpu_count() or 1
+    return max(1, cores // max(1, concurrency))
+
+
+def decode_chunks(audio, bounds, transcribe, max_workers):
+    """
+    Decode audio[start:end] for each bound concurrently; merge in order.
+
+    Args:
+        audio: 1-D float32 array
+        bounds: List of (start, end) sample ranges
+        transcribe: callable(audio) -> text, safe to call from several threads
+        max_workers: Concurrency cap
+
+    Returns:
+        Chunk texts joined with single spaces
+    """
+    chunks = [audio[start:end] for start, end in bounds]
+    if max_workers <= 1 or len(chunks) <= 1:
+        texts = [transcribe(chunk) for chunk in chunks]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks)),
+                                thread_name_prefix="decode") as pool:
+            # map() yields in submission order and re-raises chunk errors
+            texts = list(pool.map(transcribe, chunks))
+    return " ".join(text.strip() for text in texts if text and text.strip())
+
+
+def transcribe_long(audio, sample_rate, transcribe, max_workers,
+                    min_parallel_seconds=MIN_PARALLEL_SECONDS,
+                    max_chunk_seconds=MAX_CHUNK_SECONDS):
+    """
+    Transcribe a recording, splitting it at pauses for parallel decoding
+    when it is long enough to benefit.
+
+    Returns:
+        Transcribed text
+    """
+    if max_workers <= 1 or len(audio) < min_parallel_seconds * sample_rate:
+        return transcribe(audio)
+
+    bounds = vad.split_at_pauses(audio, sample_rate, max_chunk_seconds)
+    if len(bounds) == 1:
+        return transcribe(audio)
+    log.debug(f"Decoding {len(audio) / sample_rate:.0f}s in {len(bounds)} chunks, "
+              f"{min(max_workers, len(bounds))} at a time")
+    return decode_chunks(audio, bounds, transcribe, max_workers)
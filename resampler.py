@@ -0,0 +1,139 @@
+"""
+Streaming polyphase resampler for MurmurTone.
+
+Microphones are opened at their native rate and channel count (usually
+48 kHz or 44.1 kHz, often stereo) instead of forcing 16 kHz mono on the
+host API. Each callback block is downmixed and resampled here, so the
+capture buffer always holds 16 kHz mono float32, ready for Whisper, and
+nothing is left to convert when recording stops.
+
+Pure NumPy: a Kaiser-windowed sinc prototype split into polyphase
+branches, applied to all output samples of a block in one vectorized
+gather + dot product.
+"""
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Whisper models expect 16 kHz mono
+MODEL_SAMPLE_RATE = 16000
+
+# Filter half-length in output-rate periods; 24 with the Kaiser beta
+# below gives ~80 dB stopband rejection with a 10% transition band
+ZERO_CROSSINGS = 24
+KAISER_BETA = 7.86
+
+
+def design_filter(up, down, zero_crossings=ZERO_CROSSINGS, beta=KAISER_BETA):
+    """
+    Design the polyphase filter bank for an up/down rational resampler.
+
+    Returns:
+        Array of shape (up, taps): row p holds phase p's coefficients in
+        ascending input-time order, scaled for unity passband gain
+    """
+    taps = max(1, math.ceil(2 * zero_crossings * max(up, down) / up))
+    length = taps * up
+    # Odd-length symmetric core so the delay is a whole number of samples;
+    # an even bank length gets one trailing zero tap
+    center = (length - 1) // 2
+    # Cutoff at the lower of the two Nyquist rates, in upsampled cycles/sample
+    cutoff = 0.5 / max(up, down)
+    t = np.arange(2 * center + 1) - center
+    prototype = np.zeros(length)
+    prototype[:2 * center + 1] = 2 * cutoff * np.sinc(2 * cutoff * t) * np.kaiser(2 * center + 1, beta)
+    prototype *= up / prototype.sum()
+    # Phase p uses prototype[p + k*up]; reverse so it dots with x[i-taps+1 .. i]
+    return prototype.reshape(taps, up).T[:, ::-1].astype(np.float32)
+
+
+class PolyphaseResampler:
+    """
+    Incremental rational-ratio resampler with downmix to mono.
+
+    process() takes blocks as delivered by PortAudio and returns the
+    output samples that are fully determined so far. Output is aligned
+    with the input (filter delay is compensated), so the only latency is
+    half a filter length (~1.5 ms at 16 kHz). flush() emits the tail.
+
+    Not thread-safe; use one instance per stream.
+    """
+
+    def __init__(self, in_rate, out_rate=MODEL_SAMPLE_RATE, channels=1):
+        self.in_rate = int(in_rate)
+        self.out_rate = int(out_rate)
+        self.channels = max(1, int(channels))
+        g = math.gcd(self.in_rate, self.out_rate)
+        self.up = self.out_rate // g
+        self.down = self.in_rate // g
+        self.passthrough = self.up == self.down
+        self._filters = None if self.passthrough else design_filter(self.up, self.down)
+        self._taps = 0 if self.passthrough else self._filters.shape[1]
+        self._delay = (self._taps * self.up - 1) // 2
+        self.reset()
+
+    def reset(self):
+        """Drop all buffered input (start of a new stream)."""
+        history = max(0, self._taps - 1)
+        self._buf = np.zeros(history, dtype=np.float32)
+        self._buf_start = -history  # Absolute input index of _buf[0]
+        self._received = 0
+        self._next_out = 0
+
+    def output_length(self, num_input):
+        """Number of output samples for num_input input samples."""
+        return -(-num_input * self.up // self.down)
+
+    def downmix(self, block):
+        """Return a 1-D mono float32 view/array of a (frames, channels) block."""
+        if block.ndim == 1:
+            return block
+        if block.shape[1] == 1:
+            return block[:, 0]
+        return block.mean(axis=1, dtype=np.float32)
+
+    def process(self, block):
+        """
+        Feed a block; return the newly available 16 kHz mono samples.
+
+        Args:
+            block: Array of shape (frames,) or (frames, channels)
+
+        Returns:
+            1-D float32 array (a view of the block in passthrough mode)
+        """
+        samples = self.downmix(block)
+        if self.passthrough:
+            return samples
+        self._buf = np.concatenate((self._buf, samples.astype(np.float32, copy=False)))
+        self._received += len(samples)
+        # Output m needs input up to (m*down + delay) // up
+        available = (self._received * self.up - 1 - self._delay) // self.down + 1
+        return self._emit(available)
+
+    def flush(self):
+        """Emit the remaining output for the input received so far."""
+        if self.passthrough:
+            return np.empty(0, dtype=np.float32)
+        self._buf = np.concatenate((self._buf, np.zeros(self._taps, dtype=np.float32)))
+        return self._emit(self.output_length(self._received))
+
+    def _emit(self, stop):
+        start = self._next_out
+        if stop <= start:
+            return np.empty(0, dtype=np.float32)
+        positions = np.arange(start, stop, dtype=np.int64) * self.down + self._delay
+        newest, phases = np.divmod(positions, self.up)
+        windows = sliding_window_view(self._buf, self._taps)[newest - (self._taps - 1) - self._buf_start]
+        out = np.einsum("mt,mt->m", windows, self._filters[phases])
+
+        self._next_out = stop
+        # Keep only the history the next output needs
+        keep_from = (stop * self.down + self._delay) // self.up - (self._taps - 1)
+        drop = keep_from - self._buf_start
+        if drop > 0:
+            self._buf = self._buf[drop:]
+            self._buf_start = keep_from
+        return out
@@ -6,6 +6,7 @@ and data transformation that can be tested independently of the UI.
 """
 
 import config
+import hardware_caps
 
 
 # =============================================================================
@@ -23,21 +24,17 @@ def check_cuda_available():
         bool: True if CUDA is available, False otherwise.
     """
     try:
-        import torch
-        return torch.cuda.is_available()
-    except ImportError:
-        # torch not installed, try ctranslate2 directly
-        try:
-            import ctranslate2
-            cuda_types = ctranslate2.get_supported_compute_types("cuda")
-            return len(cuda_types) > 0
-        except (ImportError, Exception):
-            return False
-
-
-def get_cuda_status():
+        return hardware_caps.get_capabilities()["cuda_available"]
+    except Exception:
+        return False
+
+
+def get_cuda_status(refresh=False):
     """Get detailed CUDA status info.
 
+    Served from the shared hardware capability cache; refresh=True probes
+    again (e.g. the user clicked refresh).
+
     Returns:
         tuple: (is_available, status_message, gpu_name_or_reason)
             - is_available (bool): Whether CUDA is usable
@@ -48,51 +45,16 @@ def get_cuda_status():
     if _TEST_GPU_UNAVAILABLE:
         return (False, "GPU libraries not installed", None)
 
-    # Check if ctranslate2 supports CUDA compute types
-    cuda_supported = False
     try:
-        import ctranslate2
-        cuda_types = ctranslate2.get_supported_compute_types("cuda")
-        cuda_supported = len(cuda_types) > 0
-    except (ImportError, Exception):
-        pass
-
-    if not cuda_supported:
-        # Check if torch can detect CUDA
-        try:
-            import torch
-            if torch.cuda.is_available():
-                cuda_supported = True
-        except ImportError:
-            pass
-
-    if not cuda_supported:
+        caps = hardware_caps.get_capabilities(refresh=refresh)
+    except Exception:
         return (False, "GPU libraries not installed", None)
 
-    # CUDA is supported, try to get GPU name via torch
-    try:
-        import torch
-        if torch.cuda.is_available():
-            gpu_name = torch.cuda.get_device_name(0)
-            return (True, "CUDA Available", gpu_name)
-    except ImportError:
-        pass
-
-    # Fallback: try nvidia-smi to get GPU name
-    try:
-        import subprocess
-        result = subprocess.run(
-            ["nvidia-smi", "--query-gpu=name", "--format=csv,noheader,nounits"],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            gpu_name = result.stdout.strip().split('\n')[0]  # First GPU
-            return (True, "CUDA Available", gpu_name)
-    except (FileNotFoundError, subprocess.TimeoutExpired, Exception):
-        pass
-
-    # Last resort: ctranslate2 works but can't get GPU name
-    return (True, "CUDA Available", "via ctranslate2")
+    if not caps["cuda_compute_types"]:
+        return (False, "GPU libraries not installed", None)
+
+    # ctranslate2 works but nvidia-smi may not be able to name the GPU
+    return (True, "CUDA Available", caps["gpu_name"] or "via ctranslate2")
 
 
 # =============================================================================
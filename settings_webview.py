@@ -14,7 +14,11 @@ import urllib.error
 import sounddevice as sd
 import numpy as np
 
+import audio_capture
+import autotune
 import config
+import device_registry
+import inference_backend
 import settings_logic
 import ollama_manager
 
@@ -35,6 +39,8 @@ class SettingsAPI:
         # Audio test state
         self._audio_test_running = False
         self._audio_test_stream = None
+        # Device list is enumerated once; the Refresh button re-enumerates
+        self._devices = device_registry.DeviceRegistry()
 
     def set_window(self, window):
         """Store reference to window for evaluate_js calls."""
@@ -286,7 +292,7 @@ class SettingsAPI:
     def get_audio_devices(self):
         """Return list of available audio input devices."""
         try:
-            devices = config.get_input_devices()
+            devices = self._devices.get_input_devices()
             device_list = []
             for display_name, device_info in devices:
                 device_list.append({
@@ -300,6 +306,7 @@ class SettingsAPI:
 
     def refresh_audio_devices(self):
         """Refresh and return the audio device list."""
+        self._devices.invalidate("device list refreshed")
         return self.get_audio_devices()
 
     # =========================================================================
@@ -491,11 +498,16 @@ class SettingsAPI:
             print(f"Failed to export history: {e}")
             return {"success": False, "error": str(e)}
 
-    def get_gpu_status(self):
-        """Check if GPU/CUDA is available for processing."""
+    def get_gpu_status(self, refresh=False):
+        """
+        Check if GPU/CUDA is available for processing.
+
+        Args:
+            refresh: Probe the hardware again instead of using the cached result
+        """
         try:
             # Use settings_logic for consistent detection with Tkinter version
-            is_available, status_msg, gpu_name = settings_logic.get_cuda_status()
+            is_available, status_msg, gpu_name = settings_logic.get_cuda_status(refresh=bool(refresh))
             return {
                 "success": True,
                 "data": {
@@ -561,7 +573,7 @@ class SettingsAPI:
 
         try:
             self._audio_test_running = True
-            device_idx = config.get_device_index(self._config.get("input_device"))
+            device_idx = self._devices.resolve(self._config.get("input_device")).index
             sample_rate = self._config.get("sample_rate", 16000)
 
             def audio_callback(indata, frames, time_info, status):
@@ -590,6 +602,7 @@ class SettingsAPI:
             return {"success": True}
         except Exception as e:
             self._audio_test_running = False
+            self._devices.invalidate(f"stream open failed: {e}")
             return {"success": False, "error": str(e)}
 
     def stop_microphone_test(self):
@@ -604,6 +617,58 @@ class SettingsAPI:
             self._audio_test_stream = None
         return {"success": True}
 
+    def get_capture_diagnostics(self):
+        """
+        Return capture-path health published by the running app: block,
+        overflow and underflow counts, callback duration percentiles and
+        hotkey-to-first-block latency. data is None until a recording ends.
+        """
+        try:
+            return {"success": True, "data": audio_capture.load_diagnostics()}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    def run_cpu_autotune(self):
+        """
+        Calibrate CPU threading for the selected model in the background.
+        Progress is reported back to JavaScript via evaluate_js; the fastest
+        setting is saved to config, which makes the app reload its model.
+        """
+        def do_calibrate():
+            try:
+                from dependency_check import check_model_available
+
+                model_size = self._config.get("model_size", "tiny")
+                _, model_path = check_model_available(model_size)
+
+                def on_progress(done, total, candidate):
+                    percent = int(done / total * 100) if total else 100
+                    status = (f"Testing {candidate[0]} worker(s) x {candidate[1]} thread(s)..."
+                              if candidate else "Complete!")
+                    self._window.evaluate_js(f'window.onAutotuneProgress({percent}, "{status}")')
+
+                backend, backend_options = inference_backend.configured_backend(self._config)
+                report = autotune.run(model_size, model_path, on_progress=on_progress,
+                                      backend=backend, backend_options=backend_options)
+                autotune.save_report(report)
+                if autotune.apply_report(self._config, report):
+                    config.save_config(self._config)
+                self._window.evaluate_js(f'window.onAutotuneComplete({json.dumps(report)})')
+            except Exception as e:
+                error_msg = str(e).replace("'", "\\'").replace('"', '\\"')
+                self._window.evaluate_js(f'window.onAutotuneError("{error_msg}")')
+
+        thread = threading.Thread(target=do_calibrate, daemon=True)
+        thread.start()
+        return {"success": True, "message": "Calibration started"}
+
+    def get_cpu_autotune_report(self):
+        """Return the last CPU calibration report, or data None if never run."""
+        try:
+            return {"success": True, "data": autotune.load_report()}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
     # =========================================================================
     # License (Status Only - Key Stays in Python)
     # =========================================================================
@@ -0,0 +1,177 @@
+"""
+Streaming transcription for MurmurTone.
+
+Transcribes a recording while it is still being captured. A background
+worker watches the growing CaptureBuffer; whenever VAD finds a pause
+after speech, everything up to the middle of the pause is decoded once
+and committed (never revisited). Between pauses, the uncommitted tail is
+re-decoded periodically as a partial hypothesis for the preview.
+
+At stop only the audio after the last commit still needs decoding, so
+time-to-text after release depends on the length of the last phrase,
+not of the whole utterance.
+"""
+import logging
+import threading
+import time
+
+import vad
+
+log = logging.getLogger("murmurtone")
+
+
+# How often the worker checks the buffer for new audio (seconds)
+POLL_INTERVAL = 0.25
+
+# Minimum interval between partial (preview-only) decodes (seconds)
+PARTIAL_INTERVAL = 1.0
+
+# Uncommitted audio is force-committed past this length, keeping each
+# decode inside Whisper's 30 s window even without pauses
+MAX_SEGMENT_SECONDS = 25.0
+
+# Ignore uncommitted tails shorter than this for partial decodes
+MIN_PARTIAL_SECONDS = 0.5
+
+
+class StreamingTranscriber:
+    """
+    Incrementally transcribes one recording at pause boundaries.
+
+    Thread-safe: the worker owns decoding while running; finish() stops
+    it and decodes the remaining tail on the caller's thread.
+    """
+
+    def __init__(self, capture, transcribe, on_text=None,
+                 min_pause_ms=vad.DEFAULT_PAUSE_MS, padding_ms=vad.DEFAULT_PADDING_MS,
+                 vad_enabled=True):
+        """
+        Args:
+            capture: CaptureBuffer being recorded into
+            transcribe: callable(audio) -> text
+            on_text: Optional callable(text) with committed + partial text,
+                     called from the worker whenever it changes
+            min_pause_ms: Silence length that ends a committed segment
+            padding_ms: VAD padding kept around speech in each segment
+            vad_enabled: Skip decoding segments without speech
+        """
+        self.capture = capture
+        self._transcribe = transcribe
+        self._on_text = on_text
+        self.min_pause_ms = min_pause_ms
+        self.padding_ms = padding_ms
+        self.vad_enabled = vad_enabled
+        self._committed_samples = 0
+        self._committed_texts = []
+        self._partial = ""
+        self._partial_samples = 0
+        self._last_partial = 0.0
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def committed_samples(self):
+        """Samples already decoded and committed."""
+        return self._committed_samples
+
+    @property
+    def text(self):
+        """Committed text plus the current partial hypothesis."""
+        with self._lock:
+            return _join(self._committed_texts + [self._partial])
+
+    def start(self):
+        """Start the background worker."""
+        self._thread = threading.Thread(target=self._run, daemon=True, name="streaming-transcriber")
+        self._thread.start()
+
+    def cancel(self):
+        """Stop the worker without decoding the tail."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def finish(self):
+        """
+        Stop the worker and decode the remaining uncommitted audio.
+
+        Call after capture has stopped (no more writes).
+
+        Returns:
+            Full transcription, or None if no segment contained speech
+        """
+        self.cancel()
+        tail = self._decode(self.capture.view(self._committed_samples))
+        with self._lock:
+            texts = self._committed_texts + ([tail] if tail is not None else [])
+        spoken = [text for text in texts if text is not None]
+        if not spoken:
+            return None
+        return _join(spoken)
+
+    def _run(self):
+        while not self._stop.wait(POLL_INTERVAL):
+            try:
+                self._step()
+            except Exception as e:
+                # finish() decodes everything not yet committed, so nothing is lost
+                log.warning(f"Streaming transcription stopped: {e}")
+                return
+
+    def _step(self):
+        sample_rate = self.capture.sample_rate
+        start = self._committed_samples
+        end = len(self.capture)
+        region = self.capture.view(start, end)
+        if len(region) < MIN_PARTIAL_SECONDS * sample_rate:
+            return
+
+        cut = vad.find_pause(region, sample_rate, self.min_pause_ms)
+        if cut is None and len(region) > MAX_SEGMENT_SECONDS * sample_rate:
+            # No natural pause: cut at the latest non-speech frame, if any
+            cut = vad.find_pause(region, sample_rate, vad.FRAME_MS) or len(region)
+        if cut:
+            text = self._decode(region[:cut])
+            with self._lock:
+                self._committed_texts.append(text)
+                self._committed_samples = start + cut
+                self._partial = ""
+                self._partial_samples = 0
+            if text:
+                log.debug(f"Committed streaming segment ({cut / sample_rate:.1f}s): {text}")
+            self._publish()
+            return
+
+        # Partial hypothesis of the unfinished phrase (display only)
+        now = time.monotonic()
+        if now - self._last_partial < PARTIAL_INTERVAL or end == self._partial_samples:
+            return
+        self._last_partial = now
+        partial = self._decode(region) or ""
+        with self._lock:
+            self._partial = partial
+            self._partial_samples = end
+        self._publish()
+
+    def _decode(self, audio):
+        """Transcribe a segment; None if VAD finds no speech in it."""
+        if len(audio) == 0:
+            return None
+        if self.vad_enabled:
+            audio = vad.trim_silence(audio, self.capture.sample_rate, self.padding_ms)
+            if audio is None:
+                return None
+        return self._transcribe(audio)
+
+    def _publish(self):
+        if self._on_text is not None:
+            text = self.text
+            if text:
+                self._on_text(text)
+
+
+def _join(texts):
+    """Join segment texts with single spaces, skipping empty ones."""
+    return " ".join(text.strip() for text in texts if text and text.strip())
@@ -0,0 +1,522 @@
+"""Tests for audio_capture.py capture buffers."""
+import pytest
+import numpy as np
+import struct
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import audio_capture
+
+
+def make_block(frames, start=0.0):
+    """Build a (frames, 1) float32 block like sounddevice delivers."""
+    return (np.arange(frames, dtype=np.float32) + start).reshape(-1, 1)
+
+
+class TestCaptureBuffer:
+    """Tests for CaptureBuffer."""
+
+    def test_empty_buffer(self):
+        """New buffer should be empty."""
+        buffer = audio_capture.CaptureBuffer(sample_rate=16000)
+        assert len(buffer) == 0
+        assert buffer.view().size == 0
+        assert buffer.duration == 0
+
+    def test_write_and_view(self):
+        """Written blocks should be readable in order."""
+        buffer = audio_capture.CaptureBuffer(sample_rate=16000)
+        buffer.write(make_block(4, start=0))
+        buffer.write(make_block(4, start=4))
+        assert len(buffer) == 8
+        np.testing.assert_array_equal(buffer.view(), np.arange(8, dtype=np.float32))
+
+    def test_view_is_mono_float32(self):
+        """View should be 1-D float32 even for 2-D input blocks."""
+        buffer = audio_capture.CaptureBuffer(sample_rate=16000)
+        buffer.write(np.ones((10, 2), dtype=np.float32))
+        view = buffer.view()
+        assert view.ndim == 1
+        assert view.dtype == np.float32
+
+    def test_view_is_zero_copy(self):
+        """View should share memory with the backing array."""
+        buffer = audio_capture.CaptureBuffer(sample_rate=16000)
+        buffer.write(make_block(16))
+        view = buffer.view()
+
+        assert np.shares_memory(view, buffer._data)
+        buffer._data[0] = 0.5
+        assert view[0] == 0.5
+
+    def test_grows_past_initial_capacity(self):
+        """Buffer should grow and keep earlier samples."""
+        buffer = audio_capture.CaptureBuffer(sample_rate=10, initial_seconds=1)
+        assert buffer.capacity == 10
+        for i in range(5):
+            buffer.write(make_block(7, start=i * 7))
+        assert len(buffer) == 35
+        assert buffer.capacity >= 35
+        np.testing.assert_array_equal(buffer.view(), np.arange(35, dtype=np.float32))
+
+    def test_prepare_grows_ahead_of_writes(self):
+        """After prepare(), writes within the headroom reuse the same array."""
+        buffer = audio_capture.CaptureBuffer(sample_rate=10, initial_seconds=1)
+        buffer.write(make_block(8))
+        buffer.prepare(headroom_seconds=5)
+        data = buffer._data
+
+        buffer.write(make_block(40, start=8))
+
+        assert buffer._data is data
+        np.testing.assert_array_equal(buffer.view(), np.arange(48, dtype=np.float32))
+
+    def test_old_view_survives_growth(self):
+        """A view taken before growth should keep its samples."""
+        buffer = audio_capture.CaptureBuffer(sample_rate=4, initial_seconds=1)
+        buffer.write(make_block(4))
+        early = buffer.view()
+        buffer.write(make_block(100, start=4))
+        np.testing.assert_array_equal(early, np.arange(4, dtype=np.float32))
+
+    def test_view_range(self):
+        """view(start, end) should return the requested slice."""
+        buffer = audio_capture.CaptureBuffer(sample_rate=16000)
+        buffer.write(make_block(10))
+        np.testing.assert_array_equal(buffer.view(2, 5), [2, 3, 4])
+        assert len(buffer.view(5, 100)) == 5
+
+    def test_duration(self):
+        """Duration should be samples / sample_rate."""
+        buffer = audio_capture.CaptureBuffer(sample_rate=16000)
+        buffer.write(np.zeros((8000, 1), dtype=np.float32))
+        assert buffer.duration == pytest.approx(0.5)
+
+    def test_clear(self):
+        """clear() should reset length but keep capacity."""
+        buffer = audio_capture.CaptureBuffer(sample_rate=16000)
+        buffer.write(make_block(100))
+        capacity = buffer.capacity
+        buffer.clear()
+        assert len(buffer) == 0
+        assert buffer.capacity == capacity
+
+
+class TestCaptureBufferSpill:
+    """Tests for CaptureBuffer spilling long recordings to disk."""
+
+    def make_spilling(self, tmp_path):
+        """Buffer that spills after 1s of 1 kHz audio."""
+        return audio_capture.CaptureBuffer(sample_rate=1000, spill_after_seconds=1.0,
+                                           spill_dir=str(tmp_path))
+
+    def test_stays_in_ram_below_threshold(self, tmp_path):
+        """Short recordings should never touch the disk."""
+        buf = self.make_spilling(tmp_path)
+        buf.write(make_block(800))
+        assert not buf.spilled
+        assert list(tmp_path.iterdir()) == []
+
+    def test_spills_past_threshold(self, tmp_path):
+        """Exceeding the threshold should move samples to a spill file."""
+        buf = self.make_spilling(tmp_path)
+        for i in range(5):
+            buf.write(make_block(700, start=i * 700))
+        assert buf.spilled
+        assert os.path.exists(buf.spill_path)
+        assert len(buf) == 3500
+        np.testing.assert_array_equal(buf.view(), np.arange(3500, dtype=np.float32))
+        buf.discard()
+
+    def test_prepare_spills_ahead_of_writes(self, tmp_path, monkeypatch):
+        """prepare() creates and maps the spill file, so writes only copy."""
+        buf = self.make_spilling(tmp_path)
+        buf.write(make_block(800))
+        buf.prepare(headroom_seconds=0.5)
+        assert buf.spilled
+
+        added = []
+        monkeypatch.setattr(audio_capture.SpillFile, "_add_chunk", lambda spill: added.append(spill))
+        buf.write(make_block(400, start=800))
+
+        assert added == []
+        np.testing.assert_array_equal(buf.view(), np.arange(1200, dtype=np.float32))
+        buf.discard()
+
+    def test_view_range_while_recording(self, tmp_path):
+        """Ranges spanning file chunks should still be returned in order."""
+        buf = self.make_spilling(tmp_path)
+        for i in range(200):
+            buf.write(make_block(1000, start=i * 1000))
+        np.testing.assert_array_equal(buf.view(59990, 60010),
+                                      np.arange(59990, 60010, dtype=np.float32))
+        buf.discard()
+
+    def test_finish_maps_file(self, tmp_path):
+        """After finish(), view() should be a read-only memory-mapped array."""
+        buf = self.make_spilling(tmp_path)
+        buf.write(make_block(2500))
+        buf.finish()
+        audio = buf.view()
+        assert not audio.flags.writeable
+        np.testing.assert_array_equal(audio, np.arange(2500, dtype=np.float32))
+        expected_size = audio_capture.WAV_HEADER_BYTES + 2500 * 4
+        assert os.path.getsize(buf.spill_path) == expected_size
+        del audio
+        buf.discard()
+
+    def test_discard_deletes_file(self, tmp_path):
+        """discard() should remove the spill file."""
+        buf = self.make_spilling(tmp_path)
+        buf.write(make_block(2500))
+        path = buf.spill_path
+        buf.finish()
+        buf.discard()
+        assert not os.path.exists(path)
+        assert len(buf) == 0
+        assert not buf.spilled
+
+
+class TestRecoverSpillFiles:
+    """Tests for recover_spill_files."""
+
+    def test_recovers_unfinished_file(self, tmp_path):
+        """A spill file abandoned mid-recording should get a valid header."""
+        spill = audio_capture.SpillFile(str(tmp_path / "capture-test.wav"), 1000, chunk_seconds=1)
+        spill.append(np.arange(1, 1501, dtype=np.float32))
+        spill._release_chunk_maps()
+        spill._file.close()  # Simulate a crash: no finalize()
+
+        recovered = audio_capture.recover_spill_files(str(tmp_path))
+
+        assert recovered == [str(tmp_path / "recovered-test.wav")]
+        assert not (tmp_path / "capture-test.wav").exists()
+        data = (tmp_path / "recovered-test.wav").read_bytes()
+        header = data[:audio_capture.WAV_HEADER_BYTES]
+        assert struct.unpack_from("<I", header, 40)[0] == 1500 * 4
+        assert struct.unpack_from("<I", header, 24)[0] == 1000
+        samples = np.frombuffer(data, dtype=np.float32, offset=audio_capture.WAV_HEADER_BYTES)
+        np.testing.assert_array_equal(samples, np.arange(1, 1501, dtype=np.float32))
+
+    def test_ignores_other_files(self, tmp_path):
+        """Only capture-*.wav files should be touched."""
+        (tmp_path / "notes.txt").write_text("hello")
+        (tmp_path / "recovered-old.wav").write_bytes(b"x" * 100)
+        assert audio_capture.recover_spill_files(str(tmp_path)) == []
+        assert (tmp_path / "notes.txt").exists()
+
+    def test_missing_directory(self, tmp_path):
+        """A missing directory should recover nothing."""
+        assert audio_capture.recover_spill_files(str(tmp_path / "missing")) == []
+
+
+class TestPrerollRing:
+    """Tests for PrerollRing."""
+
+    def test_partial_fill(self):
+        """Snapshot before the ring fills should return what was written."""
+        ring = audio_capture.PrerollRing(10)
+        ring.write(make_block(4))
+        np.testing.assert_array_equal(ring.snapshot(), [0, 1, 2, 3])
+
+    def test_wraps_keeping_newest(self):
+        """Ring should keep the most recent samples, oldest first."""
+        ring = audio_capture.PrerollRing(5)
+        ring.write(make_block(4, start=0))
+        ring.write(make_block(4, start=4))
+        np.testing.assert_array_equal(ring.snapshot(), [3, 4, 5, 6, 7])
+
+    def test_block_larger_than_ring(self):
+        """A block bigger than the ring should keep its tail."""
+        ring = audio_capture.PrerollRing(3)
+        ring.write(make_block(10))
+        np.testing.assert_array_equal(ring.snapshot(), [7, 8, 9])
+
+    def test_clear(self):
+        """clear() should empty the ring."""
+        ring = audio_capture.PrerollRing(3)
+        ring.write(make_block(2))
+        ring.clear()
+        assert len(ring) == 0
+        assert ring.snapshot().size == 0
+
+
+class FakeStream:
+    """Stand-in for sd.InputStream that records stop/close calls."""
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.closed = False
+
+    def push(self, block):
+        self.callback(block, len(block), None, None)
+
+    def stop(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class TestWarmCapture:
+    """Tests for WarmCapture."""
+
+    def make_warm(self, **kwargs):
+        streams = []
+
+        def open_stream(callback):
+            streams.append(FakeStream(callback))
+            return streams[-1]
+
+        kwargs.setdefault("idle_timeout", 0)
+        warm = audio_capture.WarmCapture(open_stream, sample_rate=10, **kwargs)
+        return warm, streams
+
+    def test_attach_opens_stream(self):
+        """attach() should open the stream when it isn't warm yet."""
+        warm, streams = self.make_warm()
+        warm.attach(audio_capture.CaptureBuffer(10))
+        assert warm.is_open
+        assert len(streams) == 1
+
+    def test_attach_includes_preroll(self):
+        """Recording should start with audio from before attach()."""
+        warm, streams = self.make_warm(preroll_seconds=0.5)
+        warm.open()
+        streams[0].push(make_block(8, start=0))  # Ring keeps last 5
+
+        buffer = audio_capture.CaptureBuffer(10)
+        warm.attach(buffer)
+        streams[0].push(make_block(2, start=8))
+        np.testing.assert_array_equal(buffer.view(), [3, 4, 5, 6, 7, 8, 9])
+
+    def test_detach_stops_routing(self):
+        """Blocks after detach() should not reach the buffer."""
+        warm, streams = self.make_warm()
+        buffer = audio_capture.CaptureBuffer(10)
+        warm.attach(buffer)
+        streams[0].push(make_block(3))
+        assert warm.detach() is buffer
+        streams[0].push(make_block(3))
+        assert len(buffer) == 3
+        assert warm.is_open
+
+    def test_stream_reused_between_recordings(self):
+        """A second recording should not reopen the device."""
+        warm, streams = self.make_warm()
+        warm.attach(audio_capture.CaptureBuffer(10))
+        warm.detach()
+        warm.attach(audio_capture.CaptureBuffer(10))
+        assert len(streams) == 1
+
+    def test_on_block_reports_buffer_position(self):
+        """on_block should get where each block landed (None while idle)."""
+        seen = []
+        warm, streams = self.make_warm(on_block=lambda buffer, start, end, status: seen.append((buffer, start, end)))
+        warm.open()
+        streams[0].push(make_block(2))
+        buffer = audio_capture.CaptureBuffer(10)
+        warm.attach(buffer)  # Seeds 2 samples of pre-roll
+        streams[0].push(make_block(3))
+        assert seen == [(None, 0, 0), (buffer, 2, 5)]
+
+    def test_close(self):
+        """close() should close the stream."""
+        warm, streams = self.make_warm()
+        warm.open()
+        warm.close()
+        assert not warm.is_open
+        assert streams[0].closed
+
+    def test_idle_timeout_closes_stream(self):
+        """Stream should close after the idle timeout with nothing attached."""
+        import time
+        warm, streams = self.make_warm(idle_timeout=0.05)
+        warm.attach(audio_capture.CaptureBuffer(10))
+        warm.detach()
+        time.sleep(0.3)
+        assert not warm.is_open
+        assert streams[0].closed
+
+    def test_idle_timeout_ignored_while_attached(self):
+        """Stream should stay open while a recording is attached."""
+        import time
+        warm, streams = self.make_warm(idle_timeout=0.05)
+        warm.open()
+        warm.attach(audio_capture.CaptureBuffer(10))
+        time.sleep(0.3)
+        assert warm.is_open
+        warm.close()
+
+
+class FakeStatus:
+    """Stand-in for sd.CallbackFlags."""
+
+    def __init__(self, input_overflow=False, input_underflow=False):
+        self.input_overflow = input_overflow
+        self.input_underflow = input_underflow
+
+    def __bool__(self):
+        return self.input_overflow or self.input_underflow
+
+
+class TestCaptureStats:
+    """Tests for CaptureStats."""
+
+    def test_counts_blocks_and_flags(self):
+        """Each record() counts a block plus any xrun flags."""
+        stats = audio_capture.CaptureStats()
+        stats.record(None)
+        stats.record(FakeStatus(input_overflow=True))
+        stats.record(FakeStatus(input_underflow=True))
+        result = stats.as_dict()
+        assert result["blocks"] == 3
+        assert result["input_overflows"] == 1
+        assert result["input_underflows"] == 1
+
+    def test_reset(self):
+        """reset() should zero all counters and timings."""
+        stats = audio_capture.CaptureStats()
+        stats.record(FakeStatus(input_overflow=True))
+        stats.record_duration(0.001)
+        stats.reset()
+        result = stats.as_dict()
+        assert result["blocks"] == 0
+        assert result["input_overflows"] == 0
+        assert result["callback_p50_ms"] is None
+        assert result["callback_max_ms"] is None
+
+    def test_duration_percentiles(self):
+        """Percentiles should come from the histogram bucket edges."""
+        stats = audio_capture.CaptureStats()
+        for _ in range(98):
+            stats.record_duration(50e-6)
+        stats.record_duration(2e-3)
+        stats.record_duration(20e-3)
+
+        p50 = stats.duration_percentile(50)
+        assert 50e-6 <= p50 < 50e-6 * 1.2  # Within one quarter-octave bucket
+        assert 2e-3 <= stats.duration_percentile(99) < 2e-3 * 1.2
+        assert stats.duration_percentile(100) == pytest.approx(20e-3)
+        assert stats.as_dict()["callback_max_ms"] == pytest.approx(20.0)
+
+    def test_percentile_capped_at_max(self):
+        """A bucket edge above the slowest callback should report the max."""
+        stats = audio_capture.CaptureStats()
+        stats.record_duration(51e-6)
+        assert stats.duration_percentile(50) == pytest.approx(51e-6)
+
+    def test_huge_duration(self):
+        """Durations beyond the last bucket should still be counted."""
+        stats = audio_capture.CaptureStats()
+        stats.record_duration(2.0)
+        assert stats.duration_percentile(99) == pytest.approx(2.0)
+
+    def test_first_block_latency(self):
+        """Only the first block after the hotkey press should be measured."""
+        stats = audio_capture.CaptureStats()
+        stats.reset(started_at=10.0)
+        stats.record_first_block(now=10.25)
+        stats.record_first_block(now=11.0)
+        assert stats.as_dict()["first_block_ms"] == pytest.approx(250.0)
+
+    def test_first_block_without_start(self):
+        """Without a press time there is nothing to measure."""
+        stats = audio_capture.CaptureStats()
+        stats.record_first_block(now=5.0)
+        assert stats.as_dict()["first_block_ms"] is None
+
+
+class TestDiagnosticsFile:
+    """Tests for save_diagnostics/load_diagnostics."""
+
+    def test_round_trip(self, tmp_path, monkeypatch):
+        """Saved diagnostics should load back unchanged."""
+        monkeypatch.setenv("APPDATA", str(tmp_path))
+        data = {"last_recording": {"blocks": 5}, "session": {"recordings": 1}}
+        audio_capture.save_diagnostics(data)
+        assert audio_capture.load_diagnostics() == data
+        assert not os.path.exists(audio_capture.get_diagnostics_path() + ".tmp")
+
+    def test_missing_file(self, tmp_path, monkeypatch):
+        """No recording yet means no diagnostics."""
+        monkeypatch.setenv("APPDATA", str(tmp_path))
+        assert audio_capture.load_diagnostics() is None
+
+
+class TestSilenceDetector:
+    """Tests for SilenceDetector."""
+
+    def test_triggers_after_silence_duration(self):
+        """Should trigger once silence lasts silence_duration after speech."""
+        detector = audio_capture.SilenceDetector(silence_duration=1.0, margin_db=-20)
+        assert not detector.update(-20, 0.0)   # Speech
+        assert not detector.update(-45, 0.5)   # Silence starts
+        assert not detector.update(-45, 1.0)
+        assert detector.update(-45, 1.6)
+
+    def test_speech_resets_timer(self):
+        """Speech during the silence window should restart it."""
+        detector = audio_capture.SilenceDetector(silence_duration=1.0, margin_db=-20)
+        detector.update(-20, 0.0)
+        detector.update(-45, 0.5)
+        detector.update(-25, 1.2)  # Speech again
+        assert not detector.update(-45, 1.6)
+        assert detector.update(-45, 2.7)
+
+    def test_peak_ignores_ambient_noise(self):
+        """Sounds below -50 dB should not raise the adaptive peak."""
+        detector = audio_capture.SilenceDetector()
+        detector.update(-60, 0.0)
+        assert detector.peak_db == -100
+
+    def test_triggers_only_once(self):
+        """After triggering, the timer should restart."""
+        detector = audio_capture.SilenceDetector(silence_duration=0.5)
+        detector.update(-60, 0.0)
+        assert detector.update(-60, 0.6)
+        assert not detector.update(-60, 0.7)
+
+
+class TestBlockAnalyzer:
+    """Tests for BlockAnalyzer."""
+
+    def test_handler_runs_on_worker(self):
+        """Submitted blocks should reach the handler in order."""
+        import threading
+        seen = []
+        done = threading.Event()
+
+        def handler(buffer, start, end):
+            seen.append((start, end, threading.current_thread()))
+            if len(seen) == 2:
+                done.set()
+
+        analyzer = audio_capture.BlockAnalyzer(handler)
+        analyzer.start()
+        analyzer.submit(None, 0, 4)
+        analyzer.submit(None, 4, 8)
+        assert done.wait(timeout=2.0)
+        analyzer.stop()
+        assert [(s, e) for s, e, _ in seen] == [(0, 4), (4, 8)]
+        assert seen[0][2] is not threading.current_thread()
+
+    def test_handler_error_does_not_stop_worker(self):
+        """An exception in the handler should not kill the worker."""
+        import threading
+        done = threading.Event()
+
+        def handler(buffer, start, end):
+            if start == 0:
+                raise ValueError("bad block")
+            done.set()
+
+        analyzer = audio_capture.BlockAnalyzer(handler)
+        analyzer.start()
+        analyzer.submit(None, 0, 1)
+        analyzer.submit(None, 1, 2)
+        assert done.wait(timeout=2.0)
+        analyzer.stop()
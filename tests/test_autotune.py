@@ -0,0 +1,216 @@
+"""Tests for autotune.py CPU threading calibration."""
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+
+import autotune
+
+
+class FakeClock:
+    """perf_counter stand-in advanced by simulated decodes."""
+
+    def __init__(self):
+        self.t = 0.0
+
+    def now(self):
+        return self.t
+
+    def advance(self, seconds):
+        self.t += seconds
+
+
+class TestCandidates:
+    """Tests for candidate_settings."""
+
+    def test_many_cores(self):
+        """Eight cores: 1, 2 and 4 workers with full and half thread shares."""
+        assert autotune.candidate_settings(8) == [(1, 8), (1, 4), (2, 4), (2, 2), (4, 2), (4, 1)]
+
+    def test_few_cores(self):
+        """Two cores only try a single worker."""
+        assert autotune.candidate_settings(2) == [(1, 2), (1, 1)]
+
+    def test_single_core(self):
+        """One core has exactly one candidate."""
+        assert autotune.candidate_settings(1) == [(1, 1)]
+
+
+class TestCalibrationAudio:
+    """Tests for calibration_audio."""
+
+    def test_deterministic(self):
+        """The same seed gives the same clip."""
+        assert np.array_equal(autotune.calibration_audio(3, seed=5), autotune.calibration_audio(3, seed=5))
+
+    def test_speech_like_spectrum(self):
+        """Energy is spread over harmonics and formants, not a single tone."""
+        audio = autotune.calibration_audio(5, seed=1)
+        spectrum = np.abs(np.fft.rfft(audio)) ** 2
+        freqs = np.fft.rfftfreq(len(audio), 1 / autotune.SAMPLE_RATE)
+
+        assert len(audio) == 5 * autotune.SAMPLE_RATE
+        assert spectrum[freqs > 1000].sum() / spectrum.sum() > 0.02
+        assert spectrum.max() / spectrum.sum() < 0.05
+
+
+class TestCalibrate:
+    """Tests for calibrate and run."""
+
+    def test_fastest_first(self, monkeypatch):
+        """Results are sorted by measured time."""
+        costs = {(1, 4): 0.3, (2, 2): 0.1}
+        clock = FakeClock()
+        monkeypatch.setattr(autotune.time, "perf_counter", clock.now)
+
+        def load(workers, threads):
+            def transcribe(audio):
+                clock.advance(costs[(workers, threads)])
+                return "text"
+            return transcribe
+
+        results = autotune.calibrate(load, candidates=[(1, 4), (2, 2)])
+
+        assert [(r["num_workers"], r["cpu_threads"]) for r in results] == [(2, 2), (1, 4)]
+        assert results[0]["score_s"] < results[1]["score_s"]
+
+    def test_failed_candidate_last(self):
+        """A candidate that can't load is reported, not fatal."""
+        def load(workers, threads):
+            if workers == 2:
+                raise RuntimeError("out of memory")
+            return lambda audio: "text"
+
+        results = autotune.calibrate(load, candidates=[(2, 2), (1, 4)])
+
+        assert results[0]["num_workers"] == 1
+        assert "error" in results[1]
+
+    def test_progress_reported(self):
+        """on_progress sees every candidate and a final call."""
+        seen = []
+        autotune.calibrate(lambda w, t: (lambda audio: "text"), candidates=[(1, 2), (1, 1)],
+                           on_progress=lambda done, total, cand: seen.append((done, total, cand)))
+        assert seen == [(0, 2, (1, 2)), (1, 2, (1, 1)), (2, 2, None)]
+
+    def test_run_builds_report(self):
+        """run() names the best setting."""
+        report = autotune.run("tiny", load=lambda w, t: (lambda audio: "text"))
+
+        assert report["model"] == "tiny"
+        assert report["best"] is report["results"][0]
+        assert len(report["results"]) == len(autotune.candidate_settings())
+
+    def test_candidate_models_unloaded(self):
+        """Each candidate's model is unloaded before the next one loads."""
+        events = []
+
+        def load(workers, threads):
+            events.append(("load", workers))
+
+            def transcribe(audio):
+                return "text"
+
+            transcribe.unload = lambda: events.append(("unload", workers))
+            return transcribe
+
+        autotune.calibrate(load, candidates=[(1, 4), (2, 2)])
+
+        assert events == [("load", 1), ("unload", 1), ("load", 2), ("unload", 2)]
+
+    def test_run_uses_configured_backend(self):
+        """The default loader goes through inference_backend, so "fake" loads no model files."""
+        report = autotune.run("large-v3", backend="fake", backend_options={"text": "ok"})
+
+        assert report["best"] is not None
+        assert "error" not in report["results"][-1]
+
+    def test_should_stop_ends_early(self):
+        """A dictation starting mid-calibration stops it without a report."""
+        loads = []
+
+        def load(workers, threads):
+            loads.append(workers)
+            return lambda audio: "text"
+
+        results = autotune.calibrate(load, candidates=[(1, 4), (2, 2)], should_stop=lambda: len(loads) >= 1)
+
+        assert results is None
+        assert loads == [1]
+        assert autotune.run("tiny", load=load, should_stop=lambda: True) is None
+
+    def test_stop_between_clips_unloads_candidate(self):
+        """A dictation starting between the short and long clip abandons the candidate."""
+        calls = []
+        unloaded = []
+
+        def load(workers, threads):
+            def transcribe(audio):
+                calls.append(len(audio))
+                return "text"
+
+            transcribe.unload = lambda: unloaded.append(workers)
+            return transcribe
+
+        # Warm-up and short clip run, then the dictation starts
+        results = autotune.calibrate(load, candidates=[(1, 4), (2, 2)], should_stop=lambda: len(calls) >= 2)
+
+        assert results is None
+        assert len(calls) == 2
+        assert unloaded == [1]
+
+    def test_stop_between_segments(self):
+        """The default loader stops a long decode after the current segment."""
+        checks = []
+
+        def should_stop():
+            checks.append(True)
+            return True
+
+        load = autotune.backend_loader(None, backend="fake", options={"segment_seconds": 1.0},
+                                       should_stop=should_stop)
+
+        with pytest.raises(autotune.CalibrationStopped):
+            load(1, 1)(np.zeros(5 * autotune.SAMPLE_RATE, dtype=np.float32))
+        assert len(checks) == 1
+
+    def test_run_all_failed(self):
+        """With no working candidate there is no best."""
+        def load(workers, threads):
+            raise RuntimeError("no model")
+
+        assert autotune.run("tiny", load=load)["best"] is None
+
+
+class TestApplyReport:
+    """Tests for apply_report and report persistence."""
+
+    def test_applies_best(self):
+        """The winner is stored as decode_concurrency/cpu_threads."""
+        cfg = {}
+        report = {"model": "small", "best": {"num_workers": 2, "cpu_threads": 6}}
+
+        assert autotune.apply_report(cfg, report)
+        assert cfg == {"decode_concurrency": 2, "cpu_threads": 6, "cpu_autotune_model": "small"}
+
+    def test_no_best_leaves_config(self):
+        """A failed calibration changes nothing."""
+        cfg = {"cpu_threads": 0}
+        assert not autotune.apply_report(cfg, {"model": "small", "best": None})
+        assert cfg == {"cpu_threads": 0}
+
+    def test_save_and_load(self, tmp_path, monkeypatch):
+        """Reports round-trip through cpu_autotune.json."""
+        monkeypatch.setenv("APPDATA", str(tmp_path))
+        report = {"model": "tiny", "best": {"num_workers": 1, "cpu_threads": 4}}
+
+        assert autotune.load_report() is None
+        autotune.save_report(report)
+
+        assert autotune.load_report() == report
+        assert os.path.exists(tmp_path / "MurmurTone" / "cpu_autotune.json")
+
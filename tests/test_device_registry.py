@@ -0,0 +1,122 @@
+"""Tests for device_registry.py cached device resolution."""
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import device_registry
+
+
+@pytest.fixture
+def enumeration(mocker):
+    """Patch PortAudio enumeration and return the mocks."""
+    get_devices = mocker.patch('config.get_input_devices', return_value=[
+        ("System Default (Mic)", None),
+        ("Blue Yeti", {"name": "Blue Yeti", "index": 3}),
+    ])
+    get_index = mocker.patch('config.get_device_index',
+                             side_effect=lambda saved: 3 if saved else None)
+    mock_sd = mocker.patch('device_registry.sd')
+    mock_sd.query_devices.return_value = {"default_samplerate": 48000.0, "max_input_channels": 2}
+    return get_devices, get_index, mock_sd
+
+
+class TestDeviceKey:
+    """Tests for device_key."""
+
+    def test_formats(self):
+        """Saved device formats should map to the device name."""
+        assert device_registry.device_key(None) is None
+        assert device_registry.device_key("") is None
+        assert device_registry.device_key("Blue Yeti") == "Blue Yeti"
+        assert device_registry.device_key({"name": "Blue Yeti"}) == "Blue Yeti"
+        assert device_registry.device_key({"name": ""}) is None
+
+
+class TestDeviceRegistry:
+    """Tests for DeviceRegistry."""
+
+    def test_device_list_enumerated_once(self, enumeration):
+        """Repeated list requests should reuse the first enumeration."""
+        get_devices, _, _ = enumeration
+        registry = device_registry.DeviceRegistry()
+
+        first = registry.get_input_devices()
+        second = registry.get_input_devices()
+
+        assert first == second
+        assert len(first) == 2
+        get_devices.assert_called_once()
+
+    def test_resolve_cached(self, enumeration):
+        """Repeated resolves of the same device should skip enumeration."""
+        _, get_index, mock_sd = enumeration
+        registry = device_registry.DeviceRegistry()
+
+        for _ in range(5):
+            device = registry.resolve({"name": "Blue Yeti"})
+
+        assert device.index == 3
+        assert device.name == "Blue Yeti"
+        assert device.native_rate == 48000
+        assert device.channels == 2
+        get_index.assert_called_once()
+        mock_sd.query_devices.assert_called_once_with(3)
+
+    def test_legacy_string_shares_cache(self, enumeration):
+        """A legacy string and a dict with the same name are the same device."""
+        _, get_index, _ = enumeration
+        registry = device_registry.DeviceRegistry()
+
+        registry.resolve("Blue Yeti")
+        registry.resolve({"name": "Blue Yeti"})
+
+        get_index.assert_called_once()
+
+    def test_system_default_rate(self, enumeration):
+        """System default should query the default input device's rate."""
+        _, _, mock_sd = enumeration
+        device = device_registry.DeviceRegistry().resolve(None)
+
+        assert device.index is None
+        assert device.native_rate == 48000
+        mock_sd.query_devices.assert_called_once_with(None, kind="input")
+
+    def test_unknown_rate(self, enumeration):
+        """A failing rate query should leave native_rate as None."""
+        _, _, mock_sd = enumeration
+        mock_sd.query_devices.side_effect = Exception("PortAudio error")
+
+        device = device_registry.DeviceRegistry().resolve("Blue Yeti")
+
+        assert device.index == 3
+        assert device.native_rate is None
+        assert device.channels is None
+
+    def test_missing_device_not_cached(self, enumeration):
+        """A disconnected device should be looked up again next time."""
+        _, get_index, _ = enumeration
+        get_index.side_effect = lambda saved: None
+        registry = device_registry.DeviceRegistry()
+
+        assert registry.resolve("Blue Yeti").index is None
+        get_index.side_effect = lambda saved: 5
+        assert registry.resolve("Blue Yeti").index == 5
+        assert get_index.call_count == 2
+
+    def test_invalidate(self, enumeration):
+        """invalidate() should force re-enumeration of list and devices."""
+        get_devices, get_index, _ = enumeration
+        registry = device_registry.DeviceRegistry()
+        registry.get_input_devices()
+        registry.resolve("Blue Yeti")
+
+        registry.invalidate("test")
+        registry.get_input_devices()
+        registry.resolve("Blue Yeti")
+
+        assert get_devices.call_count == 2
+        assert get_index.call_count == 2
+        assert registry.generation == 1
@@ -0,0 +1,115 @@
+"""Tests for dictation_pipeline.py staged workers."""
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dictation_pipeline import StagedPipeline
+
+
+def make_pipeline(transcribe, output, queue_size=2):
+    pipeline = StagedPipeline([
+        ("transcribe", transcribe),
+        ("process", lambda item: item),
+        ("output", output),
+    ], queue_size=queue_size)
+    pipeline.start()
+    return pipeline
+
+
+class TestStagedPipeline:
+    """Tests for StagedPipeline."""
+
+    def test_outputs_in_submission_order(self):
+        """Items come out in order even when their decode times differ."""
+        out = []
+        pipeline = make_pipeline(lambda n: (time.sleep(0.01 * (5 - n)), n)[1], out.append)
+
+        for n in range(5):
+            pipeline.submit(n)
+        assert pipeline.wait_idle(5)
+
+        assert out == [0, 1, 2, 3, 4]
+        pipeline.stop(5)
+
+    def test_next_item_decodes_while_previous_outputs(self):
+        """Stage 1 works on item N+1 while the output stage is busy with N."""
+        decoding_second = threading.Event()
+        out = []
+
+        def transcribe(n):
+            if n == 1:
+                decoding_second.set()
+            return n
+
+        def output(n):
+            if n == 0:
+                # Still typing item 0 when item 1 starts decoding
+                assert decoding_second.wait(5)
+            out.append(n)
+
+        pipeline = make_pipeline(transcribe, output)
+        pipeline.submit(0)
+        pipeline.submit(1)
+        assert pipeline.wait_idle(5)
+
+        assert out == [0, 1]
+        pipeline.stop(5)
+
+    def test_none_drops_item(self):
+        """A stage returning None ends that item without blocking others."""
+        out = []
+        pipeline = make_pipeline(lambda n: None if n % 2 else n, out.append)
+
+        for n in range(4):
+            pipeline.submit(n)
+        assert pipeline.wait_idle(5)
+
+        assert out == [0, 2]
+        assert pipeline.pending == 0
+        pipeline.stop(5)
+
+    def test_errors_drop_only_that_item(self):
+        """An exception in a stage doesn't stall the pipeline."""
+        out = []
+
+        def transcribe(n):
+            if n == 1:
+                raise RuntimeError("decode failed")
+            return n
+
+        pipeline = make_pipeline(transcribe, out.append)
+        for n in range(3):
+            pipeline.submit(n)
+        assert pipeline.wait_idle(5)
+
+        assert out == [0, 2]
+        pipeline.stop(5)
+
+    def test_backpressure_blocks_submit(self):
+        """submit() times out while a stalled pipeline is full."""
+        gate = threading.Event()
+        pipeline = make_pipeline(lambda n: n, lambda n: gate.wait(), queue_size=1)
+
+        accepted = [pipeline.submit(n, timeout=0.2) for n in range(8)]
+
+        assert accepted[0] is True
+        assert accepted[-1] is False
+        assert pipeline.pending == accepted.count(True)
+        gate.set()
+        assert pipeline.wait_idle(5)
+        pipeline.stop(5)
+
+    def test_stop_drains_queue(self):
+        """stop() finishes queued items before the workers exit."""
+        out = []
+        pipeline = make_pipeline(lambda n: n, out.append)
+        for n in range(3):
+            pipeline.submit(n)
+
+        pipeline.stop(5)
+
+        assert out == [0, 1, 2]
@@ -0,0 +1,138 @@
+"""Tests for dictation_stages.py driven headlessly with the fake backend."""
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import audio_capture
+import dictation_pipeline
+import dictation_stages
+import inference_backend
+import text_processor
+
+SAMPLE_RATE = 16000
+
+
+class RecordingKeyboard:
+    """Keyboard stand-in that records what would have been typed."""
+
+    def __init__(self):
+        self.events = []
+
+    def press(self, key):
+        self.events.append(("press", key))
+
+    def release(self, key):
+        self.events.append(("release", key))
+
+    def type(self, text):
+        self.events.append(("type", text))
+
+    def typed(self):
+        return "".join(arg for event, arg in self.events if event == "type")
+
+
+class FakeClipboard:
+    """clipboard_utils stand-in."""
+
+    def __init__(self, saved="old"):
+        self.text = saved
+
+    def save_clipboard(self):
+        return self.text
+
+    def set_text(self, text):
+        self.text = text
+        return True
+
+    def restore_clipboard(self, saved):
+        self.text = saved
+
+
+def speech(seconds=1.0):
+    """A tone burst VAD keeps as speech, with silent edges."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    silence = np.zeros(SAMPLE_RATE // 2, dtype=np.float32)
+    return np.concatenate([silence, (0.3 * np.sin(2 * np.pi * 200 * t)).astype(np.float32), silence])
+
+
+def record(audio):
+    capture = audio_capture.CaptureBuffer(SAMPLE_RATE)
+    capture.write(audio)
+    return capture
+
+
+def run(texts, audio=None, **overrides):
+    """Run one dictation per text through the real stages; return (keyboard, stages)."""
+    app_config = {"paste_mode": "direct", "direct_typing_delay_ms": 0, "preview_enabled": False}
+    app_config.update(overrides)
+    pipeline_text = text_processor.TextPipeline(app_config)
+    backend = inference_backend.create_backend("fake", None, text=lambda audio, params: texts.pop(0))
+    keyboard = RecordingKeyboard()
+    stages = dictation_stages.DictationStages(
+        get_config=lambda: app_config,
+        get_text_pipeline=lambda: pipeline_text,
+        transcribe=lambda audio, params: dictation_stages.decode_audio(backend, audio, params),
+        keyboard=keyboard,
+        history=text_processor.TranscriptionHistory(persist=False),
+        clipboard=FakeClipboard(),
+    )
+    pipeline = dictation_pipeline.StagedPipeline(stages.stages())
+    pipeline.start()
+    for _ in range(len(texts)):
+        pipeline.submit(dictation_stages.Dictation(record(speech() if audio is None else audio),
+                                                   None, {"language": "en"}, "", None))
+    assert pipeline.wait_idle(10)
+    pipeline.stop(5)
+    return keyboard, stages
+
+
+class TestDictationStages:
+    """End-to-end runs of capture -> VAD -> transcribe -> process -> output."""
+
+    def test_types_processed_text(self):
+        """Decoded text goes through the text pipeline and is typed with a trailing space."""
+        keyboard, stages = run(["um hello world period"], filler_removal_enabled=True,
+                               voice_commands_enabled=True)
+
+        assert keyboard.typed() == "hello world. "
+        assert stages.history.entries[-1]["text"] == "hello world. "
+
+    def test_silence_skips_model(self):
+        """VAD drops a silent recording before it reaches the backend."""
+        texts = ["should not be decoded"]
+        keyboard, _ = run(texts, audio=np.zeros(SAMPLE_RATE, dtype=np.float32))
+
+        assert keyboard.events == []
+        assert texts == ["should not be decoded"]
+
+    def test_scratch_that_erases_previous(self):
+        """Saying "scratch that" backspaces the previous dictation."""
+        keyboard, stages = run(["first words", "scratch that"])
+
+        backspaces = [event for event in keyboard.events if event == ("press", "backspace")]
+        assert len(backspaces) == len("first words ")
+        assert stages.history.entries == []
+
+    def test_clipboard_mode_pastes_and_restores(self):
+        """Clipboard mode pastes with ctrl+v through the injected clipboard."""
+        keyboard, stages = run(["pasted text"], paste_mode="clipboard")
+
+        assert ("press", "ctrl_l") in keyboard.events
+        assert ("press", "v") in keyboard.events
+        assert stages._clipboard.text == "old"
+
+
+class TestFilterPromptHallucination:
+    """Tests for filter_prompt_hallucination."""
+
+    def test_prompt_echo_filtered(self):
+        """Distinctive prompt words in the output mark it as a hallucination."""
+        assert dictation_stages.filter_prompt_hallucination("Use proper punctuation.", "Use punctuation.") == ""
+
+    def test_normal_text_kept(self):
+        """Ordinary dictation passes through."""
+        assert dictation_stages.filter_prompt_hallucination("Hello there", "Use punctuation.") == "Hello there"
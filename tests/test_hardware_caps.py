@@ -0,0 +1,141 @@
+"""Tests for hardware_caps.py capability cache."""
+import sys
+import os
+import json
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hardware_caps
+
+
+FAKE_CAPS = {
+    "cpu_flags": ["avx2"],
+    "cpu_compute_types": ["float32", "int8"],
+    "cuda_compute_types": [],
+    "cuda_device_count": 0,
+    "cuda_runtime_ok": False,
+    "cuda_available": False,
+    "gpu_name": None,
+    "gpu_dlls_missing": [],
+}
+
+
+@pytest.fixture
+def isolated(tmp_path, monkeypatch):
+    """Cache file in a temp APPDATA, empty memory cache, counted probes."""
+    monkeypatch.setenv("APPDATA", str(tmp_path))
+    monkeypatch.setattr(hardware_caps, "_memory_cache", {})
+    probes = []
+
+    def fake_probe(install_dir=None):
+        probes.append(install_dir)
+        return dict(FAKE_CAPS)
+
+    monkeypatch.setattr(hardware_caps, "probe", fake_probe)
+    return tmp_path, probes
+
+
+class TestFingerprint:
+    """Tests for fingerprint."""
+
+    def test_stable(self, tmp_path):
+        """Same install, same fingerprint."""
+        assert hardware_caps.fingerprint(str(tmp_path)) == hardware_caps.fingerprint(str(tmp_path))
+
+    def test_changes_when_gpu_dll_installed(self, tmp_path):
+        """Installing GPU libraries invalidates the cached answer."""
+        before = hardware_caps.fingerprint(str(tmp_path))
+        (tmp_path / hardware_caps.GPU_REQUIRED_DLLS[0]).write_bytes(b"dll")
+
+        assert hardware_caps.fingerprint(str(tmp_path)) != before
+
+
+class TestGetCapabilities:
+    """Tests for get_capabilities caching."""
+
+    def test_probes_once_per_process(self, isolated):
+        """Repeated calls reuse the in-memory result."""
+        tmp_path, probes = isolated
+        install = str(tmp_path)
+
+        first = hardware_caps.get_capabilities(install_dir=install)
+        second = hardware_caps.get_capabilities(install_dir=install)
+
+        assert first == FAKE_CAPS
+        assert second is first
+        assert len(probes) == 1
+
+    def test_reuses_file_across_processes(self, isolated, monkeypatch):
+        """A new process with the same fingerprint reads hardware_caps.json."""
+        tmp_path, probes = isolated
+        install = str(tmp_path)
+        hardware_caps.get_capabilities(install_dir=install)
+
+        monkeypatch.setattr(hardware_caps, "_memory_cache", {})
+        assert hardware_caps.get_capabilities(install_dir=install) == FAKE_CAPS
+        assert len(probes) == 1
+
+        with open(tmp_path / "MurmurTone" / "hardware_caps.json") as f:
+            assert json.load(f)["fingerprint"] == hardware_caps.fingerprint(install)
+
+    def test_reprobes_on_new_fingerprint(self, isolated):
+        """A driver/library change triggers a new probe."""
+        tmp_path, probes = isolated
+        install = str(tmp_path)
+        hardware_caps.get_capabilities(install_dir=install)
+
+        (tmp_path / hardware_caps.GPU_REQUIRED_DLLS[0]).write_bytes(b"dll")
+        hardware_caps.get_capabilities(install_dir=install)
+
+        assert len(probes) == 2
+
+    def test_refresh_forces_probe(self, isolated):
+        """refresh=True ignores the cache."""
+        tmp_path, probes = isolated
+        hardware_caps.get_capabilities(install_dir=str(tmp_path))
+        hardware_caps.get_capabilities(refresh=True, install_dir=str(tmp_path))
+
+        assert len(probes) == 2
+
+
+class TestProbe:
+    """Tests for probe."""
+
+    def test_reports_missing_gpu_dlls(self, tmp_path):
+        """DLLs absent from the install dir are listed."""
+        (tmp_path / "cublas64_12.dll").write_bytes(b"dll")
+
+        caps = hardware_caps.probe(str(tmp_path))
+
+        assert "cublas64_12.dll" not in caps["gpu_dlls_missing"]
+        assert "cudnn64_9.dll" in caps["gpu_dlls_missing"]
+
+    def test_cuda_unavailable_without_cuda_types(self, tmp_path, monkeypatch):
+        """No CUDA compute types means no CUDA, whatever else is present."""
+        fake_ct2 = type(sys)("ctranslate2")
+        fake_ct2.get_supported_compute_types = lambda device: {"int8", "float32"} if device == "cpu" else set()
+        fake_ct2.get_cuda_device_count = lambda: 0
+        monkeypatch.setitem(sys.modules, "ctranslate2", fake_ct2)
+
+        caps = hardware_caps.probe(str(tmp_path))
+
+        assert caps["cpu_compute_types"] == ["float32", "int8"]
+        assert caps["cuda_available"] is False
+
+
+class TestCpuComputeType:
+    """Tests for cpu_compute_type."""
+
+    def test_int8_when_supported(self):
+        """int8 is used where the CPU supports it."""
+        assert hardware_caps.cpu_compute_type({"cpu_compute_types": ["float32", "int8"]}) == "int8"
+
+    def test_float32_without_int8(self):
+        """CPUs without int8 support fall back to float32."""
+        assert hardware_caps.cpu_compute_type({"cpu_compute_types": ["float32"]}) == "float32"
+
+    def test_int8_when_unknown(self):
+        """An empty probe (ctranslate2 missing) keeps the int8 default."""
+        assert hardware_caps.cpu_compute_type({"cpu_compute_types": []}) == "int8"
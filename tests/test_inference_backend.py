@@ -0,0 +1,99 @@
+"""Tests for inference_backend.py backends."""
+import sys
+import os
+import time
+import wave
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import file_transcription
+import inference_backend
+from inference_backend import FakeBackend
+
+
+class TestFakeBackend:
+    """Tests for FakeBackend."""
+
+    def test_transcribe_shape(self):
+        """Returns lazy segments plus info, like faster-whisper."""
+        backend = FakeBackend(text="hello", segment_seconds=2.0).load()
+        segments, info = backend.transcribe(np.zeros(16000 * 5, dtype=np.float32), language="de")
+
+        segments = list(segments)
+        assert [s.text for s in segments] == ["hello"] * 3
+        assert segments[-1].end == pytest.approx(5.0)
+        assert info.language == "de"
+        assert info.duration == pytest.approx(5.0)
+
+    def test_decode_cost_paid_while_consuming(self):
+        """Latency is spent in the segment iterator, not in transcribe()."""
+        backend = FakeBackend(latency_s=0.05, realtime_factor=0.1).load()
+
+        start = time.perf_counter()
+        segments, _ = backend.transcribe(np.zeros(16000, dtype=np.float32))
+        assert time.perf_counter() - start < 0.05
+
+        list(segments)
+        assert time.perf_counter() - start >= 0.14
+
+    def test_text_callable(self):
+        """Output can depend on the input and params."""
+        backend = FakeBackend(text=lambda audio, params: params["task"])
+        segments, _ = backend.transcribe(np.zeros(160, dtype=np.float32), task="translate")
+        assert [s.text for s in segments] == ["translate"]
+
+    def test_wav_file_duration(self, tmp_path):
+        """File inputs are timed by their real length when they are WAV."""
+        path = tmp_path / "clip.wav"
+        with wave.open(str(path), "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(16000)
+            f.writeframes(b"\0\0" * 16000 * 3)
+
+        _, info = FakeBackend().transcribe(str(path))
+        assert info.duration == pytest.approx(3.0)
+
+    def test_warm_up_and_unload(self):
+        """warm_up() returns timings; unload() marks it unloaded."""
+        backend = inference_backend.create_backend("fake", None)
+        cold, warm = backend.warm_up(workers=2)
+
+        assert cold >= 0 and warm >= 0
+        assert backend.calls == 4  # cold + one per worker + warm
+        backend.unload()
+        assert not backend.loaded
+
+
+class TestCreateBackend:
+    """Tests for create_backend."""
+
+    def test_unknown_backend(self):
+        """An unknown name is an error."""
+        with pytest.raises(ValueError):
+            inference_backend.create_backend("nope", None)
+
+    def test_ignores_device_options(self):
+        """The fake backend accepts the real backend's options."""
+        backend = inference_backend.create_backend("fake", "small", device="cpu", compute_type="int8",
+                                                   num_workers=2, cpu_threads=4, text="ok")
+        assert backend.loaded
+        assert backend.model_path == "small"
+
+
+class TestFilePipeline:
+    """File transcription end to end with the fake backend."""
+
+    def test_text_processing_applied(self, tmp_path):
+        """Fillers and voice commands are processed like live dictation."""
+        audio_file = tmp_path / "meeting.mp3"
+        audio_file.write_bytes(b"dummy")
+        backend = FakeBackend(text="um hello world period")
+
+        text, success = file_transcription.transcribe_file(str(audio_file), backend, {"language": "en"})
+
+        assert success
+        assert text == "hello world."
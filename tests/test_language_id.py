@@ -0,0 +1,114 @@
+"""Tests for language_id.py language detection cache."""
+import sys
+import os
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import language_id
+from language_id import LanguageCache
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.t = 1000.0
+
+    def __call__(self):
+        return self.t
+
+
+class TestDetect:
+    """Tests for detect and whisper_detector."""
+
+    def test_uses_only_first_seconds(self):
+        """Detection sees at most DETECT_SECONDS of audio."""
+        seen = []
+        audio = np.zeros(16000 * 20, dtype=np.float32)
+
+        result = language_id.detect(lambda clip: seen.append(len(clip)) or ("de", 0.9), audio, 16000)
+
+        assert result == ("de", 0.9)
+        assert seen == [int(language_id.DETECT_SECONDS * 16000)]
+
+    def test_whisper_detector_reads_info(self):
+        """The language comes from transcribe() info without consuming segments."""
+        class Info:
+            language = "fr"
+            language_probability = 0.97
+
+        class Model:
+            def __init__(self):
+                self.kwargs = None
+
+            def transcribe(self, audio, **kwargs):
+                self.kwargs = kwargs
+
+                def segments():
+                    raise AssertionError("segments must not be decoded")
+                    yield
+
+                return segments(), Info()
+
+        model = Model()
+        assert language_id.whisper_detector(model)(np.zeros(100, dtype=np.float32)) == ("fr", 0.97)
+        assert model.kwargs["language"] is None
+
+
+class TestLanguageCache:
+    """Tests for LanguageCache."""
+
+    def test_empty_cache(self):
+        """Nothing is cached before the first detection."""
+        assert LanguageCache().get() is None
+
+    def test_confident_detection_cached(self):
+        """A confident detection is reused."""
+        cache = LanguageCache(threshold=0.8)
+        assert cache.update("es", 0.95)
+        assert cache.get() == "es"
+
+    def test_low_confidence_not_cached(self):
+        """A marginal detection is neither used nor cached."""
+        cache = LanguageCache(threshold=0.8)
+        assert not cache.update("es", 0.6)
+        assert cache.get() is None
+
+    def test_confidence_decays(self):
+        """After enough half-lives the language is detected again."""
+        clock = FakeClock()
+        cache = LanguageCache(threshold=0.8, half_life=600, clock=clock)
+        cache.update("en", 1.0)
+
+        clock.t += 100
+        assert cache.get() == "en"
+        clock.t += 600  # 1.0 * 0.5 ** (700 / 600) < 0.8
+        assert cache.get() is None
+
+    def test_redetection_refreshes(self):
+        """A new detection restarts the decay."""
+        clock = FakeClock()
+        cache = LanguageCache(threshold=0.8, half_life=600, clock=clock)
+        cache.update("en", 1.0)
+        clock.t += 1000
+        cache.update("en", 0.99)
+
+        assert cache.get() == "en"
+        assert cache.confidence() == 0.99
+
+    def test_no_decay(self):
+        """half_life <= 0 keeps the language for the whole session."""
+        clock = FakeClock()
+        cache = LanguageCache(threshold=0.8, half_life=0, clock=clock)
+        cache.update("ja", 0.9)
+        clock.t += 10 ** 6
+        assert cache.get() == "ja"
+
+    def test_clear(self):
+        """clear() forgets the language."""
+        cache = LanguageCache()
+        cache.update("en", 1.0)
+        cache.clear()
+        assert cache.get() is None
@@ -0,0 +1,197 @@
+"""Tests for model_pool.py resident model cache."""
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import model_pool
+from model_pool import ModelKey, ModelPool
+
+
+def sized(mb_by_size):
+    """Estimate function with a fixed MB per model size."""
+    return lambda key: mb_by_size[key.size]
+
+
+TINY = ModelKey("tiny", "cpu", "int8")
+SMALL = ModelKey("small", "cpu", "int8")
+MEDIUM = ModelKey("medium", "cpu", "int8")
+
+
+class TestEstimate:
+    """Tests for estimate_model_mb."""
+
+    def test_scales_with_compute_type(self):
+        """float32 weights take four times the memory of int8."""
+        int8 = model_pool.estimate_model_mb(ModelKey("small", "cpu", "int8"))
+        fp32 = model_pool.estimate_model_mb(ModelKey("small", "cpu", "float32"))
+        assert fp32 == 4 * int8
+
+    def test_larger_models_cost_more(self):
+        """Estimates follow the model size table."""
+        assert (model_pool.estimate_model_mb(ModelKey("medium", "cuda", "float16"))
+                > model_pool.estimate_model_mb(ModelKey("small", "cuda", "float16")))
+
+    def test_unknown_size(self):
+        """Model names outside the table still get an estimate."""
+        assert model_pool.estimate_model_mb(ModelKey("distil-large-v3", "cpu", "int8")) > 0
+
+
+class TestModelPool:
+    """Tests for ModelPool."""
+
+    def test_hit_returns_same_instance(self):
+        """A pooled model is returned without reloading."""
+        pool = ModelPool(1000, sized({"tiny": 100}))
+        model = object()
+        pool.put(TINY, model)
+        assert pool.get(TINY) is model
+
+    def test_miss_returns_none(self):
+        """Unknown keys miss."""
+        pool = ModelPool(1000, sized({"tiny": 100}))
+        assert pool.get(TINY) is None
+
+    def test_key_includes_device_and_compute_type(self):
+        """The same size on another device is a different model."""
+        pool = ModelPool(1000, sized({"tiny": 100}))
+        pool.put(TINY, object())
+        assert pool.get(ModelKey("tiny", "cuda", "float16")) is None
+
+    def test_evicts_least_recently_used(self):
+        """Going over budget evicts the oldest model first."""
+        pool = ModelPool(500, sized({"tiny": 100, "small": 300, "medium": 300}))
+        pool.put(TINY, object())
+        pool.put(SMALL, object())
+        pool.get(TINY)  # tiny is now more recent than small
+
+        evicted = pool.put(MEDIUM, object())
+
+        assert evicted == [SMALL]
+        assert pool.keys() == [TINY, MEDIUM]
+        assert pool.total_mb == 400
+
+    def test_never_evicts_newest(self):
+        """A model bigger than the whole budget is still kept."""
+        pool = ModelPool(100, sized({"tiny": 50, "medium": 1500}))
+        pool.put(TINY, object())
+        pool.put(MEDIUM, object())
+        assert pool.keys() == [MEDIUM]
+
+    def test_zero_budget_keeps_active_only(self):
+        """Budget 0 behaves like the old single-model loading."""
+        pool = ModelPool(0, sized({"tiny": 100, "small": 300}))
+        pool.put(TINY, object())
+        pool.put(SMALL, object())
+        assert pool.keys() == [SMALL]
+
+    def test_trim_after_budget_change(self):
+        """Lowering the budget evicts on trim()."""
+        pool = ModelPool(1000, sized({"tiny": 100, "small": 300}))
+        pool.put(TINY, object())
+        pool.put(SMALL, object())
+        pool.budget_mb = 300
+
+        assert pool.trim() == [TINY]
+        assert SMALL in pool
+
+    def test_on_evict_receives_evicted_models(self):
+        """Evicted models are handed to on_evict so they can be unloaded."""
+        evicted_models = []
+        pool = ModelPool(300, sized({"tiny": 100, "small": 300}), on_evict=evicted_models.append)
+        tiny = object()
+        pool.put(TINY, tiny)
+        pool.put(SMALL, object())
+
+        assert evicted_models == [tiny]
+
+    def test_peek_keeps_order(self):
+        """peek() doesn't count as a use."""
+        pool = ModelPool(1000, sized({"tiny": 100, "small": 300}))
+        tiny = object()
+        pool.put(TINY, tiny)
+        pool.put(SMALL, object())
+
+        assert pool.peek(TINY) is tiny
+        assert pool.keys() == [TINY, SMALL]
+
+    def test_remove_and_clear(self):
+        """remove() drops one model, clear() all of them."""
+        pool = ModelPool(1000, sized({"tiny": 100, "small": 300}))
+        pool.put(TINY, object())
+        pool.put(SMALL, object())
+
+        pool.remove(TINY)
+        assert pool.keys() == [SMALL]
+        pool.clear()
+        assert len(pool) == 0
+
+
+def loaded(size):
+    """A LoadedModel with a placeholder model object."""
+    return model_pool.LoadedModel(object(), 1, ModelKey(size, "cpu", "int8"))
+
+
+class TestModelSlot:
+    """Tests for ModelSlot hot-swapping."""
+
+    def test_empty_slot_leases_none(self):
+        """Before the first load there is nothing to lease."""
+        slot = model_pool.ModelSlot()
+        with slot.lease() as current:
+            assert current is None
+
+    def test_idle_model_released_on_swap(self):
+        """A replaced model nobody is using is released immediately."""
+        released = []
+        slot = model_pool.ModelSlot(on_release=released.append)
+        old, new = loaded("tiny"), loaded("small")
+        slot.swap(old)
+
+        assert slot.swap(new) is old
+        assert released == [old]
+        assert slot.current is new
+
+    def test_leased_model_released_after_last_lease(self):
+        """An in-flight transcription keeps the old model until it finishes."""
+        released = []
+        slot = model_pool.ModelSlot(on_release=released.append)
+        old, new = loaded("tiny"), loaded("small")
+        slot.swap(old)
+
+        with slot.lease() as first:
+            with slot.lease() as second:
+                slot.swap(new)
+                assert first is old and second is old
+                with slot.lease() as during:
+                    assert during is new
+            assert released == []
+            assert slot.in_flight(old) == 1
+        assert released == [old]
+        assert slot.in_flight() == 0
+
+    def test_lease_released_on_error(self):
+        """A failing transcription still ends its lease."""
+        released = []
+        slot = model_pool.ModelSlot(on_release=released.append)
+        old = loaded("tiny")
+        slot.swap(old)
+
+        try:
+            with slot.lease():
+                slot.swap(loaded("small"))
+                raise RuntimeError("decode failed")
+        except RuntimeError:
+            pass
+
+        assert released == [old]
+
+    def test_swap_to_same_model(self):
+        """Swapping in the active model again releases nothing."""
+        released = []
+        slot = model_pool.ModelSlot(on_release=released.append)
+        current = loaded("tiny")
+        slot.swap(current)
+        slot.swap(current)
+        assert released == []
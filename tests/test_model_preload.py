@@ -0,0 +1,98 @@
+"""Tests for model_preload.py page-cache preloading."""
+import sys
+import os
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import model_preload
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    """A fake model directory with a large model.bin."""
+    path = tmp_path / "small"
+    path.mkdir()
+    (path / "model.bin").write_bytes(b"\1" * (3 * 1024 * 1024 + 17))
+    (path / "config.json").write_text("{}")
+    (path / "tokenizer.json").write_text("{\"a\": 1}")
+    return path
+
+
+class TestResolveModelDir:
+    """Tests for resolve_model_dir."""
+
+    def test_directory_path(self, model_dir):
+        """A model directory is used as is."""
+        assert model_preload.resolve_model_dir(str(model_dir)) == str(model_dir)
+
+    def test_huggingface_snapshot(self, tmp_path, monkeypatch):
+        """A size name resolves to its downloaded HF snapshot."""
+        monkeypatch.setenv("HF_HUB_CACHE", str(tmp_path))
+        snapshot = tmp_path / "models--Systran--faster-whisper-base" / "snapshots" / "abc123"
+        snapshot.mkdir(parents=True)
+        (snapshot / "model.bin").write_bytes(b"x")
+
+        assert model_preload.resolve_model_dir("base") == str(snapshot)
+
+    def test_not_downloaded(self, tmp_path, monkeypatch):
+        """Nothing to preload before the first download."""
+        monkeypatch.setenv("HF_HUB_CACHE", str(tmp_path))
+        assert model_preload.resolve_model_dir("large-v3") is None
+
+    def test_symlinks_resolved_largest_first(self, tmp_path, model_dir):
+        """HF snapshot symlinks are followed to the blobs."""
+        link_dir = tmp_path / "snapshot"
+        link_dir.mkdir()
+        os.symlink(model_dir / "model.bin", link_dir / "model.bin")
+        os.symlink(model_dir / "config.json", link_dir / "config.json")
+
+        files = model_preload.model_files(str(link_dir))
+
+        assert files == [os.path.realpath(model_dir / "model.bin"), os.path.realpath(model_dir / "config.json")]
+
+
+class TestPreloader:
+    """Tests for Preloader and the module registry."""
+
+    def test_reads_every_byte(self, model_dir):
+        """All model files are read once."""
+        preloader = model_preload.Preloader(str(model_dir), chunk_bytes=1024 * 1024).start()
+
+        assert preloader.wait(5)
+        assert preloader.error is None
+        assert preloader.bytes_read == preloader.total_bytes
+        assert preloader.io_seconds >= 0
+
+    def test_cancel_stops_early(self, model_dir):
+        """A cancelled preload stops reading."""
+        preloader = model_preload.Preloader(str(model_dir), chunk_bytes=1024)
+        preloader.cancel()
+        preloader.start()
+
+        assert preloader.wait(5)
+        assert preloader.bytes_read < preloader.total_bytes
+
+    def test_preload_shared_until_finished(self, model_dir):
+        """The startup preload is picked up by the model load."""
+        first = model_preload.preload(str(model_dir))
+        try:
+            assert model_preload.preload(str(model_dir)) is first
+        finally:
+            model_preload.finish(str(model_dir))
+        assert model_preload.preload(str(model_dir)) is not first
+        model_preload.finish(str(model_dir))
+
+    def test_describe_load(self, model_dir):
+        """The report splits I/O from initialization."""
+        preloader = model_preload.Preloader(str(model_dir)).start()
+        preloader.wait(5)
+        preloader.io_seconds = 2.0
+
+        text = model_preload.describe_load(preloader, waited_s=0.5, init_s=0.75)
+
+        assert "I/O 2.00s" in text
+        assert "1.50s overlapped" in text
+        assert "init 0.75s" in text
+        assert model_preload.describe_load(None, 0, 1.0) == "init 1.00s (files not preloaded)"
@@ -0,0 +1,110 @@
+"""Tests for parallel_decode.py chunked decoding."""
+import pytest
+import numpy as np
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parallel_decode
+
+SAMPLE_RATE = 16000
+
+
+def speech_with_pauses(phrases, phrase_seconds=3.0, pause_seconds=0.8):
+    """Tone bursts separated by near-silence."""
+    t = np.arange(int(SAMPLE_RATE * phrase_seconds)) / SAMPLE_RATE
+    phrase = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    pause = np.full(int(SAMPLE_RATE * pause_seconds), 1e-5, dtype=np.float32)
+    return np.concatenate([np.concatenate([phrase, pause]) for _ in range(phrases)])
+
+
+class TestConcurrencyDefaults:
+    """Tests for default_concurrency and cpu_threads_per_worker."""
+
+    def test_cpu_single_worker(self):
+        """Uncalibrated CPU decodes use one worker, so single decodes keep every thread."""
+        assert parallel_decode.default_concurrency("cpu") == 1
+
+    def test_cuda(self):
+        """GPU uses two overlapping decodes."""
+        assert parallel_decode.default_concurrency("cuda") == 2
+
+    def test_threads_split_evenly(self):
+        """Cores are divided between workers."""
+        assert parallel_decode.cpu_threads_per_worker(4, cpu_count=8) == 2
+        assert parallel_decode.cpu_threads_per_worker(4, cpu_count=2) == 1
+
+
+class TestDecodeChunks:
+    """Tests for decode_chunks."""
+
+    def test_merges_in_order(self):
+        """Text is merged in chunk order even when later chunks finish first."""
+        audio = np.arange(40, dtype=np.float32)
+        bounds = [(0, 10), (10, 20), (20, 30), (30, 40)]
+
+        def transcribe(chunk):
+            time.sleep(0.05 if chunk[0] == 0 else 0.0)
+            return f" c{int(chunk[0])} "
+
+        assert parallel_decode.decode_chunks(audio, bounds, transcribe, 4) == "c0 c10 c20 c30"
+
+    def test_respects_concurrency_cap(self):
+        """No more than max_workers chunks decode at once."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def transcribe(chunk):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+            return "x"
+
+        bounds = [(i, i + 1) for i in range(10)]
+        parallel_decode.decode_chunks(np.zeros(10, dtype=np.float32), bounds, transcribe, 3)
+        assert max(peak) <= 3
+
+    def test_errors_propagate(self):
+        """A failing chunk fails the whole decode (so the caller can fall back)."""
+        def transcribe(chunk):
+            raise RuntimeError("CUDA error")
+
+        with pytest.raises(RuntimeError):
+            parallel_decode.decode_chunks(np.zeros(4, dtype=np.float32), [(0, 2), (2, 4)], transcribe, 2)
+
+
+class TestTranscribeLong:
+    """Tests for transcribe_long."""
+
+    def test_short_recording_single_call(self):
+        """Recordings under the threshold are decoded in one call."""
+        calls = []
+        audio = speech_with_pauses(3)
+        parallel_decode.transcribe_long(audio, SAMPLE_RATE, lambda a: calls.append(len(a)) or "t", 4)
+        assert calls == [len(audio)]
+
+    def test_single_worker_single_call(self):
+        """With concurrency 1 nothing is split."""
+        calls = []
+        audio = speech_with_pauses(20)
+        parallel_decode.transcribe_long(audio, SAMPLE_RATE, lambda a: calls.append(len(a)) or "t", 1)
+        assert calls == [len(audio)]
+
+    def test_long_recording_split(self):
+        """Long recordings are split into chunks covering all audio."""
+        calls = []
+        audio = speech_with_pauses(20)  # 76 s
+        text = parallel_decode.transcribe_long(audio, SAMPLE_RATE,
+                                               lambda a: calls.append(len(a)) or "t", 4)
+        assert len(calls) >= 3
+        assert sum(calls) == len(audio)
+        assert max(calls) <= parallel_decode.MAX_CHUNK_SECONDS * SAMPLE_RATE + 480
+        assert text == " ".join(["t"] * len(calls))
@@ -0,0 +1,96 @@
+"""Tests for resampler.py streaming polyphase resampling."""
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resampler
+
+
+def tone(freq, rate, seconds=1.0, amplitude=0.5):
+    """Sine tone as float32."""
+    t = np.arange(int(rate * seconds)) / rate
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def run_blocks(res, audio, block_frames=1024):
+    """Feed audio in callback-sized blocks and return all output."""
+    parts = [res.process(audio[i:i + block_frames]) for i in range(0, len(audio), block_frames)]
+    parts.append(res.flush())
+    return np.concatenate(parts)
+
+
+class TestDesignFilter:
+    """Tests for design_filter."""
+
+    def test_shape_and_gain(self):
+        """Each phase should have unity DC gain."""
+        filters = resampler.design_filter(160, 441)
+        assert filters.shape[0] == 160
+        np.testing.assert_allclose(filters.sum(axis=1), 1.0, atol=0.01)
+
+
+class TestPolyphaseResampler:
+    """Tests for PolyphaseResampler."""
+
+    @pytest.mark.parametrize("rate", [48000, 44100, 22050, 8000])
+    def test_tone_preserved(self, rate):
+        """A 1 kHz tone should come out at 16 kHz with the same phase and level."""
+        res = resampler.PolyphaseResampler(rate)
+        out = run_blocks(res, tone(1000, rate))
+
+        assert len(out) == 16000
+        expected = tone(1000, 16000)
+        np.testing.assert_allclose(out[200:-200], expected[200:-200], atol=1e-3)
+
+    @pytest.mark.parametrize("rate", [48000, 44100])
+    def test_rejects_above_nyquist(self, rate):
+        """Content above 8 kHz must not alias into the output."""
+        res = resampler.PolyphaseResampler(rate)
+        out = run_blocks(res, tone(12000, rate))
+        rms = np.sqrt(np.mean(out[500:-500] ** 2))
+        assert 20 * np.log10(rms / (0.5 / np.sqrt(2))) < -60
+
+    def test_streaming_matches_one_shot(self):
+        """Block boundaries must not change the output."""
+        audio = np.random.default_rng(0).standard_normal(44100).astype(np.float32)
+        one_shot = resampler.PolyphaseResampler(44100)
+        expected = np.concatenate([one_shot.process(audio), one_shot.flush()])
+
+        for block_frames in (1, 441, 1000, 4096):
+            out = run_blocks(resampler.PolyphaseResampler(44100), audio, block_frames)
+            np.testing.assert_allclose(out, expected, atol=1e-6)
+
+    def test_output_length(self):
+        """Total output should be ceil(input * out / in) samples."""
+        res = resampler.PolyphaseResampler(44100)
+        out = run_blocks(res, np.zeros(12345, dtype=np.float32))
+        assert len(out) == res.output_length(12345) == 4479
+
+    def test_stereo_downmix(self):
+        """Stereo blocks should be averaged to mono."""
+        left = tone(1000, 48000)
+        stereo = np.stack([left, np.zeros_like(left)], axis=1)
+        out = run_blocks(resampler.PolyphaseResampler(48000, channels=2), stereo)
+        np.testing.assert_allclose(out[200:-200], tone(1000, 16000, amplitude=0.25)[200:-200], atol=1e-3)
+
+    def test_passthrough_is_view(self):
+        """16 kHz mono input should pass through without copying."""
+        res = resampler.PolyphaseResampler(16000)
+        block = np.ones((512, 1), dtype=np.float32)
+        out = res.process(block)
+        assert res.passthrough
+        assert out.shape == (512,)
+        assert np.shares_memory(out, block)
+        assert len(res.flush()) == 0
+
+    def test_buffer_stays_bounded(self):
+        """Only a filter length of history should be retained."""
+        res = resampler.PolyphaseResampler(48000)
+        block = np.zeros(1024, dtype=np.float32)
+        for _ in range(1000):
+            res.process(block)
+        assert len(res._buf) < res._taps + 1024
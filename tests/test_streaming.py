@@ -0,0 +1,160 @@
+"""Tests for streaming.py incremental transcription."""
+import pytest
+import numpy as np
+import sys
+import os
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import audio_capture
+import streaming
+
+SAMPLE_RATE = 16000
+
+
+def silence(seconds):
+    """Near-silent noise."""
+    rng = np.random.default_rng(1)
+    return (rng.standard_normal(int(SAMPLE_RATE * seconds)) * 1e-4).astype(np.float32)
+
+
+def voiced(seconds, freq=220):
+    """A modulated tone standing in for speech."""
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (np.sin(2 * np.pi * freq * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)) * 0.3).astype(np.float32)
+
+
+class FakeModel:
+    """Transcribes each call as 'seg<N>' and records the audio lengths."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, audio):
+        self.calls.append(len(audio))
+        return f" seg{len(self.calls)} "
+
+
+@pytest.fixture(autouse=True)
+def no_partial_throttle(monkeypatch):
+    """Let every _step() produce a partial decode."""
+    monkeypatch.setattr(streaming, "PARTIAL_INTERVAL", 0.0)
+
+
+def make_streamer(model, on_text=None):
+    capture = audio_capture.CaptureBuffer(SAMPLE_RATE)
+    return capture, streaming.StreamingTranscriber(capture, model, on_text=on_text, min_pause_ms=500)
+
+
+class TestStreamingTranscriber:
+    """Tests for StreamingTranscriber."""
+
+    def test_commits_at_pause(self):
+        """Audio up to a pause should be decoded once and committed."""
+        model = FakeModel()
+        capture, streamer = make_streamer(model)
+        capture.write(np.concatenate([voiced(1.0), silence(0.8)]))
+
+        streamer._step()
+
+        assert len(model.calls) == 1
+        assert SAMPLE_RATE < streamer.committed_samples < int(1.8 * SAMPLE_RATE)
+        assert streamer.text == "seg1"
+
+    def test_partial_before_pause(self):
+        """Without a pause, the tail is decoded as an uncommitted partial."""
+        model = FakeModel()
+        shown = []
+        capture, streamer = make_streamer(model, on_text=shown.append)
+        capture.write(voiced(1.0))
+
+        streamer._step()
+
+        assert streamer.committed_samples == 0
+        assert shown == ["seg1"]
+
+    def test_finish_decodes_only_tail(self):
+        """At stop, only audio after the last commit is decoded."""
+        model = FakeModel()
+        capture, streamer = make_streamer(model)
+        capture.write(np.concatenate([voiced(2.0), silence(0.8)]))
+        streamer._step()
+        committed = streamer.committed_samples
+        capture.write(voiced(1.0, freq=330))
+        capture.finish()
+
+        text = streamer.finish()
+
+        assert text == "seg1 seg2"
+        assert model.calls[-1] <= len(capture) - committed
+        assert model.calls[-1] < 2 * SAMPLE_RATE
+
+    def test_partial_replaced_by_commit(self):
+        """Committed text replaces the partial hypothesis for that audio."""
+        model = FakeModel()
+        capture, streamer = make_streamer(model)
+        capture.write(voiced(1.0))
+        streamer._step()  # partial: seg1
+        capture.write(silence(0.8))
+        streamer._step()  # commit: seg2
+
+        assert streamer.text == "seg2"
+
+    def test_no_speech_returns_none(self):
+        """A recording without speech never reaches the model."""
+        model = FakeModel()
+        capture, streamer = make_streamer(model)
+        capture.write(silence(3.0))
+        streamer._step()
+
+        assert streamer.finish() is None
+        assert model.calls == []
+
+    def test_forced_commit_without_pause(self, monkeypatch):
+        """Long speech with no pause is committed at the segment limit."""
+        monkeypatch.setattr(streaming, "MAX_SEGMENT_SECONDS", 2.0)
+        model = FakeModel()
+        capture, streamer = make_streamer(model)
+        capture.write(voiced(3.0))
+
+        streamer._step()
+
+        assert streamer.committed_samples > 0
+
+    def test_worker_errors_fall_back_to_finish(self):
+        """If the worker's decode fails, finish() decodes everything."""
+        calls = []
+
+        def flaky(audio):
+            calls.append(len(audio))
+            if len(calls) == 1:
+                raise RuntimeError("decode failed")
+            return "all"
+
+        capture = audio_capture.CaptureBuffer(SAMPLE_RATE)
+        streamer = streaming.StreamingTranscriber(capture, flaky)
+        capture.write(np.concatenate([voiced(1.0), silence(0.8)]))
+        with pytest.raises(RuntimeError):
+            streamer._step()
+
+        assert streamer.committed_samples == 0
+        assert streamer.finish() == "all"
+
+    def test_background_worker(self, monkeypatch):
+        """start()/finish() should run the worker thread and stop it."""
+        monkeypatch.setattr(streaming, "POLL_INTERVAL", 0.01)
+        model = FakeModel()
+        capture, streamer = make_streamer(model)
+        capture.write(np.concatenate([voiced(1.0), silence(0.8)]))
+        streamer.start()
+        for _ in range(200):
+            if streamer.committed_samples:
+                break
+            time.sleep(0.01)
+
+        text = streamer.finish()
+
+        assert streamer.committed_samples > 0
+        assert text.startswith("seg1")
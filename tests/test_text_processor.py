@@ -1,5 +1,6 @@
 """Tests for text_processor.py voice commands."""
 import pytest
+import random
 import sys
 import os
 
@@ -457,3 +458,272 @@ class TestNewCommandsEdgeCases:
         assert "hello world" in text
         assert "\n" in text
         assert "ENDPOINT" in text
+
+
+class TestCustomDictionary:
+    """Test the compiled custom dictionary matcher."""
+
+    def test_longest_match_first(self):
+        """A longer entry wins over a shorter one at the same position."""
+        dictionary = [
+            {"from": "new york", "to": "NY"},
+            {"from": "new york city", "to": "NYC"},
+        ]
+        assert text_processor.apply_custom_dictionary("I love new york city and new york", dictionary) == \
+            "I love NYC and NY"
+
+    def test_longest_match_first_across_positions(self):
+        """A longer entry wins over a shorter one that overlaps it from another position."""
+        dictionary = [
+            {"from": "new york city", "to": "NYC"},
+            {"from": "the new", "to": "THE-NEW"},
+        ]
+        assert text_processor.apply_custom_dictionary("I love the new york city skyline", dictionary) == \
+            "I love the NYC skyline"
+
+        dictionary = [
+            {"from": "deep machine", "to": "DM"},
+            {"from": "machine learning", "to": "ML"},
+        ]
+        assert text_processor.apply_custom_dictionary("deep machine learning", dictionary) == "deep ML"
+
+    def test_case_sensitivity_per_entry(self):
+        """Case-sensitive entries match exactly; others ignore case."""
+        dictionary = [
+            {"from": "Go", "to": "Golang", "case_sensitive": True},
+            {"from": "jason", "to": "JSON"},
+        ]
+        result = text_processor.apply_custom_dictionary("Go parses Jason but we go home", dictionary)
+        assert result == "Golang parses JSON but we go home"
+
+    def test_word_boundaries(self):
+        """Entries only match whole words."""
+        dictionary = [{"from": "cat", "to": "dog"}]
+        assert text_processor.apply_custom_dictionary("cat concatenate cat.", dictionary) == "dog concatenate dog."
+
+    def test_punctuation_led_entry(self):
+        """Entries starting with punctuation keep regex boundary semantics."""
+        dictionary = [{"from": ".net", "to": " dotnet"}]
+        assert text_processor.apply_custom_dictionary("asp.net rocks", dictionary) == "asp dotnet rocks"
+
+    def test_replacement_is_literal(self):
+        """Targets are inserted verbatim, backslashes included."""
+        dictionary = [{"from": "home dir", "to": r"C:\Users\1"}]
+        assert text_processor.apply_custom_dictionary("open home dir", dictionary) == r"open C:\Users\1"
+
+    def test_compiled_once_per_content(self):
+        """An equal dictionary reuses the compiled matcher; an edit recompiles."""
+        dictionary = [{"from": "teh", "to": "the", "case_sensitive": False}]
+        first = text_processor.compile_custom_dictionary(dictionary)
+
+        assert text_processor.compile_custom_dictionary([dict(dictionary[0])]) is first
+        assert text_processor.compile_custom_dictionary([{"from": "teh", "to": "THE"}]) is not first
+
+    def test_large_dictionary(self):
+        """Thousands of entries still resolve the right replacement."""
+        dictionary = [{"from": f"product{i} name", "to": f"P{i}"} for i in range(3000)]
+        assert text_processor.apply_custom_dictionary("ship product2999 name and product7 name", dictionary) == \
+            "ship P2999 and P7"
+
+
+class TestVoiceCommandEngine:
+    """Test the trie-based voice command engine."""
+
+    def test_custom_command_long_trigger(self):
+        """Custom triggers can be any number of words."""
+        commands = [{"trigger": "insert my standard email sign off", "replacement": "Best,\nSam", "enabled": True}]
+        text, _, _ = text_processor.process_voice_commands(
+            "thanks again insert my standard email sign off", commands
+        )
+        assert text == "thanks again Best,\nSam"
+
+    def test_custom_command_keeps_surrounding_punctuation(self):
+        """Punctuation attached to the trigger words stays in place."""
+        commands = [{"trigger": "my address", "replacement": "1 Main St", "enabled": True}]
+        text, _, _ = text_processor.process_voice_commands("send it to My Address, please", commands)
+        assert text == "send it to 1 Main St, please"
+
+    def test_custom_command_not_across_sentence_break(self):
+        """Trigger words split by a sentence break are left alone."""
+        commands = [{"trigger": "email signature", "replacement": "Best, Me", "enabled": True}]
+        text, _, _ = text_processor.process_voice_commands("I sent the email. Signature next", commands)
+        assert text == "I sent the email. Signature next"
+
+    def test_custom_command_not_across_comma(self):
+        """Trigger words split by a comma are left alone, with the comma kept."""
+        commands = [{"trigger": "email signature", "replacement": "Best, Me", "enabled": True}]
+        assert text_processor.process_voice_commands("and email , signature", commands)[0] == \
+            "and email , signature"
+        assert text_processor.process_text("and email , signature", {"custom_commands": commands})[0] == \
+            "and email, signature"
+
+    def test_disabled_custom_command_ignored(self):
+        """Disabled custom commands are not compiled in."""
+        commands = [{"trigger": "my address", "replacement": "1 Main St", "enabled": False}]
+        text, _, _ = text_processor.process_voice_commands("my address", commands)
+        assert text == "my address"
+
+    def test_longest_command_wins(self):
+        """A longer custom phrase takes precedence over a built-in prefix."""
+        commands = [{"trigger": "new line item", "replacement": "- [ ]", "enabled": True}]
+        text, _, _ = text_processor.process_voice_commands("todo new line item buy milk new line done", commands)
+        assert text == "todo - [ ] buy milk\ndone"
+
+    def test_engine_cached_per_custom_commands(self):
+        """Equal custom command lists reuse the compiled engine."""
+        commands = [{"trigger": "sig", "replacement": "Sam", "enabled": True}]
+        engine = text_processor.get_voice_command_engine(commands)
+        assert text_processor.get_voice_command_engine([dict(commands[0])]) is engine
+        assert text_processor.get_voice_command_engine() is not engine
+
+    def test_custom_commands_without_voice_commands(self):
+        """Custom commands still expand when built-in voice commands are off."""
+        config = {"voice_commands_enabled": False, "filler_removal_enabled": False,
+                  "custom_commands": [{"trigger": "sig", "replacement": "Sam", "enabled": True}]}
+        text, _, _, _ = text_processor.process_text("bye sig period", config)
+        assert text == "bye Sam period"
+
+
+class TestFillerRemoval:
+    """Test the precompiled filler remover."""
+
+    def test_single_fillers_and_phrases(self):
+        """Basic fillers and filler phrases are removed, spacing normalized."""
+        result = text_processor.remove_fillers("Um, so I mean the   build uh passed you know.")
+        assert result == "so the build passed."
+
+    def test_punctuation_attaches_after_phrase_removal(self):
+        """Punctuation left by a removed phrase joins the previous word."""
+        assert text_processor.remove_fillers("it was, you know, great") == "it was,, great"
+
+    def test_aggressive_like(self):
+        """Aggressive mode drops quotative and comma-led 'like' only."""
+        text = "he was like no and it was, like, huge but I like it"
+        assert text_processor.remove_fillers(text) == text
+        assert text_processor.remove_fillers(text, aggressive=True) == "he was no and it was, huge but I like it"
+
+    def test_custom_fillers_case_insensitive(self):
+        """Custom fillers are matched regardless of case."""
+        assert text_processor.remove_fillers("Basically it works", custom_fillers=["basically"]) == "it works"
+
+    def test_remover_cached_per_settings(self):
+        """Each (aggressive, custom_fillers) combination compiles once."""
+        remover = text_processor.get_filler_remover(True, ["so"])
+        assert text_processor.get_filler_remover(True, ["so"]) is remover
+        assert text_processor.get_filler_remover(False, ["so"]) is not remover
+
+
+class TestTextPipeline:
+    """Test the compiled TextPipeline."""
+
+    CONFIG = {
+        "custom_dictionary": [{"from": "jason", "to": "JSON"}],
+        "filler_removal_enabled": True,
+        "custom_commands": [{"trigger": "sig", "replacement": "Sam", "enabled": True}],
+    }
+
+    def test_matches_process_text(self):
+        """The pipeline returns what process_text returns."""
+        pipeline = text_processor.TextPipeline(self.CONFIG)
+        text = "um parse the jason file sig period"
+        assert pipeline.process(text) == text_processor.process_text(text, self.CONFIG)
+        assert pipeline.process(text)[0] == "parse the JSON file Sam."
+
+    def test_snapshot_isolated_from_config_edits(self):
+        """Editing the config dict later doesn't change a built pipeline."""
+        config = {"custom_dictionary": [{"from": "jason", "to": "JSON"}]}
+        pipeline = text_processor.TextPipeline(config)
+        config["custom_dictionary"][0]["to"] = "Jason"
+
+        assert pipeline.process("jason")[0] == "JSON"
+        assert pipeline.changed(config)
+
+    def test_changed_only_for_text_keys(self):
+        """Unrelated settings don't require a rebuild; missing keys use defaults."""
+        pipeline = text_processor.TextPipeline({})
+        assert not pipeline.changed({"model_size": "large-v3", "voice_commands_enabled": True})
+        assert pipeline.changed({"filler_removal_aggressive": True})
+
+    def test_scratch_that_uses_history(self):
+        """'scratch that' reports the last entry's length and pops it."""
+        history = text_processor.TranscriptionHistory(persist=False)
+        history.add("hello world ")
+        pipeline = text_processor.TextPipeline({})
+
+        text, should_scratch, scratch_length, _ = pipeline.process("scratch that", history)
+
+        assert should_scratch and scratch_length == 12
+        assert history.get_entry_count() == 0
+
+
+class TestIncrementalTextProcessor:
+    """Test IncrementalTextProcessor against one-shot processing."""
+
+    CONFIG = {
+        "custom_dictionary": [{"from": "new york", "to": "NY"}, {"from": "jason", "to": "JSON"}],
+        "filler_removal_aggressive": True,
+        "custom_commands": [{"trigger": "email signature", "replacement": "Best, Sam", "enabled": True}],
+    }
+
+    def run(self, fragments, config=None, history=None):
+        pipeline = text_processor.TextPipeline(self.CONFIG if config is None else config)
+        processor = pipeline.incremental()
+        for fragment in fragments:
+            processor.feed(fragment)
+        return processor.finish(history), pipeline.process(" ".join(fragments), history)
+
+    def test_commands_across_fragments(self):
+        """Commands and dictionary entries split between fragments still match."""
+        got, expected = self.run(["I moved to new", "york question", "mark email", "signature"])
+        assert got == expected
+        assert got[0] == "I moved to NY? Best, Sam"
+
+    def test_edits_across_fragments(self):
+        """'capitalize that' and 'delete last word' reach back into earlier fragments."""
+        got, expected = self.run(["um the jason", "file capitalize", "that extra delete last", "word period"])
+        assert got == expected
+        assert got[0] == "the JSON File."
+
+    def test_feed_emits_decided_text(self):
+        """feed() returns processed text so far plus the undecided tail."""
+        processor = text_processor.TextPipeline({}).incremental()
+        processor.feed("um this is the first part")
+
+        text, pending = processor.feed("of a long dictation and")
+
+        assert text.startswith("this is the")
+        assert pending and text + " " + pending == "this is the first part of a long dictation and"
+        assert processor.finish()[0] == "this is the first part of a long dictation and"
+
+    def test_scratch_that_uses_history(self):
+        """finish() resolves 'scratch that' like TextPipeline.process()."""
+        history = text_processor.TranscriptionHistory(persist=False)
+        history.add("hello ")
+        processor = text_processor.TextPipeline({}).incremental()
+        processor.feed("never mind scratch")
+        processor.feed("that")
+        assert processor.finish(history) == ("", True, 6, [])
+
+    def test_empty_input(self):
+        """No fragments, or a single empty one, gives the empty result."""
+        assert self.run([]) == (("", False, 0, []), ("", False, 0, []))
+        assert self.run([""])[0] == ("", False, 0, [])
+
+    def test_random_fragmentation_matches_batch(self):
+        """Any split into fragments gives the one-shot result, for every stage combination."""
+        rng = random.Random(7)
+        vocabulary = ("um uh like, was like you know i mean kind of new york jason period comma question "
+                      "mark new line new paragraph scratch that delete last word capitalize that copy "
+                      "paste that email signature hello . , ? Um, UH.").split()
+        for _ in range(500):
+            config = dict(self.CONFIG,
+                          filler_removal_enabled=rng.random() < 0.7,
+                          voice_commands_enabled=rng.random() < 0.7,
+                          custom_dictionary=rng.choice([[], self.CONFIG["custom_dictionary"]]),
+                          custom_commands=rng.choice([[], self.CONFIG["custom_commands"]]))
+            text = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 12)))
+            cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 5))))
+            fragments = [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+
+            got, expected = self.run(fragments, config)
+            assert got == expected, (config, fragments)
@@ -0,0 +1,134 @@
+"""Tests for two_pass.py draft-and-refine corrections."""
+import sys
+import os
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import two_pass
+
+
+class Screen:
+    """Applies corrections to a string like keystrokes would."""
+
+    def __init__(self, text=""):
+        self.text = text
+        self.calls = []
+
+    def replace(self, draft, refined, backspaces, typed):
+        self.calls.append((backspaces, typed))
+        self.text = self.text[:len(self.text) - backspaces] + typed
+
+
+def run(refiner, draft, refined_raw, finish=None):
+    """Start a job, hand it the draft and wait for it."""
+    job = refiner.start(lambda: refined_raw, finish=finish)
+    job.set_draft(draft)
+    job.join(5)
+    return job
+
+
+class TestReplacementEdit:
+    """Tests for replacement_edit."""
+
+    def test_only_tail_is_retyped(self):
+        """A shared prefix is kept."""
+        assert two_pass.replacement_edit("I red the book ", "I read the book ") == (11, "ad the book ")
+
+    def test_identical(self):
+        """No edit when nothing changed."""
+        assert two_pass.replacement_edit("same ", "same ") == (0, "")
+
+    def test_completely_different(self):
+        """Everything is erased when nothing is shared."""
+        assert two_pass.replacement_edit("abc", "xyz") == (3, "xyz")
+
+
+class TestRefiner:
+    """Tests for Refiner and RefineJob."""
+
+    def test_corrects_differing_draft(self):
+        """The screen ends up showing the refined text."""
+        screen = Screen("Hello. Wreck a nice beach ")
+        refiner = two_pass.Refiner(screen.replace)
+
+        job = run(refiner, "Wreck a nice beach ", "Recognize speech ")
+
+        assert job.replaced
+        assert screen.text == "Hello. Recognize speech "
+
+    def test_same_text_not_touched(self):
+        """An identical refinement types nothing."""
+        screen = Screen("Hello ")
+        refiner = two_pass.Refiner(screen.replace)
+
+        job = run(refiner, "Hello ", "Hello ")
+
+        assert not job.replaced
+        assert screen.calls == []
+
+    def test_invalidated_by_later_output(self):
+        """A correction is dropped once more text was typed after the draft."""
+        screen = Screen("draft ")
+        refiner = two_pass.Refiner(screen.replace)
+        gate = threading.Event()
+
+        job = refiner.start(lambda: gate.wait() and "refined ")
+        job.set_draft("draft ")
+        refiner.invalidate()
+        gate.set()
+        job.join(5)
+
+        assert not job.replaced
+        assert screen.text == "draft "
+
+    def test_earlier_invalidation_does_not_count(self):
+        """Output typed before this draft doesn't block its correction."""
+        screen = Screen("first draft ")
+        refiner = two_pass.Refiner(screen.replace)
+        gate = threading.Event()
+
+        job = refiner.start(lambda: gate.wait() and "drift ")
+        refiner.invalidate()  # an earlier dictation was typed
+        job.set_draft("draft ")
+        gate.set()
+        job.join(5)
+
+        assert job.replaced
+        assert screen.text == "first drift "
+
+    def test_finish_can_veto(self):
+        """finish() returning None keeps the draft."""
+        screen = Screen("draft ")
+        refiner = two_pass.Refiner(screen.replace)
+
+        job = run(refiner, "draft ", "scratch that", finish=lambda raw: None)
+
+        assert not job.replaced
+
+    def test_cancel_skips_correction(self):
+        """A cancelled job never types."""
+        screen = Screen("draft ")
+        refiner = two_pass.Refiner(screen.replace)
+
+        job = refiner.start(lambda: "refined ")
+        job.cancel()
+        job.join(5)
+
+        assert screen.calls == []
+
+    def test_on_done_runs_even_if_decode_fails(self):
+        """The audio is released when the refinement decode raises."""
+        released = []
+        refiner = two_pass.Refiner(Screen().replace)
+
+        def fail():
+            raise RuntimeError("decode failed")
+
+        job = refiner.start(fail, on_done=lambda: released.append(True))
+        job.set_draft("draft ")
+        job.join(5)
+
+        assert released == [True]
+        assert not job.replaced
@@ -0,0 +1,186 @@
+"""Tests for vad.py voice activity detection."""
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vad
+
+SAMPLE_RATE = 16000
+
+
+def silence(seconds, level_db=-80):
+    """Low-level white noise at roughly level_db dBFS."""
+    rng = np.random.default_rng(1)
+    amplitude = 10 ** (level_db / 20)
+    return (rng.standard_normal(int(SAMPLE_RATE * seconds)) * amplitude).astype(np.float32)
+
+
+def voiced(seconds, amplitude=0.3):
+    """A modulated 220 Hz tone standing in for voiced speech."""
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+    return (np.sin(2 * np.pi * 220 * t) * envelope * amplitude).astype(np.float32)
+
+
+class TestFrameFeatures:
+    """Tests for per-frame energy and zero-crossing rate."""
+
+    def test_frame_count(self):
+        """One feature per complete 30 ms frame."""
+        energy, zcr = vad.frame_features(np.zeros(16000, dtype=np.float32), SAMPLE_RATE)
+        assert len(energy) == len(zcr) == 33
+
+    def test_short_audio(self):
+        """Audio shorter than a frame yields no frames."""
+        energy, zcr = vad.frame_features(np.zeros(10, dtype=np.float32), SAMPLE_RATE)
+        assert energy.size == 0
+
+    def test_full_scale_energy(self):
+        """Constant full-scale signal should be about 0 dBFS."""
+        energy, _ = vad.frame_features(np.ones(4800, dtype=np.float32), SAMPLE_RATE)
+        assert energy[0] == pytest.approx(0.0, abs=0.01)
+
+    def test_zcr_of_alternating_signal(self):
+        """Sign flipping every sample should have ZCR of 1."""
+        audio = np.tile(np.array([1.0, -1.0], dtype=np.float32), 2400)
+        _, zcr = vad.frame_features(audio, SAMPLE_RATE)
+        assert zcr[0] == pytest.approx(1.0)
+
+
+class TestFindSpeechBounds:
+    """Tests for speech region detection."""
+
+    def test_digital_silence(self):
+        """All-zero audio has no speech."""
+        assert vad.find_speech_bounds(np.zeros(SAMPLE_RATE * 2, dtype=np.float32), SAMPLE_RATE) is None
+
+    def test_quiet_room_noise(self):
+        """Room noise below the absolute floor has no speech."""
+        assert vad.find_speech_bounds(silence(3, level_db=-65), SAMPLE_RATE) is None
+
+    def test_empty_audio(self):
+        """Empty input has no speech."""
+        assert vad.find_speech_bounds(np.zeros(0, dtype=np.float32), SAMPLE_RATE) is None
+
+    def test_single_click_ignored(self):
+        """A click shorter than MIN_SPEECH_MS is not speech."""
+        audio = silence(2)
+        audio[16000:16200] = 0.8
+        assert vad.find_speech_bounds(audio, SAMPLE_RATE) is None
+
+    def test_speech_in_middle(self):
+        """Speech surrounded by silence should be found with padding."""
+        audio = np.concatenate([silence(1.0), voiced(1.0), silence(2.0)])
+        start, end = vad.find_speech_bounds(audio, SAMPLE_RATE, padding_ms=200)
+        assert 0.7 * SAMPLE_RATE <= start <= 0.85 * SAMPLE_RATE
+        assert 2.15 * SAMPLE_RATE <= end <= 2.3 * SAMPLE_RATE
+
+    def test_speech_over_noise_floor(self):
+        """Speech should be found above a steady noise floor."""
+        audio = np.concatenate([silence(1.0, level_db=-40), voiced(0.5) + silence(0.5, level_db=-40), silence(1.0, level_db=-40)])
+        bounds = vad.find_speech_bounds(audio, SAMPLE_RATE, padding_ms=0)
+        assert bounds is not None
+        start, end = bounds
+        assert abs(start - SAMPLE_RATE) < 0.1 * SAMPLE_RATE
+        assert abs(end - 1.5 * SAMPLE_RATE) < 0.1 * SAMPLE_RATE
+
+    def test_padding_clamped_to_audio(self):
+        """Padding should not run past the ends of the audio."""
+        audio = voiced(1.0)
+        start, end = vad.find_speech_bounds(audio, SAMPLE_RATE, padding_ms=500)
+        assert start == 0
+        assert end == len(audio)
+
+
+class TestTrimSilence:
+    """Tests for trim_silence."""
+
+    def test_returns_view(self):
+        """Trimmed audio should be a zero-copy view."""
+        audio = np.concatenate([silence(1.0), voiced(1.0), silence(1.0)])
+        trimmed = vad.trim_silence(audio, SAMPLE_RATE)
+        assert np.shares_memory(trimmed, audio)
+        assert len(trimmed) < len(audio)
+
+    def test_removes_auto_stop_tail(self):
+        """The 2 s silence tail from auto-stop mode should be dropped."""
+        audio = np.concatenate([voiced(1.5), silence(2.0)])
+        trimmed = vad.trim_silence(audio, SAMPLE_RATE, padding_ms=300)
+        assert len(trimmed) <= 1.9 * SAMPLE_RATE
+
+    def test_no_speech_returns_none(self):
+        """Silent recordings should return None so the model is skipped."""
+        assert vad.trim_silence(silence(2), SAMPLE_RATE) is None
+
+
+class TestFindPause:
+    """Tests for find_pause (streaming segment boundaries)."""
+
+    def test_pause_between_phrases(self):
+        """A pause between two phrases should be found near its middle."""
+        audio = np.concatenate([voiced(1.0), silence(0.8), voiced(1.0)])
+        pause = vad.find_pause(audio, SAMPLE_RATE, min_pause_ms=500)
+        assert pause is not None
+        assert abs(pause - int(1.4 * SAMPLE_RATE)) < 0.1 * SAMPLE_RATE
+
+    def test_short_gap_ignored(self):
+        """Gaps shorter than min_pause_ms are within a phrase."""
+        audio = np.concatenate([voiced(1.0), silence(0.2), voiced(1.0)])
+        assert vad.find_pause(audio, SAMPLE_RATE, min_pause_ms=500) is None
+
+    def test_leading_silence_not_a_pause(self):
+        """Silence before the first speech doesn't count."""
+        audio = np.concatenate([silence(1.0), voiced(1.0)])
+        assert vad.find_pause(audio, SAMPLE_RATE, min_pause_ms=500) is None
+
+    def test_trailing_pause(self):
+        """Silence after speech at the end of the buffer is a pause."""
+        audio = np.concatenate([voiced(1.0), silence(1.0)])
+        pause = vad.find_pause(audio, SAMPLE_RATE, min_pause_ms=500)
+        assert pause is not None
+        assert pause > SAMPLE_RATE
+
+    def test_last_pause_wins(self):
+        """With several pauses, the latest one is returned."""
+        audio = np.concatenate([voiced(0.5), silence(0.6), voiced(0.5), silence(0.6), voiced(0.5)])
+        pause = vad.find_pause(audio, SAMPLE_RATE, min_pause_ms=500)
+        assert pause > int(1.6 * SAMPLE_RATE)
+
+    def test_no_speech(self):
+        """Silence only has no pause to cut at."""
+        assert vad.find_pause(silence(2.0), SAMPLE_RATE) is None
+
+
+class TestSplitAtPauses:
+    """Tests for split_at_pauses (parallel decode chunking)."""
+
+    def test_short_audio_single_chunk(self):
+        """Audio under the limit is one chunk."""
+        audio = voiced(5.0)
+        assert vad.split_at_pauses(audio, SAMPLE_RATE, 10) == [(0, len(audio))]
+
+    def test_cuts_in_pauses(self):
+        """Chunks should end inside the pauses between phrases."""
+        phrase = np.concatenate([voiced(3.0), silence(0.8)])
+        audio = np.concatenate([phrase] * 10)  # 38 s
+        bounds = vad.split_at_pauses(audio, SAMPLE_RATE, 10)
+
+        assert len(bounds) > 3
+        assert bounds[0][0] == 0 and bounds[-1][1] == len(audio)
+        for (_, end), (start, _) in zip(bounds, bounds[1:]):
+            assert end == start
+            # Cut lands in a pause: position within its 3.8 s phrase is past the 3 s of speech
+            assert (end / SAMPLE_RATE) % 3.8 > 3.0
+        assert all(end - start <= 10 * SAMPLE_RATE for start, end in bounds)
+
+    def test_no_pause_forces_cut(self):
+        """Continuous speech is still split under the limit."""
+        audio = voiced(25.0)
+        bounds = vad.split_at_pauses(audio, SAMPLE_RATE, 10)
+        assert len(bounds) >= 3
+        assert all(end - start <= 10 * SAMPLE_RATE for start, end in bounds)
+        assert bounds[-1][1] == len(audio)
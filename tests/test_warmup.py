@@ -0,0 +1,106 @@
+"""Tests for warmup.py model warm-up."""
+import pytest
+import numpy as np
+import sys
+import os
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import warmup
+
+
+class TestWarmupAudio:
+    """Tests for warmup_audio."""
+
+    def test_format(self):
+        """Warm-up clip is 16 kHz mono float32, not digital silence."""
+        audio = warmup.warmup_audio(1.0)
+        assert audio.dtype == np.float32
+        assert audio.shape == (16000,)
+        assert np.abs(audio).max() > 0.01
+
+
+class TestRunWarmup:
+    """Tests for run_warmup."""
+
+    def test_cold_then_warm(self):
+        """The first call is timed as cold and a later one as warm."""
+        calls = []
+        cold, warm = warmup.run_warmup(lambda audio: calls.append(len(audio)))
+        assert len(calls) == 2
+        assert cold >= 0 and warm >= 0
+
+    def test_warms_every_worker(self):
+        """Each worker gets a decode of its own between the timed calls."""
+        names = []
+        warmup.run_warmup(lambda audio: names.append(threading.current_thread().name), workers=3)
+        assert len(names) == 5
+        main = threading.current_thread().name
+        assert names[0] == names[-1] == main
+        assert main not in names[1:4]
+
+    def test_errors_propagate(self):
+        """A failing warm-up is reported to the caller."""
+        def transcribe(audio):
+            raise RuntimeError("CUDA error")
+
+        with pytest.raises(RuntimeError):
+            warmup.run_warmup(transcribe)
+
+
+class TestIdleRewarmer:
+    """Tests for IdleRewarmer."""
+
+    def make(self, idle_seconds=60, busy=False):
+        warms = []
+        rewarmer = warmup.IdleRewarmer(lambda: warms.append(1), idle_seconds, is_busy=lambda: busy)
+        return rewarmer, warms
+
+    def test_not_before_idle(self):
+        """No re-warm while the model was used recently."""
+        rewarmer, warms = self.make()
+        rewarmer.touch()
+        assert not rewarmer.check()
+        assert warms == []
+
+    def test_rewarms_once_per_idle_period(self):
+        """After the idle period, warm() runs once until the next use."""
+        rewarmer, warms = self.make()
+        rewarmer.touch()
+        later = rewarmer._last_used + 61
+        assert rewarmer.check(now=later)
+        assert not rewarmer.check(now=later + 600)
+        assert len(warms) == 1
+
+        rewarmer.touch()
+        assert rewarmer.check(now=rewarmer._last_used + 61)
+        assert len(warms) == 2
+
+    def test_skips_while_busy(self):
+        """Recording or loading postpones the re-warm."""
+        rewarmer, warms = self.make(busy=True)
+        assert not rewarmer.check(now=rewarmer._last_used + 61)
+        assert warms == []
+
+    def test_disabled(self):
+        """idle_seconds of 0 disables re-warming."""
+        rewarmer, warms = self.make(idle_seconds=0)
+        assert not rewarmer.check(now=rewarmer._last_used + 10 ** 6)
+
+    def test_warm_errors_contained(self):
+        """A failed re-warm is logged, not raised."""
+        def fail():
+            raise RuntimeError("boom")
+
+        rewarmer = warmup.IdleRewarmer(fail, 1)
+        assert rewarmer.check(now=rewarmer._last_used + 2)
+
+    def test_background_thread(self):
+        """start()/stop() run and stop the checker thread."""
+        done = threading.Event()
+        rewarmer = warmup.IdleRewarmer(done.set, 0.01, check_interval=0.01)
+        rewarmer.start()
+        assert done.wait(2.0)
+        rewarmer.stop()
@@ -327,6 +327,17 @@ class TestGetGPUStatus:
         assert result["success"] is True
         assert result["data"]["available"] is False
 
+    def test_refresh_passed_through(self, mocker):
+        """The refresh button's request probes again instead of using the cache."""
+        status = mocker.patch('settings_logic.get_cuda_status',
+                              return_value=(False, "GPU libraries not installed", None))
+        api = SettingsAPI()
+
+        api.get_gpu_status()
+        api.get_gpu_status(True)
+
+        assert status.call_args_list == [mocker.call(refresh=False), mocker.call(refresh=True)]
+
 
 # =============================================================================
 # License Methods
@@ -773,5 +773,30 @@ class TestNoiseGateThresholdCalculations:
         assert 'onAudioLevel' in call_args
 
 
+
+class TestCaptureDiagnostics:
+    """Test capture diagnostics published by the running app."""
+
+    @patch('audio_capture.load_diagnostics')
+    def test_returns_published_data(self, mock_load):
+        """Diagnostics saved by the app should be returned as data."""
+        mock_load.return_value = {"last_recording": {"blocks": 10, "input_overflows": 2}}
+
+        api = SettingsAPI()
+        result = api.get_capture_diagnostics()
+
+        assert result["success"] is True
+        assert result["data"]["last_recording"]["input_overflows"] == 2
+
+    @patch('audio_capture.load_diagnostics', return_value=None)
+    def test_no_recording_yet(self, mock_load):
+        """Before the first recording there is nothing to report."""
+        api = SettingsAPI()
+        result = api.get_capture_diagnostics()
+
+        assert result["success"] is True
+        assert result["data"] is None
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
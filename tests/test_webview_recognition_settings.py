@@ -215,6 +215,60 @@ class TestGPUFeatures:
         assert 'success' in result
 
 
+# =============================================================================
+# CPU Calibration Tests
+# =============================================================================
+
+class TestCpuAutotune:
+    """Test CPU calibration report and trigger."""
+
+    def test_report_returned_as_data(self, mocker):
+        """The saved calibration report should be returned as data."""
+        import settings_webview
+
+        mocker.patch('autotune.load_report', return_value={
+            "model": "small", "best": {"num_workers": 2, "cpu_threads": 4, "score_s": 3.2}
+        })
+        api = settings_webview.SettingsAPI()
+        result = api.get_cpu_autotune_report()
+
+        assert result['success'] is True
+        assert result['data']['best']['cpu_threads'] == 4
+
+    def test_no_report_yet(self, mocker):
+        """Before any calibration, data is None."""
+        import settings_webview
+
+        mocker.patch('autotune.load_report', return_value=None)
+        api = settings_webview.SettingsAPI()
+        result = api.get_cpu_autotune_report()
+
+        assert result['success'] is True
+        assert result['data'] is None
+
+    def test_run_saves_fastest_setting(self, mocker):
+        """A calibration run should store the winner in config."""
+        import settings_webview
+
+        report = {"model": "tiny", "best": {"num_workers": 2, "cpu_threads": 3, "score_s": 1.0},
+                  "results": []}
+        mocker.patch('autotune.run', return_value=report)
+        mocker.patch('autotune.save_report')
+        mocker.patch('dependency_check.check_model_available', return_value=(True, "/models/tiny"))
+        mock_save = mocker.patch('config.save_config')
+
+        api = settings_webview.SettingsAPI()
+        api._window = MagicMock()
+        mocker.patch('threading.Thread', side_effect=lambda target, daemon: MagicMock(start=target))
+        result = api.run_cpu_autotune()
+
+        assert result['success'] is True
+        saved = mock_save.call_args[0][0]
+        assert saved['decode_concurrency'] == 2
+        assert saved['cpu_threads'] == 3
+        assert saved['cpu_autotune_model'] == "tiny"
+
+
 # =============================================================================
 # Silence Duration Tests
 # =============================================================================
@@ -2,6 +2,7 @@
 Text processing pipeline for MurmurTone.
 Handles custom dictionary, filler removal, and voice commands.
 """
+import copy
 import re
 
 
@@ -244,10 +245,128 @@ class TranscriptionHistory:
             pass
 
 
+_LEADING_WORD = re.compile(r"\w*")
+
+
+class DictionaryMatcher:
+    """
+    Custom dictionary compiled for a single pass over the text.
+
+    Entries are grouped by their leading word (lowercased; "" for entries
+    that start with punctuation). The text is scanned once, word by word,
+    and at each word only the entries sharing that leading word are tried.
+    Each entry keeps its own precompiled word-bounded pattern, exact or
+    case-insensitive, so the cost depends on the text and the few
+    candidates per word, not on the dictionary size.
+
+    Overlapping matches resolve like applying the entries one at a time,
+    longest first (ties keep list order): a match is kept unless it
+    overlaps one of a longer entry. Replacements are not re-scanned by
+    other entries.
+    """
+
+    def __init__(self, dictionary):
+        entries = [(entry.get("from", ""), entry.get("to", ""), entry.get("case_sensitive", False))
+                   for entry in dictionary]
+        # Sort by length (longest first) to handle overlapping patterns
+        entries = sorted((entry for entry in entries if entry[0]), key=lambda e: len(e[0]), reverse=True)
+
+        self._buckets = {}  # leading word -> [(rank, pattern, target)], longest first
+        self.max_length = len(entries[0][0]) if entries else 0
+        for rank, (source, target, case_sensitive) in enumerate(entries):
+            pattern = re.compile(r"\b" + re.escape(source) + r"\b", 0 if case_sensitive else re.IGNORECASE)
+            key = _LEADING_WORD.match(source).group().lower()
+            self._buckets.setdefault(key, []).append((rank, pattern, target))
+        # Punctuation-led entries can start at any non-word character
+        self._tokens = re.compile(r"(\w+)|\W" if "" in self._buckets else r"(\w+)")
+
+    def apply(self, text):
+        """Replace every dictionary match in text."""
+        if not self._buckets or not text:
+            return text
+        output, _ = self.scan(text, 0, len(text))
+        return output
+
+    def scan(self, text, pos, limit):
+        """
+        Replace matches in text[pos:], deciding only up to a safe point.
+
+        Used directly for streaming: a match starting before
+        len(text) - max_length is known without seeing more text. The
+        result is committed up to the last word start at or before the
+        first word from limit on that no known match spans, so text after
+        it cannot change how the committed part resolves.
+
+        Returns:
+            (output, end): replacement output for text[pos:end]
+        """
+        starts = []
+        candidates = []  # (rank, start, end, target)
+        cut = len(text)
+        for token in self._tokens.finditer(text, pos):
+            start = token.start()
+            if start >= limit:
+                cut = start
+                break
+            starts.append(start)
+            word = token.group(1)
+            for rank, pattern, target in self._buckets.get(word.lower() if word is not None else "", ()):
+                match = pattern.match(text, start)
+                if match:
+                    candidates.append((rank, start, match.end(), target))
+
+        # Move the cut back past any match that spans it
+        index = len(starts)
+        while any(start < cut < end for _, start, end, _ in candidates):
+            index -= 1
+            cut = starts[index] if index >= 0 else pos
+        candidates = [candidate for candidate in candidates if candidate[2] <= cut]
+
+        # Longest entry first, then left to right, skipping overlaps
+        taken = bytearray(cut - pos)
+        accepted = []
+        for rank, start, end, target in sorted(candidates):
+            if taken.find(1, start - pos, end - pos) == -1:
+                taken[start - pos:end - pos] = b"\x01" * (end - start)
+                accepted.append((start, end, target))
+
+        parts = []
+        last = pos
+        for start, end, target in sorted(accepted):
+            parts.append(text[last:start])
+            parts.append(target)
+            last = end
+        parts.append(text[last:cut])
+        return "".join(parts), cut
+
+
+_dictionary_cache = {}  # entry contents -> DictionaryMatcher
+_DICTIONARY_CACHE_SIZE = 4
+
+
+def compile_custom_dictionary(dictionary):
+    """
+    DictionaryMatcher for a dictionary, cached by content.
+
+    Keyed by the entries' contents, so an edited dictionary gets a new
+    matcher and an unchanged one (even a fresh copy from a config reload)
+    reuses the compiled patterns.
+    """
+    key = tuple((entry.get("from", ""), entry.get("to", ""), entry.get("case_sensitive", False))
+                for entry in dictionary)
+    matcher = _dictionary_cache.get(key)
+    if matcher is None:
+        matcher = DictionaryMatcher(dictionary)
+        if len(_dictionary_cache) >= _DICTIONARY_CACHE_SIZE:
+            _dictionary_cache.clear()
+        _dictionary_cache[key] = matcher
+    return matcher
+
+
 def apply_custom_dictionary(text, dictionary):
     """
     Apply custom dictionary replacements.
-    Longer phrases processed first to avoid partial matches.
+    Longer phrases take precedence to avoid partial matches.
 
     Args:
         text: Input text
@@ -258,27 +377,7 @@ def apply_custom_dictionary(text, dictionary):
     """
     if not dictionary:
         return text
-
-    # Sort by length (longest first) to handle overlapping patterns
-    sorted_dict = sorted(dictionary, key=lambda x: len(x.get("from", "")), reverse=True)
-
-    for entry in sorted_dict:
-        source = entry.get("from", "")
-        target = entry.get("to", "")
-        case_sensitive = entry.get("case_sensitive", False)
-
-        if not source:
-            continue
-
-        # Use word boundaries to avoid partial matches
-        if case_sensitive:
-            pattern = r'\b' + re.escape(source) + r'\b'
-            text = re.sub(pattern, target, text)
-        else:
-            pattern = r'\b' + re.escape(source) + r'\b'
-            text = re.sub(pattern, target, text, flags=re.IGNORECASE)
-
-    return text
+    return compile_custom_dictionary(dictionary).apply(text)
 
 
 def apply_custom_commands(text, commands):
@@ -316,6 +415,83 @@ def apply_custom_commands(text, commands):
     return text
 
 
+# All filler phrases in one pattern (none overlaps another, so one scan
+# removes the same spans as one substitution per phrase)
+_FILLER_PHRASE_PATTERN = re.compile(
+    r"\b(?:" + "|".join(re.escape(phrase) for phrase in FILLER_PHRASES) + r")\b", re.IGNORECASE
+)
+_FILLER_PHRASE_LENGTH = max(len(phrase) for phrase in FILLER_PHRASES)
+
+# Context in which aggressive mode treats "like" as a filler: quotative
+# "like" after these verbs ("he was like")
+_QUOTATIVE_VERBS = frozenset({'was', 'were', 'am', 'is', "i'm", "he's", "she's", "it's"})
+
+# Punctuation that attaches to the previous word when the filler before it is removed
+_ATTACHING_PUNCTUATION = tuple('.,!?;:')
+
+
+class FillerRemover:
+    """
+    Filler stripper for one (aggressive, custom_fillers) combination.
+
+    Phrases are removed with one precompiled pattern, then a single pass
+    over the words drops single-word fillers (and, in aggressive mode,
+    contextual "like") while rebuilding the text with normalized spacing.
+    """
+
+    def __init__(self, aggressive=False, custom_fillers=None):
+        self.aggressive = aggressive
+        self.fillers = frozenset(FILLER_WORDS) | frozenset(word.lower() for word in custom_fillers or ())
+
+    def remove(self, text):
+        """Remove fillers from text."""
+        if not text:
+            return text
+
+        words = _FILLER_PHRASE_PATTERN.sub('', text).split()
+        parts = []
+
+        for i, word in enumerate(words):
+            if self.drops(word, words[i - 1] if i else None):
+                continue
+
+            # Punctuation left behind by a removal attaches to the previous word
+            if parts and not word.startswith(_ATTACHING_PUNCTUATION):
+                parts.append(' ')
+            parts.append(word)
+
+        return ''.join(parts)
+
+    def drops(self, word, previous):
+        """True if word is a filler, given the word before it (None at the start)."""
+        # Strip punctuation for comparison
+        word_clean = word.lower().strip('.,!?;:')
+
+        # Always remove basic fillers
+        if word_clean in self.fillers:
+            return True
+
+        # Handle "like" in aggressive mode: remove it after a comma
+        # ("it was, like, amazing") or a quotative verb ("he was like")
+        if self.aggressive and word_clean == "like" and previous is not None:
+            return previous.endswith(',') or previous.lower().rstrip('.,!?;:') in _QUOTATIVE_VERBS
+        return False
+
+
+_filler_cache = {}  # (aggressive, custom fillers) -> FillerRemover
+
+
+def get_filler_remover(aggressive=False, custom_fillers=None):
+    """FillerRemover for the given settings, cached."""
+    key = (bool(aggressive), tuple(custom_fillers or ()))
+    remover = _filler_cache.get(key)
+    if remover is None:
+        if len(_filler_cache) >= 8:
+            _filler_cache.clear()
+        remover = _filler_cache[key] = FillerRemover(aggressive, custom_fillers)
+    return remover
+
+
 def remove_fillers(text, aggressive=False, custom_fillers=None):
     """
     Remove filler words from text.
@@ -333,59 +509,235 @@ def remove_fillers(text, aggressive=False, custom_fillers=None):
     """
     if not text:
         return text
+    return get_filler_remover(aggressive, custom_fillers).remove(text)
 
-    # Build filler set
-    fillers = FILLER_WORDS.copy()
-    if custom_fillers:
-        fillers.update(word.lower() for word in custom_fillers)
 
-    # First pass: Remove multi-word filler phrases
-    for phrase in FILLER_PHRASES:
-        # Match whole phrase with word boundaries, case-insensitive
-        pattern = r'\b' + re.escape(phrase) + r'\b'
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+# Characters stripped from a word before matching it against commands
+COMMAND_PUNCTUATION = '.,!?;:"\'-()[]{}'
 
-    # Second pass: Remove single-word fillers
-    words = text.split()
-    result = []
+# Words after an ambiguous punctuation word that suggest it was a command
+SENTENCE_STARTERS = {"and", "but", "so", "then", "the", "a", "i", "new", "it", "we", "he", "she", "they", "this", "that"}
 
-    for i, word in enumerate(words):
-        # Strip punctuation for comparison
-        word_clean = word.lower().strip('.,!?;:')
+# Command tables in precedence order (first table wins for a phrase listed twice)
+_COMMAND_TABLES = [
+    ("deletion", DELETION_COMMANDS),
+    ("case", CASE_MANIPULATION_COMMANDS),
+    ("editing", EDITING_COMMANDS),
+    ("action", ACTION_COMMANDS),
+    ("structure", STRUCTURE_COMMANDS),
+    ("formatting", FORMATTING_COMMANDS),
+    ("punctuation", PUNCTUATION_COMMANDS),
+]
 
-        # Always remove basic fillers
-        if word_clean in fillers:
-            continue
 
-        # Handle "like" in aggressive mode
-        if aggressive and word_clean == "like":
-            # Check context: is it likely a filler?
-            prev_word = words[i - 1].lower().rstrip('.,!?;:') if i > 0 else ""
-            next_word = words[i + 1].lower().strip('.,!?;:') if i + 1 < len(words) else ""
+def _command_key(word):
+    """Normalized form of a word for command matching."""
+    return word.strip(COMMAND_PUNCTUATION).lower()
+
 
-            # Filler patterns:
-            # - After comma: "it was, like, amazing"
-            # - After "was/were/am/is": quotative "like" (he was like)
-            # - Before adjectives/adverbs (harder to detect reliably)
-            prev_ends_comma = words[i - 1].endswith(',') if i > 0 else False
-            quotative_verbs = {'was', 'were', 'am', 'is', "i'm", "he's", "she's", "it's"}
+class VoiceCommandEngine:
+    """
+    Voice commands compiled into a token trie.
+
+    Every phrase from the command tables, plus the user's custom commands,
+    is stored as a path of normalized words. Each word is normalized once,
+    and at each position the trie is walked once. The longest command that
+    applies wins; shorter ones (and finally the literal word) are the
+    fallback when a command declines, e.g. a standalone-only action inside
+    a sentence. Phrases can be any number of words.
+    """
 
-            if prev_ends_comma or prev_word in quotative_verbs:
-                continue  # Skip this "like" (remove it)
+    def __init__(self, custom_commands=None):
+        """
+        Args:
+            custom_commands: List of {"trigger": str, "replacement": str, "enabled": bool}
+        """
+        self._root = {}
+        self.max_words = 0  # longest phrase, in words
+        for kind, table in _COMMAND_TABLES:
+            for phrase in table:
+                value = table[phrase] if isinstance(table, dict) else None
+                self._add(phrase, (kind, value), override=False)
+        # User commands take precedence over built-ins with the same phrase
+        for command in custom_commands or []:
+            if command.get("enabled", True) and command.get("trigger", "").strip():
+                trigger = tuple(command["trigger"].lower().split())
+                self._add(command["trigger"], ("custom", (command.get("replacement", ""), trigger)), override=True)
+
+    def _add(self, phrase, command, override):
+        keys = [key for key in (_command_key(word) for word in phrase.split()) if key]
+        if not keys:
+            return
+        self.max_words = max(self.max_words, len(keys))
+        node = self._root
+        for key in keys:
+            node = node.setdefault(key, {})
+        if override or None not in node:
+            node[None] = command  # None marks the end of a phrase
+
+    def process(self, text):
+        """
+        Process voice commands in text.
+
+        Returns:
+            Tuple of (processed_text, should_scratch, actions)
+        """
+        if not text:
+            return text, False, []
+
+        words = text.split()
+        keys = [_command_key(word) for word in words]
+        state = _CommandState()
+        self.run(words, keys, 0, len(words), len(words), state)
+        return state.text(), state.should_scratch, state.actions
+
+    def run(self, words, keys, i, stop, total, state):
+        """
+        Apply commands to words[i:stop], adding the output to state.
+
+        A command starting before stop may use the words after it, so
+        callers holding back a tail must keep at least max_words words
+        after stop.
+
+        Args:
+            words: Words of the text
+            keys: _command_key() of each word
+            i: First word to process
+            stop: Process words starting before this index
+            total: Number of words in the whole utterance
+            state: _CommandState collecting the output
+
+        Returns:
+            Index of the first word not yet processed
+        """
+        count = len(words)
+        result = state.result
+        root = self._root
+        while i < stop:
+            node = root.get(keys[i])
+            if node is None:
+                # Most words start no command
+                result.append(words[i])
+                i += 1
+                continue
+
+            # Every command phrase starting here, shortest first
+            matches = [(i + 1, node[None])] if None in node else []
+            end = i + 1
+            while end < count:
+                node = node.get(keys[end])
+                if node is None:
+                    break
+                end += 1
+                if None in node:
+                    matches.append((end, node[None]))
+
+            for end, (kind, value) in reversed(matches):
+                if kind == "deletion":
+                    # Remove only the last word from result buffer
+                    if result:
+                        result.pop()
+                elif kind == "case":
+                    # Apply case transformation to last word in result buffer
+                    if result:
+                        result[-1] = _change_case(result[-1], value)
+                elif kind == "editing":
+                    # Remove everything before this and signal scratch
+                    result.clear()
+                    state.should_scratch = True
+                elif kind == "action":
+                    # Standalone-only commands require being the entire utterance
+                    # This prevents mishearings like "peace" triggering paste in sentences
+                    if end - i == 1 and keys[i] in STANDALONE_ACTION_COMMANDS and total != 1:
+                        continue
+                    state.actions.append(value)
+                elif kind == "structure":
+                    # Attach to previous word without space
+                    if result:
+                        result[-1] = result[-1].rstrip() + value
+                    else:
+                        result.append(value)
+                elif kind == "formatting":
+                    result.append(value)
+                elif kind == "punctuation":
+                    # For ambiguous words (period, colon, etc.), only convert at
+                    # the end or before a sentence-starting word
+                    if end - i == 1 and keys[i] in AMBIGUOUS_PUNCTUATION:
+                        if end < count and keys[end] not in SENTENCE_STARTERS:
+                            continue
+                    # Attach to previous word without space (strip existing punctuation to avoid duplicates)
+                    if result:
+                        result[-1] = result[-1].rstrip().rstrip('.,!?;:') + value
+                    else:
+                        result.append(value)
+                elif kind == "custom":
+                    # Keep punctuation around the trigger, like a word-bounded replacement
+                    replacement, trigger = value
+                    first, last = words[i], words[end - 1]
+                    leading = first[:len(first) - len(first.lstrip(COMMAND_PUNCTUATION))]
+                    trailing = last[len(last.rstrip(COMMAND_PUNCTUATION)):]
+                    # Punctuation between the trigger's words ("email. Signature")
+                    # means they were not spoken as one phrase
+                    if end - i > 1:
+                        spoken = [word.lower() for word in words[i:end]]
+                        spoken[0] = spoken[0][len(leading):]
+                        spoken[-1] = spoken[-1][:len(spoken[-1]) - len(trailing)]
+                        if tuple(spoken) != trigger:
+                            continue
+                    result.append(leading + replacement + trailing)
+                i = end
+                break
+            else:
+                # Not a command - keep the word
+                result.append(words[i])
+                i += 1
 
-        result.append(word)
+        return i
 
-    # Clean up: remove multiple spaces and trim
-    cleaned = ' '.join(result)
-    # Remove spaces before punctuation that might result from removal
-    cleaned = re.sub(r'\s+([.,!?;:])', r'\1', cleaned)
-    # Remove multiple spaces
-    cleaned = re.sub(r'\s+', ' ', cleaned)
 
-    return cleaned.strip()
+class _CommandState:
+    """Output of VoiceCommandEngine.run() so far."""
 
+    def __init__(self):
+        self.result = []
+        self.should_scratch = False
+        self.actions = []
 
-def process_voice_commands(text):
+    def text(self):
+        # Join and clean up spaces after newlines
+        output = ' '.join(self.result)
+        return output.replace('\n ', '\n')  # Remove space after newline
+
+
+def _change_case(word, case_op):
+    if case_op == "capitalize":
+        # Capitalize first letter only
+        return word[0].upper() + word[1:] if word else word
+    if case_op == "uppercase":
+        return word.upper()
+    if case_op == "lowercase":
+        return word.lower()
+    return word
+
+
+_engine_cache = {}  # custom command contents -> VoiceCommandEngine
+_ENGINE_CACHE_SIZE = 4
+
+
+def get_voice_command_engine(custom_commands=None):
+    """VoiceCommandEngine for the given custom commands, cached by content."""
+    key = tuple((c.get("trigger", ""), c.get("replacement", ""), c.get("enabled", True))
+                for c in custom_commands or [])
+    engine = _engine_cache.get(key)
+    if engine is None:
+        engine = VoiceCommandEngine(custom_commands)
+        if len(_engine_cache) >= _ENGINE_CACHE_SIZE:
+            _engine_cache.clear()
+        _engine_cache[key] = engine
+    return engine
+
+
+def process_voice_commands(text, custom_commands=None):
     """
     Process voice commands in transcribed text.
 
@@ -395,9 +747,11 @@ def process_voice_commands(text):
     - Formatting: "bullet point" -> "• "
     - Editing: "scratch that" -> signals deletion
     - Actions: "select all" -> keyboard shortcut
+    - Custom commands: user trigger phrases -> replacement text
 
     Args:
         text: Input text
+        custom_commands: Optional list of {"trigger", "replacement", "enabled"}
 
     Returns:
         Tuple of (processed_text, should_scratch, actions)
@@ -405,146 +759,302 @@ def process_voice_commands(text):
         - should_scratch: True if "scratch that" was detected
         - actions: List of action commands to execute (e.g., ["ctrl+a"])
     """
-    if not text:
-        return text, False, []
-
-    words = text.split()
-    result = []
-    i = 0
-    should_scratch = False
-    actions = []
-
-    def strip_punctuation(word):
-        """Strip leading/trailing punctuation from a word."""
-        return word.strip('.,!?;:"\'-()[]{}')
-
-    while i < len(words):
-        # Check for 3-word commands first (delete last word)
-        if i + 2 < len(words):
-            three_word = f"{strip_punctuation(words[i])} {strip_punctuation(words[i + 1])} {strip_punctuation(words[i + 2])}".lower()
-
-            # Check deletion commands (delete last word)
-            if three_word in DELETION_COMMANDS:
-                # Remove only the last word from result buffer
-                if result:
-                    result.pop()
-                i += 3
-                continue
+    return get_voice_command_engine(custom_commands).process(text)
+
+
+# Config keys that change text processing (TextPipeline rebuilds on these),
+# with the value assumed when a key is missing
+TEXT_CONFIG_DEFAULTS = {
+    "custom_dictionary": [],
+    "filler_removal_enabled": True,
+    "filler_removal_aggressive": False,
+    "custom_fillers": [],
+    "custom_commands": [],
+    "voice_commands_enabled": True,
+    "scratch_that_enabled": True,
+}
+TEXT_CONFIG_KEYS = tuple(TEXT_CONFIG_DEFAULTS)
 
-        # Check for multi-word commands (2-word phrases)
-        if i + 1 < len(words):
-            two_word = f"{strip_punctuation(words[i])} {strip_punctuation(words[i + 1])}".lower()
-
-            # Check case manipulation commands (capitalize that, uppercase that, lowercase that)
-            if two_word in CASE_MANIPULATION_COMMANDS:
-                # Apply case transformation to last word in result buffer
-                if result:
-                    last_word = result[-1]
-                    case_op = CASE_MANIPULATION_COMMANDS[two_word]
-
-                    if case_op == "capitalize":
-                        # Capitalize first letter only
-                        result[-1] = last_word[0].upper() + last_word[1:] if len(last_word) > 0 else last_word
-                    elif case_op == "uppercase":
-                        # Convert entire word to uppercase
-                        result[-1] = last_word.upper()
-                    elif case_op == "lowercase":
-                        # Convert entire word to lowercase
-                        result[-1] = last_word.lower()
-                i += 2
-                continue
 
-            # Check editing commands (scratch that, delete that)
-            if two_word in EDITING_COMMANDS:
-                # Remove everything before this and signal scratch
-                result = []
-                should_scratch = True
-                i += 2
-                continue
+def text_settings(config):
+    """The text-processing part of a config, copied so later edits don't leak in."""
+    return {key: copy.deepcopy(config.get(key, default)) for key, default in TEXT_CONFIG_DEFAULTS.items()}
 
-            # Check action commands (select all)
-            if two_word in ACTION_COMMANDS:
-                actions.append(ACTION_COMMANDS[two_word])
-                i += 2
-                continue
 
-            # Check structure commands (new line, new paragraph)
-            if two_word in STRUCTURE_COMMANDS:
-                # Attach to previous word without space
-                if result:
-                    result[-1] = result[-1].rstrip() + STRUCTURE_COMMANDS[two_word]
-                else:
-                    result.append(STRUCTURE_COMMANDS[two_word])
-                i += 2
-                continue
+class TextPipeline:
+    """
+    Text processing compiled from a config snapshot.
 
-            # Check formatting commands (bullet point, numbered list)
-            if two_word in FORMATTING_COMMANDS:
-                result.append(FORMATTING_COMMANDS[two_word])
-                i += 2
-                continue
+    The dictionary matcher, filler remover and voice command engine are
+    built once here, so process() only runs them. Build a new pipeline
+    when a key in TEXT_CONFIG_KEYS changes (see changed()).
+    """
 
-            # Check punctuation commands (question mark, exclamation point)
-            if two_word in PUNCTUATION_COMMANDS:
-                # Attach to previous word without space (strip existing punctuation to avoid duplicates)
-                if result:
-                    result[-1] = result[-1].rstrip().rstrip('.,!?;:') + PUNCTUATION_COMMANDS[two_word]
-                else:
-                    result.append(PUNCTUATION_COMMANDS[two_word])
-                i += 2
-                continue
+    def __init__(self, config):
+        self.settings = text_settings(config)
+        settings = self.settings
 
-        # Single word commands - strip punctuation for matching
-        word_clean = strip_punctuation(words[i]).lower()
-
-        # Check single-word action commands (undo, redo, copy, paste, cut)
-        if word_clean in ACTION_COMMANDS:
-            # Standalone-only commands require being the entire utterance
-            # This prevents mishearings like "peace" triggering paste in sentences
-            is_standalone_only = word_clean in STANDALONE_ACTION_COMMANDS
-            is_standalone = len(words) == 1
-            if not is_standalone_only or is_standalone:
-                actions.append(ACTION_COMMANDS[word_clean])
-                i += 1
-                continue
+        dictionary = settings["custom_dictionary"] or []
+        self._dictionary = compile_custom_dictionary(dictionary) if dictionary else None
 
-        # Check single-word formatting commands (bullet)
-        if word_clean in FORMATTING_COMMANDS:
-            result.append(FORMATTING_COMMANDS[word_clean])
-            i += 1
-            continue
+        self._fillers = None
+        if settings["filler_removal_enabled"]:
+            self._fillers = get_filler_remover(bool(settings["filler_removal_aggressive"]),
+                                               settings["custom_fillers"] or [])
 
-        # Check single-word punctuation commands
-        if word_clean in PUNCTUATION_COMMANDS:
-            should_convert = True
-
-            # For ambiguous words (period, colon, etc.), use position heuristics
-            if word_clean in AMBIGUOUS_PUNCTUATION:
-                is_end = (i == len(words) - 1)
-                # Check if next word suggests this is a command (sentence-starting word)
-                next_word = strip_punctuation(words[i + 1]).lower() if i + 1 < len(words) else ""
-                next_is_structure = next_word in {"and", "but", "so", "then", "the", "a", "i", "new", "it", "we", "he", "she", "they", "this", "that"}
-
-                # Only treat as punctuation if at end OR followed by sentence-starting word
-                should_convert = is_end or next_is_structure
-
-            if should_convert:
-                # Attach to previous word without space (strip existing punctuation to avoid duplicates)
-                if result:
-                    result[-1] = result[-1].rstrip().rstrip('.,!?;:') + PUNCTUATION_COMMANDS[word_clean]
-                else:
-                    result.append(PUNCTUATION_COMMANDS[word_clean])
-                i += 1
-                continue
+        self._custom_commands = settings["custom_commands"] or []
+        self._commands = None
+        if settings["voice_commands_enabled"]:
+            self._commands = get_voice_command_engine(self._custom_commands)
+        self._scratch_that = bool(settings["scratch_that_enabled"])
+
+    def changed(self, config):
+        """True if config's text settings differ from this pipeline's."""
+        return any(config.get(key, default) != self.settings[key]
+                   for key, default in TEXT_CONFIG_DEFAULTS.items())
+
+    def process(self, text, history=None):
+        """
+        Run the pipeline; same contract as process_text().
+
+        Returns:
+            Tuple of (processed_text, should_scratch, scratch_length, actions)
+        """
+        if not text:
+            return text, False, 0, []
+
+        processed = text
 
-        # Not a command - keep the word
-        result.append(words[i])
-        i += 1
+        # Step 1: Custom dictionary replacements
+        if self._dictionary is not None:
+            processed = self._dictionary.apply(processed)
 
-    # Join and clean up spaces after newlines
-    output = ' '.join(result)
-    output = output.replace('\n ', '\n')  # Remove space after newline
-    return output, should_scratch, actions
+        # Step 2: Filler removal
+        if self._fillers is not None:
+            processed = self._fillers.remove(processed)
+
+        # Step 3: Voice commands and custom commands (user-defined trigger ->
+        # expansion), matched together in one pass
+        should_scratch = False
+        scratch_length = 0
+        actions = []
+
+        if self._commands is not None:
+            processed, should_scratch, actions = self._commands.process(processed)
+
+            # Handle scratch that
+            if should_scratch and self._scratch_that and history:
+                scratch_length = history.get_last_length()
+                history.pop_last()
+        elif self._custom_commands:
+            processed = apply_custom_commands(processed, self._custom_commands)
+
+        return processed, should_scratch, scratch_length, actions
+
+    def incremental(self):
+        """IncrementalTextProcessor running this pipeline over transcript fragments."""
+        return IncrementalTextProcessor(self)
+
+
+class IncrementalTextProcessor:
+    """
+    TextPipeline for a transcript that arrives in fragments.
+
+    feed() takes each fragment as it is decoded and runs the pipeline as
+    far as the text seen so far decides it. Each step keeps back only the
+    tail that a later fragment could still change (a dictionary entry,
+    filler phrase or voice command may span fragments) and resumes from
+    it on the next call, so no text is processed twice. finish() flushes
+    the tails and returns exactly what TextPipeline.process() returns for
+    the fragments joined with spaces.
+
+    Commands that edit what came before ("scratch that", "delete last
+    word", "capitalize that", punctuation attaching to the previous word)
+    can still change the end of the processed text later, as they do in
+    one-shot processing.
+    """
+
+    def __init__(self, pipeline):
+        self._pipeline = pipeline
+        self._fragments = 0
+        self._empty = True  # Joined input is "" so far
+
+        # Dictionary: text not yet scanned, after one character of lookbehind
+        self._raw = ""
+        self._raw_pos = 0
+        # Filler phrases: same, over the dictionary output
+        self._phrases = ""
+        self._phrases_pos = 0
+        # Words: partial last word, and the last word for aggressive "like"
+        self._word_tail = ""
+        self._previous = None
+        # Last kept word, until it is known that no punctuation attaches to it
+        self._unit = None
+        # Voice commands: words waiting for lookahead
+        self._words = []
+        self._keys = []
+        self._total = 0
+        self._state = _CommandState()
+
+        self._output = []  # Processed text when voice commands are off
+        self._deferred = []  # Whole input, when custom commands run without voice commands
+
+    def feed(self, fragment):
+        """
+        Add the next fragment of the transcript.
+
+        Returns:
+            Tuple of (processed_text, pending): the processed text so far,
+            and the partly processed tail still waiting for more input
+        """
+        if self._fragments:
+            fragment = " " + fragment
+        self._fragments += 1
+        self._empty = self._empty and not fragment
+        self._step(fragment, final=False)
+        return self.text, self.pending
+
+    def finish(self, history=None):
+        """
+        Process the rest of the transcript.
+
+        Returns:
+            Tuple of (processed_text, should_scratch, scratch_length, actions),
+            as TextPipeline.process() returns for the whole transcript
+        """
+        pipeline = self._pipeline
+        if self._empty:
+            return "", False, 0, []
+        if pipeline._commands is None and pipeline._custom_commands:
+            return pipeline.process("".join(self._deferred), history)
+
+        self._step("", final=True)
+        should_scratch = self._state.should_scratch
+        scratch_length = 0
+        if should_scratch and pipeline._scratch_that and history:
+            scratch_length = history.get_last_length()
+            history.pop_last()
+        return self.text, should_scratch, scratch_length, list(self._state.actions)
+
+    @property
+    def text(self):
+        """Processed text so far."""
+        if self._pipeline._commands is not None:
+            return self._state.text()
+        if self._pipeline._custom_commands:
+            return ""
+        return ("" if self._pipeline._fillers is None else " ").join(self._output)
+
+    @property
+    def pending(self):
+        """Tail of the input that is not in text yet, partly processed."""
+        if self._pipeline._commands is None and self._pipeline._custom_commands:
+            return "".join(self._deferred)
+        words = list(self._words)
+        if self._unit is not None:
+            words.append(self._unit)
+        tail = self._word_tail + self._phrases[self._phrases_pos:] + self._raw[self._raw_pos:]
+        return " ".join(words + tail.split())
+
+    def _step(self, fragment, final):
+        pipeline = self._pipeline
+        if pipeline._commands is None and pipeline._custom_commands:
+            # Custom commands alone are plain substitutions applied one
+            # after another; they only run on the whole text
+            self._deferred.append(fragment)
+            return
+
+        text = self._scan_dictionary(fragment, final)
+        if pipeline._fillers is None and pipeline._commands is None:
+            self._output.append(text)
+            return
+        if pipeline._fillers is not None:
+            text = self._strip_filler_phrases(text, final)
+        words = self._split_words(text, final)
+        if pipeline._fillers is not None:
+            words = self._drop_fillers(words, final)
+        if pipeline._commands is None:
+            self._output.extend(words)
+        else:
+            self._run_commands(words, final)
+
+    def _scan_dictionary(self, fragment, final):
+        """Dictionary output for the input that no later fragment can change."""
+        matcher = self._pipeline._dictionary
+        if matcher is None:
+            return fragment
+        text = self._raw + fragment
+        # An entry starting before limit is matched (or not) entirely within text
+        limit = len(text) if final else len(text) - matcher.max_length
+        output, end = matcher.scan(text, self._raw_pos, limit)
+        keep = max(end - 1, 0)  # Lookbehind for the next match's \b
+        self._raw = text[keep:]
+        self._raw_pos = end - keep
+        return output
+
+    def _strip_filler_phrases(self, chunk, final):
+        """chunk's decided part with filler phrases removed."""
+        text = self._phrases + chunk
+        pos = self._phrases_pos
+        limit = len(text) if final else len(text) - _FILLER_PHRASE_LENGTH
+        parts = []
+        last = pos
+        for match in _FILLER_PHRASE_PATTERN.finditer(text, pos):
+            if match.start() >= limit:
+                break
+            parts.append(text[last:match.start()])
+            last = match.end()
+        end = max(last, limit, pos)
+        parts.append(text[last:end])
+        keep = max(end - 1, 0)
+        self._phrases = text[keep:]
+        self._phrases_pos = end - keep
+        return "".join(parts)
+
+    def _split_words(self, chunk, final):
+        """Complete words of chunk; a word touching its end may continue in the next one."""
+        text = self._word_tail + chunk
+        words = text.split()
+        self._word_tail = ""
+        if words and not final and not text[-1].isspace():
+            self._word_tail = words.pop()
+        return words
+
+    def _drop_fillers(self, words, final):
+        """Words without fillers, with attaching punctuation glued on (like FillerRemover.remove())."""
+        fillers = self._pipeline._fillers
+        units = []
+        unit = self._unit
+        previous = self._previous
+        for word in words:
+            drop = fillers.drops(word, previous)
+            previous = word
+            if drop:
+                continue
+            if unit is not None and word.startswith(_ATTACHING_PUNCTUATION):
+                unit += word
+            else:
+                if unit is not None:
+                    units.append(unit)
+                unit = word
+        if final and unit is not None:
+            units.append(unit)
+            unit = None
+        self._unit = unit
+        self._previous = previous
+        return units
+
+    def _run_commands(self, words, final):
+        engine = self._pipeline._commands
+        self._words.extend(words)
+        self._keys.extend(_command_key(word) for word in words)
+        self._total += len(words)
+        count = len(self._words)
+        # A command at i may need every word up to i + max_words
+        stop = count if final else count - engine.max_words
+        done = engine.run(self._words, self._keys, 0, stop, self._total, self._state)
+        del self._words[:done]
+        del self._keys[:done]
 
 
 def process_text(text, config, history=None):
@@ -554,7 +1064,7 @@ def process_text(text, config, history=None):
     Pipeline order:
     1. Custom dictionary (convert phonetic mishearings)
     2. Filler removal (clean up before command processing)
-    3. Voice commands (process user intent)
+    3. Voice commands and custom commands (process user intent)
 
     Args:
         text: Raw transcription text
@@ -568,38 +1078,4 @@ def process_text(text, config, history=None):
         - scratch_length: Number of characters to delete (if scratching)
         - actions: List of action commands to execute (e.g., ["ctrl+a"])
     """
-    if not text:
-        return text, False, 0, []
-
-    processed = text
-
-    # Step 1: Custom dictionary replacements
-    dictionary = config.get("custom_dictionary", [])
-    if dictionary:
-        processed = apply_custom_dictionary(processed, dictionary)
-
-    # Step 2: Filler removal
-    if config.get("filler_removal_enabled", True):
-        aggressive = config.get("filler_removal_aggressive", False)
-        custom_fillers = config.get("custom_fillers", [])
-        processed = remove_fillers(processed, aggressive, custom_fillers)
-
-    # Step 3: Custom commands (user-defined trigger -> expansion)
-    custom_commands = config.get("custom_commands", [])
-    if custom_commands:
-        processed = apply_custom_commands(processed, custom_commands)
-
-    # Step 4: Voice commands
-    should_scratch = False
-    scratch_length = 0
-    actions = []
-
-    if config.get("voice_commands_enabled", True):
-        processed, should_scratch, actions = process_voice_commands(processed)
-
-        # Handle scratch that
-        if should_scratch and config.get("scratch_that_enabled", True) and history:
-            scratch_length = history.get_last_length()
-            history.pop_last()
-
-    return processed, should_scratch, scratch_length, actions
+    return TextPipeline(config).process(text, history)
@@ -0,0 +1,142 @@
+"""
+Two-pass draft-and-refine transcription for MurmurTone.
+
+A small draft model (e.g. tiny) transcribes the recording first so text
+appears almost immediately. The same audio is then re-decoded with the
+configured model in the background; if the refined text differs, the
+draft is corrected in place with backspaces, like "scratch that".
+
+Only the differing tail of the draft is erased and retyped. A correction
+is dropped if anything else was typed after the draft, since the cursor
+is no longer at the end of it.
+"""
+import logging
+import os
+import threading
+
+log = logging.getLogger("murmurtone")
+
+
+# How long a finished refinement waits for the draft to be typed (seconds)
+DRAFT_TIMEOUT = 60.0
+
+
+def replacement_edit(old, new):
+    """
+    Minimal end-of-text edit turning old into new.
+
+    Returns:
+        (backspaces, text_to_type)
+    """
+    prefix = os.path.commonprefix([old, new])
+    return len(old) - len(prefix), new[len(prefix):]
+
+
+class Refiner:
+    """
+    Runs refinement decodes and applies corrections that are still valid.
+
+    invalidate() marks every draft typed so far as stale; call it before
+    typing anything else.
+    """
+
+    def __init__(self, replace):
+        """
+        Args:
+            replace: callable(draft, refined, backspaces, text_to_type) that
+                     performs the correction in the focused window
+        """
+        self._replace = replace
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Drop corrections for all dictations so far."""
+        with self._lock:
+            self._generation += 1
+
+    def start(self, decode, finish=None, on_done=None):
+        """
+        Start a background refinement decode.
+
+        Args:
+            decode: callable() -> raw refined text
+            finish: Optional callable(raw) -> final text, or None to skip
+                    the correction (e.g. it contains commands)
+            on_done: Optional callable() run once decode() returns or fails,
+                     e.g. to release the audio
+
+        Returns:
+            RefineJob; call set_draft() with the typed text once it is out
+        """
+        job = RefineJob(self, decode, finish, on_done)
+        job.start()
+        return job
+
+    def _apply(self, generation, draft, refined):
+        """Replace draft with refined if nothing was typed after it."""
+        with self._lock:
+            if generation != self._generation:
+                log.debug("Refinement dropped - more text was typed since the draft")
+                return False
+            if refined == draft:
+                return False
+            backspaces, text = replacement_edit(draft, refined)
+            self._replace(draft, refined, backspaces, text)
+            return True
+
+
+class RefineJob:
+    """One refinement: decode in the background, then correct the draft."""
+
+    def __init__(self, refiner, decode, finish, on_done):
+        self._refiner = refiner
+        self._generation = None
+        self._decode = decode
+        self._finish = finish
+        self._on_done = on_done
+        self._draft = None
+        self._draft_ready = threading.Event()
+        self._thread = None
+        self.replaced = False  # True once the draft was corrected
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True, name="refine")
+        self._thread.start()
+
+    def set_draft(self, text):
+        """Hand over the draft exactly as typed (including trailing space)."""
+        with self._refiner._lock:
+            self._generation = self._refiner._generation
+        self._draft = text
+        self._draft_ready.set()
+
+    def cancel(self):
+        """Drop the correction (e.g. the draft was not typed)."""
+        self._draft = None
+        self._draft_ready.set()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            raw = self._decode()
+        except Exception as e:
+            log.warning(f"Refinement decode failed: {e}")
+            return
+        finally:
+            if self._on_done is not None:
+                self._on_done()
+
+        if not self._draft_ready.wait(DRAFT_TIMEOUT) or self._draft is None:
+            return
+        try:
+            refined = self._finish(raw) if self._finish is not None else raw
+        except Exception as e:
+            log.warning(f"Refinement post-processing failed: {e}")
+            return
+        if refined is None:
+            return
+        self.replaced = self._refiner._apply(self._generation, self._draft, refined)
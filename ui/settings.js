@@ -84,6 +84,79 @@ window.onModelDownloadError = function(error) {
     showToast(`Download failed: ${error}`, 'error');
 };
 
+// ============================================
+// CPU Calibration Callbacks (called from Python)
+// ============================================
+
+/**
+ * Summarize a calibration report for the settings row
+ */
+function describeAutotuneReport(report) {
+    if (!report || !report.best) {
+        return 'Find the fastest thread settings for this computer. Runs once automatically on first launch.';
+    }
+    const best = report.best;
+    const tested = report.results.length;
+    return `Best for ${report.model}: ${best.num_workers} worker(s) x ${best.cpu_threads} thread(s) ` +
+        `(${best.score_s.toFixed(1)}s, ${tested} settings tested on ${report.created.replace('T', ' ')})`;
+}
+
+async function loadAutotuneReport() {
+    const summary = document.getElementById('cpu-autotune-summary');
+    if (!summary) return;
+    try {
+        const result = await pywebview.api.get_cpu_autotune_report();
+        if (result.success && result.data) {
+            summary.textContent = describeAutotuneReport(result.data);
+        }
+    } catch (e) {
+        console.warn('Could not load calibration report:', e);
+    }
+}
+
+async function startCpuAutotune() {
+    const btn = document.getElementById('cpu-autotune-btn');
+    if (btn) {
+        btn.disabled = true;
+        btn.classList.add('loading');
+    }
+    try {
+        await pywebview.api.run_cpu_autotune();
+    } catch (error) {
+        window.onAutotuneError(error.message || 'Unknown error');
+    }
+}
+
+window.onAutotuneProgress = function(percent, status) {
+    const summary = document.getElementById('cpu-autotune-summary');
+    if (summary) summary.textContent = `${percent}% - ${status}`;
+};
+
+window.onAutotuneComplete = function(report) {
+    const btn = document.getElementById('cpu-autotune-btn');
+    const summary = document.getElementById('cpu-autotune-summary');
+    if (btn) {
+        btn.disabled = false;
+        btn.classList.remove('loading');
+    }
+    if (summary) summary.textContent = describeAutotuneReport(report);
+    if (report && report.best) {
+        showToast('Calibration complete - fastest settings applied', 'success');
+    } else {
+        showToast('Calibration failed for every setting', 'error');
+    }
+};
+
+window.onAutotuneError = function(error) {
+    const btn = document.getElementById('cpu-autotune-btn');
+    if (btn) {
+        btn.disabled = false;
+        btn.classList.remove('loading');
+    }
+    loadAutotuneReport();
+    showToast(`Calibration failed: ${error}`, 'error');
+};
+
 // ============================================
 // Initialization
 // ============================================
@@ -330,6 +403,7 @@ async function populateForm() {
 
     // Audio settings
     setDropdown('sample-rate', settings.sample_rate ?? 16000);
+    setCheckbox('warm-capture-enabled', settings.warm_capture_enabled ?? false);
     // Handle both 0.0-1.0 (legacy) and 0-100 formats
     let volumePercent = settings.audio_feedback_volume ?? 50;
     if (volumePercent <= 1) volumePercent = Math.round(volumePercent * 100);
@@ -368,6 +442,7 @@ async function populateForm() {
         console.warn('Could not fetch model status:', e);
     }
     updateDownloadButtonVisibility(settings.model_size ?? 'tiny');
+    loadAutotuneReport();
 
     // Translation settings
     setCheckbox('translation-enabled', settings.translation_enabled ?? false);
@@ -409,6 +484,8 @@ async function populateForm() {
 
     // Advanced settings - Preview
     setCheckbox('preview-enabled', settings.preview_enabled ?? true);
+    setCheckbox('streaming-enabled', settings.streaming_enabled ?? false);
+    setCheckbox('two-pass-enabled', settings.two_pass_enabled ?? false);
     setDropdown('preview-position', settings.preview_position ?? 'bottom_right');
     setSlider('preview-auto-hide', settings.preview_auto_hide_delay ?? 2.0, 's');
     setDropdown('preview-theme', settings.preview_theme ?? 'dark');
@@ -461,6 +538,7 @@ function setupFormListeners() {
         }
     });
     addDropdownListener('sample-rate', (value) => saveSetting('sample_rate', parseInt(value)));
+    addCheckboxListener('warm-capture-enabled', (checked) => saveSetting('warm_capture_enabled', checked));
     // Save as 0-100 directly
     addSliderListener('feedback-volume', (value) => {
         saveSetting('audio_feedback_volume', parseInt(value));
@@ -665,6 +743,8 @@ function setupFormListeners() {
         saveSetting('preview_enabled', checked);
         updatePreviewVisibility();
     });
+    addCheckboxListener('streaming-enabled', (checked) => saveSetting('streaming_enabled', checked));
+    addCheckboxListener('two-pass-enabled', (checked) => saveSetting('two_pass_enabled', checked));
     addDropdownListener('preview-position', (value) => saveSetting('preview_position', value));
     addSliderListener('preview-auto-hide', (value) => saveSetting('preview_auto_hide_delay', parseFloat(value)), 's');
     addDropdownListener('preview-theme', (value) => saveSetting('preview_theme', value));
@@ -688,6 +768,11 @@ function setupFormListeners() {
         refreshGpuBtn.addEventListener('click', refreshGpuStatus);
     }
 
+    const autotuneBtn = document.getElementById('cpu-autotune-btn');
+    if (autotuneBtn) {
+        autotuneBtn.addEventListener('click', startCpuAutotune);
+    }
+
     // Reset to defaults button
     const resetBtn = document.getElementById('reset-defaults-btn');
     if (resetBtn) {
@@ -1480,8 +1565,9 @@ function filterList(listId, searchTerm) {
 
 /**
  * Check GPU availability and update status badge
+ * @param {boolean} refresh - Probe the hardware again instead of using the cached result
  */
-async function checkGpuStatus() {
+async function checkGpuStatus(refresh = false) {
     const badge = document.getElementById('gpu-status');
     const installRow = document.getElementById('install-gpu-row');
     if (!badge) return;
@@ -1490,7 +1576,7 @@ async function checkGpuStatus() {
     badge.querySelector('.status-text').textContent = 'Checking GPU...';
 
     try {
-        const result = await pywebview.api.get_gpu_status();
+        const result = await pywebview.api.get_gpu_status(refresh);
         if (result.success && result.data.available) {
             badge.className = 'status-badge available';
             badge.querySelector('.status-text').textContent =
@@ -1524,7 +1610,7 @@ async function refreshGpuStatus() {
     if (icon) icon.classList.add('spinning');
 
     try {
-        await checkGpuStatus();
+        await checkGpuStatus(true);
         showToast('GPU status refreshed', 'success');
     } catch (error) {
         console.error('Error refreshing GPU:', error);
@@ -1551,7 +1637,7 @@ async function installGpuSupport() {
         if (result.success) {
             showToast('GPU support installed! Please restart the application.', 'success');
             // Recheck GPU status
-            await checkGpuStatus();
+            await checkGpuStatus(true);
         } else {
             showToast(result.message || 'Failed to install GPU support', 'error');
         }
@@ -2959,6 +3045,7 @@ function createMockApi() {
         custom_vocabulary: ['MurmurTone', 'PyWebView'],
         sample_rate: 16000,
         input_device: null,
+        warm_capture_enabled: false,
         audio_feedback_volume: 50,
         sound_processing: true,
         sound_success: true,
@@ -2976,6 +3063,8 @@ function createMockApi() {
         ai_cleanup_mode: 'formality',
         ai_formality_level: 'casual',
         preview_enabled: true,
+        streaming_enabled: false,
+        two_pass_enabled: false,
         preview_position: 'bottom_right',
         preview_auto_hide_delay: 2.0
     };
@@ -3014,6 +3103,8 @@ function createMockApi() {
                 success: true,
                 data: { available: true, name: 'NVIDIA GeForce RTX 3080' }
             }),
+            get_cpu_autotune_report: () => Promise.resolve({ success: true, data: null }),
+            run_cpu_autotune: () => Promise.resolve({ success: true, message: 'Calibration started' }),
             test_ollama_connection: (url) => Promise.resolve({
                 success: true,
                 data: { connected: true }
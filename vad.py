@@ -0,0 +1,198 @@
+"""
+Voice activity detection for MurmurTone.
+
+Frame-level energy + zero-crossing classifier, fully vectorized with NumPy.
+Runs between capture and transcription to trim silent edges and to skip
+the model entirely on recordings with no speech.
+"""
+import numpy as np
+
+
+# Frame size for classification (30 ms is standard for speech VAD)
+FRAME_MS = 30
+
+# Absolute floor: frames quieter than this are never speech (dBFS).
+# Matches the fixed -50 dB "no speech" threshold used by auto-stop, with margin.
+MIN_SPEECH_DB = -55.0
+
+# Speech must exceed the estimated noise floor by this much (dB)
+NOISE_MARGIN_DB = 10.0
+
+# Frames up to this far below the energy threshold still count as speech
+# when their zero-crossing rate is fricative-like ("s", "f", "th")
+WEAK_FRAME_DB = 6.0
+FRICATIVE_ZCR = 0.25
+
+# Minimum run of speech frames; shorter bursts (clicks, bumps) are ignored
+MIN_SPEECH_MS = 90
+
+# Audio kept around detected speech so word onsets/tails aren't clipped
+DEFAULT_PADDING_MS = 300
+
+# Silence between phrases long enough to cut a streaming segment at
+DEFAULT_PAUSE_MS = 500
+
+
+def frame_features(audio, sample_rate, frame_ms=FRAME_MS):
+    """
+    Compute per-frame energy (dBFS) and zero-crossing rate.
+
+    Trailing samples that don't fill a whole frame are ignored.
+
+    Args:
+        audio: 1-D float32 array in [-1, 1]
+        sample_rate: Sample rate in Hz
+        frame_ms: Frame length in milliseconds
+
+    Returns:
+        Tuple of (energy_db, zcr) arrays, one value per frame
+    """
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    num_frames = len(audio) // frame_len
+    if num_frames == 0:
+        return np.empty(0), np.empty(0)
+
+    frames = np.asarray(audio[:num_frames * frame_len], dtype=np.float32).reshape(num_frames, frame_len)
+    energy = np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / frame_len
+    energy_db = 10.0 * np.log10(energy + 1e-12)
+    crossings = np.count_nonzero(np.signbit(frames[:, 1:]) != np.signbit(frames[:, :-1]), axis=1)
+    zcr = crossings / max(1, frame_len - 1)
+    return energy_db, zcr
+
+
+def classify_frames(audio, sample_rate, frame_ms=FRAME_MS):
+    """
+    Classify each frame as speech (True) or non-speech (False).
+
+    The energy threshold adapts to the recording's noise floor (10th
+    percentile frame energy), never dropping below MIN_SPEECH_DB.
+    """
+    energy_db, zcr = frame_features(audio, sample_rate, frame_ms)
+    if energy_db.size == 0:
+        return np.zeros(0, dtype=bool)
+
+    noise_floor = np.percentile(energy_db, 10)
+    threshold = max(MIN_SPEECH_DB, noise_floor + NOISE_MARGIN_DB)
+
+    loud = energy_db > threshold
+    fricative = (energy_db > threshold - WEAK_FRAME_DB) & (zcr > FRICATIVE_ZCR)
+    return loud | fricative
+
+
+def find_speech_bounds(audio, sample_rate, padding_ms=DEFAULT_PADDING_MS,
+                       frame_ms=FRAME_MS, min_speech_ms=MIN_SPEECH_MS):
+    """
+    Find the sample range containing speech.
+
+    Args:
+        audio: 1-D float32 array
+        sample_rate: Sample rate in Hz
+        padding_ms: Audio kept before the first and after the last speech frame
+        frame_ms: Frame length in milliseconds
+        min_speech_ms: Shortest run of speech frames that counts as speech
+
+    Returns:
+        (start, end) sample indices, or None if no speech was found
+    """
+    mask = classify_frames(audio, sample_rate, frame_ms)
+    run = max(1, int(round(min_speech_ms / frame_ms)))
+    if mask.size < run:
+        return None
+
+    # Window positions where `run` consecutive frames are all speech
+    full = np.flatnonzero(np.convolve(mask.astype(np.int32), np.ones(run, dtype=np.int32), "valid") == run)
+    if full.size == 0:
+        return None
+
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    pad = int(sample_rate * padding_ms / 1000)
+    start = max(0, int(full[0]) * frame_len - pad)
+    end = min(len(audio), (int(full[-1]) + run) * frame_len + pad)
+    return start, end
+
+
+def trim_silence(audio, sample_rate, padding_ms=DEFAULT_PADDING_MS):
+    """
+    Trim non-speech from both ends of a recording.
+
+    Returns:
+        Zero-copy view of the speech region, or None if there is no speech
+    """
+    bounds = find_speech_bounds(audio, sample_rate, padding_ms)
+    if bounds is None:
+        return None
+    start, end = bounds
+    return audio[start:end]
+
+
+def find_pause(audio, sample_rate, min_pause_ms=DEFAULT_PAUSE_MS, frame_ms=FRAME_MS):
+    """
+    Find the last pause (non-speech run of at least min_pause_ms) that
+    follows speech. Leading silence is not a pause.
+
+    Returns:
+        Sample index at the middle of the pause, or None
+    """
+    mask = classify_frames(audio, sample_rate, frame_ms)
+    speech = np.flatnonzero(mask)
+    if speech.size == 0:
+        return None
+
+    silent = ~mask
+    silent[:speech[0]] = False
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    run = max(1, int(round(min_pause_ms / frame_ms)))
+    long_runs = np.flatnonzero(ends - starts >= run)
+    if long_runs.size == 0:
+        return None
+
+    last = long_runs[-1]
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    return int((starts[last] + ends[last]) // 2) * frame_len
+
+
+def split_at_pauses(audio, sample_rate, max_chunk_seconds, min_pause_ms=DEFAULT_PAUSE_MS,
+                    frame_ms=FRAME_MS):
+    """
+    Split a recording into chunks of at most max_chunk_seconds, cutting
+    in the middle of pauses so no word straddles two chunks.
+
+    Each chunk ends at the latest pause that keeps it under the limit.
+    Where there is no pause of min_pause_ms, the quietest frame in the
+    second half of the window is used instead.
+
+    Returns:
+        List of (start, end) sample ranges covering the whole recording
+    """
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    max_frames = max(2, int(max_chunk_seconds * 1000 / frame_ms))
+    energy_db, _ = frame_features(audio, sample_rate, frame_ms)
+    total_frames = len(energy_db)
+    if total_frames <= max_frames:
+        return [(0, len(audio))]
+
+    # Candidate cuts: middles of long non-speech runs
+    silent = ~classify_frames(audio, sample_rate, frame_ms)
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    run = max(1, int(round(min_pause_ms / frame_ms)))
+    long_runs = ends - starts >= run
+    cuts = (starts[long_runs] + ends[long_runs]) // 2
+
+    bounds = []
+    chunk_start = 0
+    while total_frames - chunk_start > max_frames:
+        limit = chunk_start + max_frames
+        usable = cuts[(cuts > chunk_start + max_frames // 2) & (cuts <= limit)]
+        if usable.size:
+            cut = int(usable[-1])
+        else:
+            window = energy_db[chunk_start + max_frames // 2:limit]
+            cut = chunk_start + max_frames // 2 + int(np.argmin(window))
+        bounds.append((chunk_start * frame_len, cut * frame_len))
+        chunk_start = cut
+    bounds.append((chunk_start * frame_len, len(audio)))
+    return bounds
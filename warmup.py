@@ -0,0 +1,132 @@
+"""
+Model warm-up for MurmurTone.
+
+The first transcribe() on a freshly loaded model pays one-off costs:
+allocator growth, kernel selection, tokenizer setup and, for weights
+that were just mapped, page faults. A short synthetic decode right after
+loading moves those costs out of the user's first dictation. After a
+long idle period the OS may have paged the weights out again, so
+IdleRewarmer repeats the warm-up in the background.
+"""
+import logging
+import threading
+import time
+
+import numpy as np
+
+log = logging.getLogger("murmurtone")
+
+
+# Length of the synthetic warm-up clip (seconds)
+WARMUP_SECONDS = 1.0
+
+
+def warmup_audio(seconds=WARMUP_SECONDS, sample_rate=16000):
+    """Quiet voiced-like tone over low noise, so the decoder actually runs."""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    rng = np.random.default_rng(0)
+    tone = 0.1 * np.sin(2 * np.pi * 220 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t))
+    return (tone + rng.standard_normal(len(t)) * 1e-3).astype(np.float32)
+
+
+def run_warmup(transcribe, workers=1, audio=None):
+    """
+    Run warm-up decodes and time them.
+
+    The first (cold) decode is timed, then every CTranslate2 worker gets
+    a decode of its own, then one more decode is timed as the warm figure.
+
+    Args:
+        transcribe: callable(audio) -> text
+        workers: Number of model workers to warm
+
+    Returns:
+        (cold_seconds, warm_seconds)
+    """
+    if audio is None:
+        audio = warmup_audio()
+
+    start = time.perf_counter()
+    transcribe(audio)
+    cold = time.perf_counter() - start
+
+    if workers > 1:
+        threads = [threading.Thread(target=transcribe, args=(audio,), daemon=True)
+                   for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    start = time.perf_counter()
+    transcribe(audio)
+    warm = time.perf_counter() - start
+    return cold, warm
+
+
+class IdleRewarmer:
+    """
+    Re-runs the warm-up after the model has been idle for a while.
+
+    touch() marks model use; a background thread checks periodically and
+    calls warm() once per idle period, skipping while is_busy() is true.
+    """
+
+    def __init__(self, warm, idle_seconds, is_busy=None, check_interval=60.0, name="model-rewarm"):
+        """
+        Args:
+            warm: callable() that runs the warm-up
+            idle_seconds: Idle time before re-warming (<= 0 disables)
+            is_busy: Optional callable() -> bool; True postpones re-warming
+            check_interval: Seconds between idle checks
+            name: Background thread name
+        """
+        self._warm = warm
+        self.idle_seconds = idle_seconds
+        self._is_busy = is_busy
+        self._check_interval = check_interval
+        self._name = name
+        self._last_used = time.monotonic()
+        self._warmed_since_use = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def touch(self):
+        """Record that the model was just used."""
+        self._last_used = time.monotonic()
+        self._warmed_since_use = False
+
+    def start(self):
+        """Start the background idle check."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name=self._name)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background idle check."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self, now=None):
+        """Re-warm if idle long enough. Returns True if warm() ran."""
+        if self.idle_seconds <= 0 or self._warmed_since_use:
+            return False
+        now = time.monotonic() if now is None else now
+        if now - self._last_used < self.idle_seconds:
+            return False
+        if self._is_busy is not None and self._is_busy():
+            return False
+        self._warmed_since_use = True
+        try:
+            self._warm()
+        except Exception as e:
+            log.warning(f"Idle task {self._name} failed: {e}")
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self._check_interval):
+            self.check()